@@ -1,11 +1,19 @@
+import copy
+import operator
+
 from hearthstone.entities import Entity
 from hearthstone.enums import GameTag
 
 
 class BaseEntity:
+    # 搜索时会大量复制英雄和技能, 用 __slots__ 省掉每个对象的 __dict__; 没声明 __slots__ 的子类照常有 __dict__
+    __slots__ = ('entity_id', 'type', 'name', 'zone', 'controller', 'entity')
     # INVALID = 0 施法者CASTER = 1 斗士FIGHTER = 2 TANK = 3  (无属性)NEUTRAL = 4  迪亚波罗末日=5
     damage_advantage = [[1, 1, 1, 1, 1, 2], [1, 1, 1, 2, 1, 2], [1, 2, 1, 1, 1, 2],
                         [1, 1, 2, 1, 1, 2], [1, 1, 1, 1, 1, 2], [1, 1, 1, 1, 1, 1]]
+    # snapshot / restore 不管的字段: 模拟时不会变的, 或者子类自己单独保存的;
+    # 其他 __slots__ 和 __dict__ 里的字段都保存, 卡牌的 play 可能改任何一个(比如 LETL_237 改 lettuce_role)
+    static_fields = ('entity',)
 
     def __init__(self, entity: Entity):
         self.entity_id = 0
@@ -29,5 +37,94 @@ class BaseEntity:
         self.zone = self.get_tag(GameTag.ZONE)
         self.controller = self.get_tag(GameTag.LETTUCE_CONTROLLER)
 
+    @classmethod
+    def slot_names(cls):
+        """
+        继承链上所有 __slots__ 里的字段, 按类缓存
+        """
+        names = cls.__dict__.get('_slot_names')
+        if names is None:
+            names = tuple(name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ())
+                          if name not in ('__dict__', '__weakref__'))
+            cls._slot_names = names
+        return names
+
+    @classmethod
+    def combat_names(cls):
+        """
+        snapshot / restore 保存的 __slots__ 字段, 按类缓存
+        """
+        names = cls.__dict__.get('_combat_names')
+        if names is None:
+            names = tuple(name for name in cls.slot_names() if name not in cls.static_fields)
+            cls._combat_names = names
+        return names
+
+    @classmethod
+    def combat_getter(cls):
+        """
+        一次取出 combat_names 所有字段的 attrgetter, 比逐个 getattr 快, 按类缓存
+        """
+        getter = cls.__dict__.get('_combat_getter')
+        if getter is None:
+            names = cls.combat_names()
+            if len(names) > 1:
+                getter = operator.attrgetter(*names)
+            else:
+                # 只有一个字段时 attrgetter 不返回元组
+                def getter(obj):
+                    return tuple(getattr(obj, name) for name in names)
+            cls._combat_getter = getter
+        return getter
+
+    def fields(self):
+        """
+        所有字段 {名字: 值}, 包括 __slots__ 和子类的 __dict__
+        """
+        d = {name: getattr(self, name) for name in self.slot_names()}
+        d.update(getattr(self, '__dict__', {}))
+        return d
+
+    def clone(self):
+        """
+        模拟用的副本: 浅拷贝, hearthstone 的 Entity 和卡牌数据和原对象共用
+        """
+        cls = self.__class__
+        obj = cls.__new__(cls)
+        for name in self.slot_names():
+            setattr(obj, name, getattr(self, name))
+        d = getattr(self, '__dict__', None)
+        if d:
+            obj.__dict__.update(d)
+        return obj
+
+    def snapshot(self):
+        """
+        模拟前的状态, 可以 hash; 有 __dict__ 的子类最后一项是 __dict__ 的内容
+        """
+        state = self.combat_getter()(self)
+        d = getattr(self, '__dict__', None)
+        if d is not None:
+            state += (tuple(d.items()),)
+        return state
+
+    def restore(self, state):
+        for f, v in zip(self.combat_names(), state):
+            setattr(self, f, v)
+        d = getattr(self, '__dict__', None)
+        if d is not None:
+            # play 里新加的字段也去掉
+            d.clear()
+            d.update(state[-1])
+
+    def __deepcopy__(self, memo):
+        # hearthstone 的 Entity 只读不改, 副本直接共用, 不跟着复制整棵 Entity 树
+        cls = self.__class__
+        obj = cls.__new__(cls)
+        memo[id(self)] = obj
+        for name, value in self.fields().items():
+            setattr(obj, name, value if name == 'entity' else copy.deepcopy(value, memo))
+        return obj
+
     def __str__(self) -> str:
-        return self.__dict__.__str__()
+        return self.fields().__str__()
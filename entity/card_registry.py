@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import importlib
+import json
+import logging
+import os
+import re
+
+from entity.spell_entity import SpellEntity
+
+logger = logging.getLogger()
+
+CARDS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'cards')
+# 每个英雄目录的 {技能: 模块路径} 和目录的修改时间, 目录有改动时只重新扫描这个目录; 不提交到仓库
+# 放在 cards 外面, 写索引不会改变被扫描目录的修改时间
+INDEX_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'card_index.json')
+# 技能的 card_id 后面带着等级, 比如 LETL_452_05
+TIER_SUFFIX = re.compile(r'_\d{2}$')
+
+
+def list_heros(cards_dir=CARDS_DIR):
+    """
+    entity/cards 下的英雄目录, 佣兵(以 H 结尾)的排在前面
+    """
+    heros = sorted(e.name for e in os.scandir(cards_dir) if e.is_dir() and not e.name.startswith('__'))
+    heros.sort(key=lambda h: not h.endswith('H'))
+    return heros
+
+
+def scan_hero(cards_dir, hero):
+    """
+    一个英雄目录下的 {技能: 模块路径}
+    """
+    return {f[:-3]: f'entity.cards.{hero}.{f[:-3]}' for f in sorted(os.listdir(os.path.join(cards_dir, hero)))
+            if f.endswith('.py') and f != '__init__.py'}
+
+
+def merge_cards(heros, hero_cards):
+    """
+    同一个技能放在好几个英雄目录下时, 优先用佣兵(以 H 结尾)的目录
+    """
+    cards = {}
+    for hero in heros:
+        for name, path in hero_cards[hero].items():
+            cards.setdefault(name, path)
+    return cards
+
+
+def scan_cards(cards_dir=CARDS_DIR):
+    """
+    遍历 entity/cards/<英雄>/<技能>.py, 返回 {技能: 模块路径}
+    """
+    heros = list_heros(cards_dir)
+    return merge_cards(heros, {hero: scan_hero(cards_dir, hero) for hero in heros})
+
+
+class CardRegistry:
+    """
+    card_id -> 卡牌类, 第一次用到某张卡时才 import 它的模块
+    """
+
+    def __init__(self, cards_dir=CARDS_DIR, index_path=INDEX_PATH):
+        self.cards_dir = cards_dir
+        self.index_path = index_path
+        self._cards = None
+        # {card_id: 类 或 None}
+        self._classes = {}
+        # {card_id: 技能的构造函数}
+        self._spell_classes = {}
+
+    @property
+    def cards(self):
+        if self._cards is None:
+            self._cards = self.load_index()
+        return self._cards
+
+    def load_index(self):
+        """
+        增删技能文件会改变英雄目录的修改时间, 只重新扫描修改时间变了的目录;
+        第一次 import 某个英雄的卡牌时生成的 __pycache__ 也会让这个目录重新扫描一次
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)['heros']
+        except (OSError, ValueError, KeyError, TypeError):
+            index = {}
+        heros = list_heros(self.cards_dir)
+        changed = set(index) != set(heros)
+        hero_cards = {}
+        for hero in heros:
+            mtime = os.stat(os.path.join(self.cards_dir, hero)).st_mtime_ns
+            cached = index.get(hero)
+            if cached is not None and cached[0] == mtime:
+                hero_cards[hero] = cached[1]
+                continue
+            hero_cards[hero] = scan_hero(self.cards_dir, hero)
+            index[hero] = [mtime, hero_cards[hero]]
+            changed = True
+        if changed:
+            index = {hero: index[hero] for hero in heros}
+            try:
+                tmp = self.index_path + '.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump({'heros': index}, f, indent=1, sort_keys=True)
+                os.replace(tmp, self.index_path)
+            except OSError as e:
+                logger.warning(f'save {self.index_path} failed: {e}')
+        return merge_cards(heros, hero_cards)
+
+    def module_path(self, card_id):
+        # 没有揭示的卡牌(比如 GAME_RESET 之后)没有 card_id
+        if not card_id:
+            return None
+        cards = self.cards
+        if card_id in cards:
+            return cards[card_id]
+        return cards.get(TIER_SUFFIX.sub('', card_id))
+
+    def get(self, card_id):
+        """
+        Returns:
+            card_id 对应的卡牌类, 没有实现的卡牌返回 None
+        """
+        if card_id in self._classes:
+            return self._classes[card_id]
+        cls = None
+        path = self.module_path(card_id)
+        if path is not None:
+            try:
+                module = importlib.import_module(path)
+                cls = getattr(module, path.rsplit('.', 1)[-1], None)
+            except Exception as e:
+                logger.warning(f'import {path} failed: {e}')
+        self._classes[card_id] = cls
+        return cls
+
+    def spell_class(self, card_id):
+        """
+        技能的构造函数, 没有实现或者不是技能的卡牌用 SpellEntity; 第一次查到后按 card_id 缓存
+        """
+        cls = self._spell_classes.get(card_id)
+        if cls is None:
+            cls = self.get(card_id)
+            if not (isinstance(cls, type) and issubclass(cls, SpellEntity)):
+                cls = SpellEntity
+            self._spell_classes[card_id] = cls
+        return cls
+
+
+registry = CardRegistry()
+
+
+def get_card_class(card_id):
+    return registry.get(card_id)
+
+
+def get_spell_class(card_id):
+    return registry.spell_class(card_id)
+
+
+def lazy_package(package, names):
+    """
+    给包的 __init__.py 用的 PEP 562 __getattr__ / __dir__, 访问子模块时才 import
+    """
+
+    def __getattr__(name):
+        if name in names:
+            return importlib.import_module(f'{package}.{name}')
+        raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+    def __dir__():
+        return sorted(names)
+
+    return __getattr__, __dir__
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_002H.LETL_009P1
-import entity.cards.BARL_002H.LETL_009P6
-import entity.cards.BARL_002H.LETL_009P9
-import entity.cards.BARL_002H.LETL_637
-import entity.cards.BARL_002H.LETL_635
-import entity.cards.BARL_002H.LETL_636
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_009P1',
+    'LETL_009P6',
+    'LETL_009P9',
+    'LETL_637',
+    'LETL_635',
+    'LETL_636',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_005H.LETL_320
-import entity.cards.BARL_005H.LETL_328
-import entity.cards.BARL_005H.LETL_324
-import entity.cards.BARL_005H.LETL_323
-import entity.cards.BARL_005H.LETL_326
-import entity.cards.BARL_005H.LETL_327
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_320',
+    'LETL_328',
+    'LETL_324',
+    'LETL_323',
+    'LETL_326',
+    'LETL_327',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_007H.LETL_340
-import entity.cards.BARL_007H.LETL_342
-import entity.cards.BARL_007H.LETL_341
-import entity.cards.BARL_007H.LETL_343
-import entity.cards.BARL_007H.LETL_374
-import entity.cards.BARL_007H.LETL_375
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_340',
+    'LETL_342',
+    'LETL_341',
+    'LETL_343',
+    'LETL_374',
+    'LETL_375',
+])
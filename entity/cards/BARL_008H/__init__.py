@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_008H.LETL_004P1
-import entity.cards.BARL_008H.LETL_280
-import entity.cards.BARL_008H.LETL_281
-import entity.cards.BARL_008H.LETL_283
-import entity.cards.BARL_008H.LETL_284
-import entity.cards.BARL_008H.LETL_285
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_004P1',
+    'LETL_280',
+    'LETL_281',
+    'LETL_283',
+    'LETL_284',
+    'LETL_285',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_009H.LETL_290
-import entity.cards.BARL_009H.LETL_291
-import entity.cards.BARL_009H.LETL_292
-import entity.cards.BARL_009H.LETL_293
-import entity.cards.BARL_009H.LETL_660
-import entity.cards.BARL_009H.LETL_661
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_290',
+    'LETL_291',
+    'LETL_292',
+    'LETL_293',
+    'LETL_660',
+    'LETL_661',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_010H.LETL_300
-import entity.cards.BARL_010H.LETL_302
-import entity.cards.BARL_010H.LETL_301
-import entity.cards.BARL_010H.LETL_303
-import entity.cards.BARL_010H.LETL_304
-import entity.cards.BARL_010H.LETL_305
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_300',
+    'LETL_302',
+    'LETL_301',
+    'LETL_303',
+    'LETL_304',
+    'LETL_305',
+])
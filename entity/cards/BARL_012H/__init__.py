@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_012H.LETL_250
-import entity.cards.BARL_012H.LETL_251
-import entity.cards.BARL_012H.LETL_257
-import entity.cards.BARL_012H.LETL_254
-import entity.cards.BARL_012H.LETL_255
-import entity.cards.BARL_012H.LETL_261
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_250',
+    'LETL_251',
+    'LETL_257',
+    'LETL_254',
+    'LETL_255',
+    'LETL_261',
+])
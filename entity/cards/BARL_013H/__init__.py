@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_013H.LETL_224
-import entity.cards.BARL_013H.LETL_229
-import entity.cards.BARL_013H.LETL_309
-import entity.cards.BARL_013H.LETL_623
-import entity.cards.BARL_013H.LETL_625
-import entity.cards.BARL_013H.LETL_624
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_224',
+    'LETL_229',
+    'LETL_309',
+    'LETL_623',
+    'LETL_625',
+    'LETL_624',
+])
@@ -1,4 +1,9 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_015H.LETL_390
-import entity.cards.BARL_015H.LETL_391
-import entity.cards.BARL_015H.LETL_392
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_390',
+    'LETL_391',
+    'LETL_392',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_016H.LETL_403
-import entity.cards.BARL_016H.LETL_404
-import entity.cards.BARL_016H.LETL_405
-import entity.cards.BARL_016H.LETL_693
-import entity.cards.BARL_016H.LETL_694
-import entity.cards.BARL_016H.LETL_695
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_403',
+    'LETL_404',
+    'LETL_405',
+    'LETL_693',
+    'LETL_694',
+    'LETL_695',
+])
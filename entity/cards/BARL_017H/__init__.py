@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_017H.LETL_470
-import entity.cards.BARL_017H.LETL_471
-import entity.cards.BARL_017H.LETL_472
-import entity.cards.BARL_017H.LETL_706
-import entity.cards.BARL_017H.LETL_707
-import entity.cards.BARL_017H.LETL_709
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_470',
+    'LETL_471',
+    'LETL_472',
+    'LETL_706',
+    'LETL_707',
+    'LETL_709',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_023H.LETL_258
-import entity.cards.BARL_023H.LETL_252
-import entity.cards.BARL_023H.LETL_256
-import entity.cards.BARL_023H.LETL_253
-import entity.cards.BARL_023H.LETL_259
-import entity.cards.BARL_023H.LETL_260
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_258',
+    'LETL_252',
+    'LETL_256',
+    'LETL_253',
+    'LETL_259',
+    'LETL_260',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_024H.LETL_232
-import entity.cards.BARL_024H.LETL_233
-import entity.cards.BARL_024H.LETL_234
-import entity.cards.BARL_024H.LETL_639
-import entity.cards.BARL_024H.LETL_638
-import entity.cards.BARL_024H.LETL_640
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_232',
+    'LETL_233',
+    'LETL_234',
+    'LETL_639',
+    'LETL_638',
+    'LETL_640',
+])
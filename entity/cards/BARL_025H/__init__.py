@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.BARL_025H.LETL_220
-import entity.cards.BARL_025H.LETL_222
-import entity.cards.BARL_025H.LETL_225
-import entity.cards.BARL_025H.LETL_620
-import entity.cards.BARL_025H.LETL_621
-import entity.cards.BARL_025H.LETL_622
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_220',
+    'LETL_222',
+    'LETL_225',
+    'LETL_620',
+    'LETL_621',
+    'LETL_622',
+])
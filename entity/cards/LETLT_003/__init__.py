@@ -1,2 +1,7 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETLT_003.LETL_000
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_000',
+])
@@ -1,3 +1,8 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETLT_021.LETL_017P7
-import entity.cards.LETLT_021.LETL_000
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_017P7',
+    'LETL_000',
+])
@@ -1,3 +1,7 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETLT_038.LETLT_038
-import entity.cards.LETLT_038.LETLT_038
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETLT_038',
+])
@@ -1,3 +1,8 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETLT_072.LETLT_072p2
-import entity.cards.LETLT_072.LETLT_072p1
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETLT_072p2',
+    'LETLT_072p1',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_001H.LETL_001P3
-import entity.cards.LETL_001H.LETL_001P5
-import entity.cards.LETL_001H.LETL_001P9
-import entity.cards.LETL_001H.LETL_001P7
-import entity.cards.LETL_001H.LETL_651
-import entity.cards.LETL_001H.LETL_652
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_001P3',
+    'LETL_001P5',
+    'LETL_001P9',
+    'LETL_001P7',
+    'LETL_651',
+    'LETL_652',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_002H.LETL_002P3
-import entity.cards.LETL_002H.LETL_002P4
-import entity.cards.LETL_002H.LETL_002P7
-import entity.cards.LETL_002H.LETL_681
-import entity.cards.LETL_002H.LETL_682
-import entity.cards.LETL_002H.LETL_680
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_002P3',
+    'LETL_002P4',
+    'LETL_002P7',
+    'LETL_681',
+    'LETL_682',
+    'LETL_680',
+])
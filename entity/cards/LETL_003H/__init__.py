@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_003H.LETL_003P1
-import entity.cards.LETL_003H.LETL_003P4
-import entity.cards.LETL_003H.LETL_003P8
-import entity.cards.LETL_003H.LETL_642
-import entity.cards.LETL_003H.LETL_643
-import entity.cards.LETL_003H.LETL_644
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_003P1',
+    'LETL_003P4',
+    'LETL_003P8',
+    'LETL_642',
+    'LETL_643',
+    'LETL_644',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_005H.LETL_005P4
-import entity.cards.LETL_005H.LETL_022P4
-import entity.cards.LETL_005H.LETL_005P8
-import entity.cards.LETL_005H.LETL_653
-import entity.cards.LETL_005H.LETL_654
-import entity.cards.LETL_005H.LETL_655
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_005P4',
+    'LETL_022P4',
+    'LETL_005P8',
+    'LETL_653',
+    'LETL_654',
+    'LETL_655',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_006H.LETL_006P1
-import entity.cards.LETL_006H.LETL_006P9
-import entity.cards.LETL_006H.LETL_006P8
-import entity.cards.LETL_006H.LETL_601
-import entity.cards.LETL_006H.LETL_604
-import entity.cards.LETL_006H.LETL_602
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_006P1',
+    'LETL_006P9',
+    'LETL_006P8',
+    'LETL_601',
+    'LETL_604',
+    'LETL_602',
+])
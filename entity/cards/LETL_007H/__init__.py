@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_007H.LETL_007P5
-import entity.cards.LETL_007H.LETL_007P4
-import entity.cards.LETL_007H.LETL_007P7
-import entity.cards.LETL_007H.LETL_007P8
-import entity.cards.LETL_007H.LETL_647
-import entity.cards.LETL_007H.LETL_648
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_007P5',
+    'LETL_007P4',
+    'LETL_007P7',
+    'LETL_007P8',
+    'LETL_647',
+    'LETL_648',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_009H.LETL_009P7
-import entity.cards.LETL_009H.LETL_413
-import entity.cards.LETL_009H.LETL_414
-import entity.cards.LETL_009H.LETL_674
-import entity.cards.LETL_009H.LETL_676
-import entity.cards.LETL_009H.LETL_675
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_009P7',
+    'LETL_413',
+    'LETL_414',
+    'LETL_674',
+    'LETL_676',
+    'LETL_675',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_010H.LETL_010P2
-import entity.cards.LETL_010H.LETL_480
-import entity.cards.LETL_010H.LETL_481
-import entity.cards.LETL_010H.LETL_482
-import entity.cards.LETL_010H.LETL_483
-import entity.cards.LETL_010H.LETL_484
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_010P2',
+    'LETL_480',
+    'LETL_481',
+    'LETL_482',
+    'LETL_483',
+    'LETL_484',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_011H.LETL_330
-import entity.cards.LETL_011H.LETL_331
-import entity.cards.LETL_011H.LETL_332_
-import entity.cards.LETL_011H.LETL_333
-import entity.cards.LETL_011H.LETL_334
-import entity.cards.LETL_011H.LETL_335
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_330',
+    'LETL_331',
+    'LETL_332_',
+    'LETL_333',
+    'LETL_334',
+    'LETL_335',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_012H.LETL_012P4
-import entity.cards.LETL_012H.LETL_012P6
-import entity.cards.LETL_012H.LETL_012P7
-import entity.cards.LETL_012H.LETL_690
-import entity.cards.LETL_012H.LETL_691
-import entity.cards.LETL_012H.LETL_692
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_012P4',
+    'LETL_012P6',
+    'LETL_012P7',
+    'LETL_690',
+    'LETL_691',
+    'LETL_692',
+])
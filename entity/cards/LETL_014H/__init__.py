@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_014H.LETL_014P2
-import entity.cards.LETL_014H.LETL_014P6
-import entity.cards.LETL_014H.LETL_242
-import entity.cards.LETL_014H.LETL_243
-import entity.cards.LETL_014H.LETL_244
-import entity.cards.LETL_014H.LETL_245
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_014P2',
+    'LETL_014P6',
+    'LETL_242',
+    'LETL_243',
+    'LETL_244',
+    'LETL_245',
+])
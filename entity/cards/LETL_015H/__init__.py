@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_015H.LETL_262
-import entity.cards.LETL_015H.LETL_263
-import entity.cards.LETL_015H.LETL_015P9
-import entity.cards.LETL_015H.LETL_265
-import entity.cards.LETL_015H.LETL_266
-import entity.cards.LETL_015H.LETL_267
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_262',
+    'LETL_263',
+    'LETL_015P9',
+    'LETL_265',
+    'LETL_266',
+    'LETL_267',
+])
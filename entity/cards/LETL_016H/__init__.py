@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_016H.LETL_410
-import entity.cards.LETL_016H.LETL_411
-import entity.cards.LETL_016H.LETL_412
-import entity.cards.LETL_016H.LETL_677
-import entity.cards.LETL_016H.LETL_678
-import entity.cards.LETL_016H.LETL_679
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_410',
+    'LETL_411',
+    'LETL_412',
+    'LETL_677',
+    'LETL_678',
+    'LETL_679',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_017H.LETL_017P7
-import entity.cards.LETL_017H.LETL_306
-import entity.cards.LETL_017H.LETL_307
-import entity.cards.LETL_017H.LETL_631
-import entity.cards.LETL_017H.LETL_634
-import entity.cards.LETL_017H.LETL_670
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_017P7',
+    'LETL_306',
+    'LETL_307',
+    'LETL_631',
+    'LETL_634',
+    'LETL_670',
+])
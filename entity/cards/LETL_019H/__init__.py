@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_019H.LETL_010P5
-import entity.cards.LETL_019H.LETL_013P3
-import entity.cards.LETL_019H.LETL_019P1
-import entity.cards.LETL_019H.LETL_615
-import entity.cards.LETL_019H.LETL_710
-import entity.cards.LETL_019H.LETL_711
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_010P5',
+    'LETL_013P3',
+    'LETL_019P1',
+    'LETL_615',
+    'LETL_710',
+    'LETL_711',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_020H.LETL_020P6
-import entity.cards.LETL_020H.LETL_406
-import entity.cards.LETL_020H.LETL_409
-import entity.cards.LETL_020H.LETL_684
-import entity.cards.LETL_020H.LETL_685
-import entity.cards.LETL_020H.LETL_686
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_020P6',
+    'LETL_406',
+    'LETL_409',
+    'LETL_684',
+    'LETL_685',
+    'LETL_686',
+])
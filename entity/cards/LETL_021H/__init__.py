@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_021H.LETL_014P1
-import entity.cards.LETL_021H.LETL_407
-import entity.cards.LETL_021H.LETL_408
-import entity.cards.LETL_021H.LETL_715
-import entity.cards.LETL_021H.LETL_716
-import entity.cards.LETL_021H.LETL_717
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_014P1',
+    'LETL_407',
+    'LETL_408',
+    'LETL_715',
+    'LETL_716',
+    'LETL_717',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_022H.LETL_022P1
-import entity.cards.LETL_022H.LETL_022P7
-import entity.cards.LETL_022H.LETL_373
-import entity.cards.LETL_022H.LETL_617
-import entity.cards.LETL_022H.LETL_656
-import entity.cards.LETL_022H.LETL_657
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_022P1',
+    'LETL_022P7',
+    'LETL_373',
+    'LETL_617',
+    'LETL_656',
+    'LETL_657',
+])
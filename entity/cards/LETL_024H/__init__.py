@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_024H.LETL_024P1
-import entity.cards.LETL_024H.LETL_024P2
-import entity.cards.LETL_024H.LETL_024P3
-import entity.cards.LETL_024H.LETL_024E1
-import entity.cards.LETL_024H.LETL_024E2
-import entity.cards.LETL_024H.LETL_024E3
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_024P1',
+    'LETL_024P2',
+    'LETL_024P3',
+    'LETL_024E1',
+    'LETL_024E2',
+    'LETL_024E3',
+])
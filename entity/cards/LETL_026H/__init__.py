@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_026H.LETL_027P3
-import entity.cards.LETL_026H.LETL_026P8
-import entity.cards.LETL_026H.LETL_026P4
-import entity.cards.LETL_026H.LETL_608
-import entity.cards.LETL_026H.LETL_607
-import entity.cards.LETL_026H.LETL_610
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_027P3',
+    'LETL_026P8',
+    'LETL_026P4',
+    'LETL_608',
+    'LETL_607',
+    'LETL_610',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_027H.LETL_027P6
-import entity.cards.LETL_027H.LETL_027P2
-import entity.cards.LETL_027H.LETL_029P12
-import entity.cards.LETL_027H.LETL_606
-import entity.cards.LETL_027H.LETL_605
-import entity.cards.LETL_027H.LETL_609
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_027P6',
+    'LETL_027P2',
+    'LETL_029P12',
+    'LETL_606',
+    'LETL_605',
+    'LETL_609',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_028H.LETL_005P3
-import entity.cards.LETL_028H.LETL_028P9
-import entity.cards.LETL_028H.LETL_028P11
-import entity.cards.LETL_028H.LETL_446
-import entity.cards.LETL_028H.LETL_447
-import entity.cards.LETL_028H.LETL_448
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_005P3',
+    'LETL_028P9',
+    'LETL_028P11',
+    'LETL_446',
+    'LETL_447',
+    'LETL_448',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_029H.LETL_029P5
-import entity.cards.LETL_029H.LETL_029P6
-import entity.cards.LETL_029H.LETL_029P10
-import entity.cards.LETL_029H.LETL_703
-import entity.cards.LETL_029H.LETL_704
-import entity.cards.LETL_029H.LETL_705
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_029P5',
+    'LETL_029P6',
+    'LETL_029P10',
+    'LETL_703',
+    'LETL_704',
+    'LETL_705',
+])
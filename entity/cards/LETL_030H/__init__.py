@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_030H.LETL_030P4
-import entity.cards.LETL_030H.LETL_030P6
-import entity.cards.LETL_030H.LETL_030P3
-import entity.cards.LETL_030H.LETL_700
-import entity.cards.LETL_030H.LETL_701
-import entity.cards.LETL_030H.LETL_702
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_030P4',
+    'LETL_030P6',
+    'LETL_030P3',
+    'LETL_700',
+    'LETL_701',
+    'LETL_702',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_031H.LETL_031P2
-import entity.cards.LETL_031H.LETL_031P4
-import entity.cards.LETL_031H.LETL_031P7
-import entity.cards.LETL_031H.LETL_611
-import entity.cards.LETL_031H.LETL_658
-import entity.cards.LETL_031H.LETL_659
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_031P2',
+    'LETL_031P4',
+    'LETL_031P7',
+    'LETL_611',
+    'LETL_658',
+    'LETL_659',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_032H.LETL_032P5
-import entity.cards.LETL_032H.LETL_032P4
-import entity.cards.LETL_032H.LETL_032P6
-import entity.cards.LETL_032H.LETL_612
-import entity.cards.LETL_032H.LETL_613
-import entity.cards.LETL_032H.LETL_614
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_032P5',
+    'LETL_032P4',
+    'LETL_032P6',
+    'LETL_612',
+    'LETL_613',
+    'LETL_614',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_033H.LETL_033P2
-import entity.cards.LETL_033H.LETL_033P5
-import entity.cards.LETL_033H.LETL_033P4
-import entity.cards.LETL_033H.LETL_485
-import entity.cards.LETL_033H.LETL_486
-import entity.cards.LETL_033H.LETL_487
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_033P2',
+    'LETL_033P5',
+    'LETL_033P4',
+    'LETL_485',
+    'LETL_486',
+    'LETL_487',
+])
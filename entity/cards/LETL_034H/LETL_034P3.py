@@ -19,7 +19,7 @@ class LETL_034P3(SpellEntity):
 
     def play(self, game, hero, target):
         # 伤害为攻击伤害
-        damage = hero.dmg
+        damage = hero.atk
 
         # 获取技能列表
         action_list = game.get_action_list(not hero.own)
@@ -35,6 +35,6 @@ class LETL_034P3(SpellEntity):
         target = game.get_attack_target(target)
         target.got_damage(game, damage * self.damage_advantage[self.lettuce_role][target.lettuce_role])
         # 自己受到伤害
-        hero.got_damage(game, target.dmg)
+        hero.got_damage(game, target.atk)
         # 回复
         hero.got_heal(game, cnt * self.heal)
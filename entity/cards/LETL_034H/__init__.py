@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_034H.LETL_034P3
-import entity.cards.LETL_034H.LETL_319
-import entity.cards.LETL_034H.LETL_246
-import entity.cards.LETL_034H.LETL_034P1
-import entity.cards.LETL_034H.LETL_247
-import entity.cards.LETL_034H.LETL_248
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_034P3',
+    'LETL_319',
+    'LETL_246',
+    'LETL_034P1',
+    'LETL_247',
+    'LETL_248',
+])
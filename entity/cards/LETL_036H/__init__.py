@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_036H.LETL_460
-import entity.cards.LETL_036H.LETL_462
-import entity.cards.LETL_036H.LETL_463
-import entity.cards.LETL_036H.LETL_465
-import entity.cards.LETL_036H.LETL_466
-import entity.cards.LETL_036H.LETL_464
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_460',
+    'LETL_462',
+    'LETL_463',
+    'LETL_465',
+    'LETL_466',
+    'LETL_464',
+])
@@ -18,7 +18,7 @@ class LETL_282(SpellEntity):
 
     def play(self, game, hero, target):
         # 伤害为攻击伤害
-        damage = hero.dmg
+        damage = hero.atk
         # 攻击生命最低
         while True:
             h = game.find_min_health(not hero.own())
@@ -26,6 +26,6 @@ class LETL_282(SpellEntity):
                 break
             h.got_damage(game, damage * self.damage_advantage[self.lettuce_role][h.lettuce_role])
             # 自己受到伤害
-            hero.got_damage(game, h.dmg)
+            hero.got_damage(game, h.atk)
             if not h.is_alive():
                 break
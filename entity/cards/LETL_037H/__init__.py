@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_037H.LETL_269
-import entity.cards.LETL_037H.LETL_037P2
-import entity.cards.LETL_037H.LETL_282
-import entity.cards.LETL_037H.LETL_271
-import entity.cards.LETL_037H.LETL_272
-import entity.cards.LETL_037H.LETL_273
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_269',
+    'LETL_037P2',
+    'LETL_282',
+    'LETL_271',
+    'LETL_272',
+    'LETL_273',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_038H.LETL_274
-import entity.cards.LETL_038H.LETL_275
-import entity.cards.LETL_038H.LETL_276
-import entity.cards.LETL_038H.LETL_277
-import entity.cards.LETL_038H.LETL_278
-import entity.cards.LETL_038H.LETL_279
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_274',
+    'LETL_275',
+    'LETL_276',
+    'LETL_277',
+    'LETL_278',
+    'LETL_279',
+])
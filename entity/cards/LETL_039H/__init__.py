@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_039H.LETL_039P8
-import entity.cards.LETL_039H.LETL_039P5
-import entity.cards.LETL_039H.LETL_039P6
-import entity.cards.LETL_039H.LETL_712
-import entity.cards.LETL_039H.LETL_713
-import entity.cards.LETL_039H.LETL_714
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_039P8',
+    'LETL_039P5',
+    'LETL_039P6',
+    'LETL_712',
+    'LETL_713',
+    'LETL_714',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_040H.LETL_040P3
-import entity.cards.LETL_040H.LETL_040P7
-import entity.cards.LETL_040H.LETL_040P9
-import entity.cards.LETL_040H.LETL_040P5
-import entity.cards.LETL_040H.LETL_662
-import entity.cards.LETL_040H.LETL_663
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_040P3',
+    'LETL_040P7',
+    'LETL_040P9',
+    'LETL_040P5',
+    'LETL_662',
+    'LETL_663',
+])
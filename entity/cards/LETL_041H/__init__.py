@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_041H.LETL_316
-import entity.cards.LETL_041H.LETL_317
-import entity.cards.LETL_041H.LETL_318
-import entity.cards.LETL_041H.LETL_687
-import entity.cards.LETL_041H.LETL_688
-import entity.cards.LETL_041H.LETL_689
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_316',
+    'LETL_317',
+    'LETL_318',
+    'LETL_687',
+    'LETL_688',
+    'LETL_689',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LT21_01H.LT21_001
-import entity.cards.LT21_01H.LT21_002
-import entity.cards.LT21_01H.LT21_003
-import entity.cards.LT21_01H.LT21_004
-import entity.cards.LT21_01H.LT21_005
-import entity.cards.LT21_01H.LT21_006
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LT21_001',
+    'LT21_002',
+    'LT21_003',
+    'LT21_004',
+    'LT21_005',
+    'LT21_006',
+])
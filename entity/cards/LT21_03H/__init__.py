@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LT21_03H.LT21_013_
-import entity.cards.LT21_03H.LT21_014_
-import entity.cards.LT21_03H.LT21_015_
-import entity.cards.LT21_03H.LT21_016_
-import entity.cards.LT21_03H.LT21_017_
-import entity.cards.LT21_03H.LT21_018_
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LT21_013_',
+    'LT21_014_',
+    'LT21_015_',
+    'LT21_016_',
+    'LT21_017_',
+    'LT21_018_',
+])
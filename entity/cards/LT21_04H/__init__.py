@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LT21_04H.LT21_019
-import entity.cards.LT21_04H.LT21_020
-import entity.cards.LT21_04H.LT21_021
-import entity.cards.LT21_04H.LT21_022_
-import entity.cards.LT21_04H.LT21_023_
-import entity.cards.LT21_04H.LT21_024_
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LT21_019',
+    'LT21_020',
+    'LT21_021',
+    'LT21_022_',
+    'LT21_023_',
+    'LT21_024_',
+])
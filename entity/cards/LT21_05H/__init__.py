@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LT21_05H.LT21_05P1
-import entity.cards.LT21_05H.LT21_05P2
-import entity.cards.LT21_05H.LT21_05P3
-import entity.cards.LT21_05H.LT21_05E1
-import entity.cards.LT21_05H.LT21_05E2
-import entity.cards.LT21_05H.LT21_05E3
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LT21_05P1',
+    'LT21_05P2',
+    'LT21_05P3',
+    'LT21_05E1',
+    'LT21_05E2',
+    'LT21_05E3',
+])
@@ -1,6 +1,4 @@
 # -*- coding: utf-8 -*-
-import random
-
 from hearthstone.entities import Entity
 from hearthstone.enums import SpellSchool
 
@@ -29,6 +27,9 @@ class LETL_452(SpellEntity):
         if self.trigger_twice:
             cnt *= 2
         for _ in range(cnt):
-            # 假设每次只打最高血量的佣兵
-            h = game.find_max_health(not hero.own())
+            # 随机打一个活着的敌人, 确定性搜索时假设打血量最高的
+            hero_list = [h for h in game.get_hero_list(not hero.own()) if h.is_alive()]
+            if not hero_list:
+                break
+            h = game.pick_targets(hero_list, 1)[0]
             h.got_damage(game, (self.damage + power) * self.damage_advantage[self.lettuce_role][h.lettuce_role])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.SWL_01H.LETL_450
-import entity.cards.SWL_01H.LETL_451
-import entity.cards.SWL_01H.LETL_452
-import entity.cards.SWL_01H.LETL_453
-import entity.cards.SWL_01H.LETL_454
-import entity.cards.SWL_01H.LETL_455
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_450',
+    'LETL_451',
+    'LETL_452',
+    'LETL_453',
+    'LETL_454',
+    'LETL_455',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.SWL_06H.LETL_002P5
-import entity.cards.SWL_06H.LETL_440
-import entity.cards.SWL_06H.LETL_441
-import entity.cards.SWL_06H.LETL_434
-import entity.cards.SWL_06H.LETL_443
-import entity.cards.SWL_06H.LETL_444
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_002P5',
+    'LETL_440',
+    'LETL_441',
+    'LETL_434',
+    'LETL_443',
+    'LETL_444',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.SWL_10H.LETL_014P3
-import entity.cards.SWL_10H.LETL_420
-import entity.cards.SWL_10H.LETL_422
-import entity.cards.SWL_10H.LETL_423
-import entity.cards.SWL_10H.LETL_424
-import entity.cards.SWL_10H.LETL_425
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_014P3',
+    'LETL_420',
+    'LETL_422',
+    'LETL_423',
+    'LETL_424',
+    'LETL_425',
+])
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.SWL_13H.LETL_430
-import entity.cards.SWL_13H.LETL_431
-import entity.cards.SWL_13H.LETL_432
-import entity.cards.SWL_13H.LETL_433
-import entity.cards.SWL_13H.LETL_436
-import entity.cards.SWL_13H.LETL_437
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_430',
+    'LETL_431',
+    'LETL_432',
+    'LETL_433',
+    'LETL_436',
+    'LETL_437',
+])
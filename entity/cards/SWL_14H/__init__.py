@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.SWL_14H.LETL_336
-import entity.cards.SWL_14H.LETL_337
-import entity.cards.SWL_14H.LETL_338
-import entity.cards.SWL_14H.LETL_696
-import entity.cards.SWL_14H.LETL_697
-import entity.cards.SWL_14H.LETL_698
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_336',
+    'LETL_337',
+    'LETL_338',
+    'LETL_696',
+    'LETL_697',
+    'LETL_698',
+])
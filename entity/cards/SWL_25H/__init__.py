@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.SWL_25H.LETL_017P6
-import entity.cards.SWL_25H.LETL_308
-import entity.cards.SWL_25H.LETL_017P2
-import entity.cards.SWL_25H.LETL_632
-import entity.cards.SWL_25H.LETL_668
-import entity.cards.SWL_25H.LETL_669
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_017P6',
+    'LETL_308',
+    'LETL_017P2',
+    'LETL_632',
+    'LETL_668',
+    'LETL_669',
+])
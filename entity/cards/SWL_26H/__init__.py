@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-import entity.cards.SWL_26H.LETL_235
-import entity.cards.SWL_26H.LETL_236
-import entity.cards.SWL_26H.LETL_237
-import entity.cards.SWL_26H.LETL_666
-import entity.cards.SWL_26H.LETL_672
-import entity.cards.SWL_26H.LETL_699
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_235',
+    'LETL_236',
+    'LETL_237',
+    'LETL_666',
+    'LETL_672',
+    'LETL_699',
+])
@@ -1,138 +1,141 @@
 # -*- coding: utf-8 -*-
-import entity.cards.LETL_015H
-import entity.cards.LETL_006H
-import entity.cards.LETL_007H
-import entity.cards.LETL_002H
-import entity.cards.LETL_014H
-import entity.cards.LETL_009H
-import entity.cards.LETL_010H
-import entity.cards.LETL_011H
-import entity.cards.LETL_012H
-import entity.cards.LETL_016H
-import entity.cards.LETL_003H
-import entity.cards.LETL_005H
-import entity.cards.LETL_001H
-import entity.cards.LETL_019H
-import entity.cards.LETL_020H
-import entity.cards.LETL_021H
-import entity.cards.LETL_028H
-import entity.cards.LETL_029H
-import entity.cards.LETL_030H
-import entity.cards.LETL_031H
-import entity.cards.LETL_032H
-import entity.cards.LETL_033H
-import entity.cards.LETL_034H
-import entity.cards.LETL_036H
-import entity.cards.LETL_022H
-import entity.cards.LETL_017H
-import entity.cards.LETL_026H
-import entity.cards.LETL_027H
-import entity.cards.LETL_038H
-import entity.cards.LETL_037H
-import entity.cards.LETL_039H
-import entity.cards.LETL_040H
-import entity.cards.BARL_025H
-import entity.cards.BARL_013H
-import entity.cards.BARL_002H
-import entity.cards.BARL_024H
-import entity.cards.BARL_012H
-import entity.cards.BARL_023H
-import entity.cards.BARL_008H
-import entity.cards.BARL_009H
-import entity.cards.BARL_010H
-import entity.cards.BARL_005H
-import entity.cards.BARL_007H
-import entity.cards.BARL_017H
-import entity.cards.BARL_016H
-import entity.cards.BARL_015H
-import entity.cards.SWL_10H
-import entity.cards.SWL_13H
-import entity.cards.SWL_06H
-import entity.cards.SWL_25H
-import entity.cards.SWL_01H
-import entity.cards.LETL_041H
-import entity.cards.SWL_14H
-import entity.cards.SWL_26H
-import entity.cards.LETLT_001
-import entity.cards.LETLT_003
-import entity.cards.LETLT_002
-import entity.cards.LETLT_004
-import entity.cards.LETLT_005
-import entity.cards.LETLT_006
-import entity.cards.LETLT_007
-import entity.cards.LETLT_008
-import entity.cards.LETLT_009
-import entity.cards.LETLT_010
-import entity.cards.LETLT_011
-import entity.cards.LETLT_012
-import entity.cards.LETLT_013
-import entity.cards.LETLT_014
-import entity.cards.LETLT_015
-import entity.cards.LETLT_016
-import entity.cards.LETLT_017
-import entity.cards.LETLT_018
-import entity.cards.LETLT_019
-import entity.cards.LETLT_020
-import entity.cards.LETLT_021
-import entity.cards.LETLT_022
-import entity.cards.LT21_05H
-import entity.cards.LETL_
-import entity.cards.LT21_03H
-import entity.cards.LT21_01H
-import entity.cards.LETLT_033
-import entity.cards.LETLT_036
-import entity.cards.LETLT_032
-import entity.cards.LETLT_031
-import entity.cards.LETLT_034
-import entity.cards.LETLT_035
-import entity.cards.LETLT_044
-import entity.cards.LETLT_045
-import entity.cards.LETLT_023
-import entity.cards.LETLT_025
-import entity.cards.LETLT_027
-import entity.cards.LETLT_029
-import entity.cards.LETLT_030
-import entity.cards.LETLT_037
-import entity.cards.LETLT_038
-import entity.cards.LETLT_039
-import entity.cards.LETLT_040
-import entity.cards.LETLT_041
-import entity.cards.LETLT_042
-import entity.cards.LETLT_043
-import entity.cards.LETLT_048
-import entity.cards.LETLT_050
-import entity.cards.LETLT_051
-import entity.cards.LETLT_052
-import entity.cards.LETLT_053
-import entity.cards.LETLT_054
-import entity.cards.LETLT_055
-import entity.cards.LETLT_056
-import entity.cards.LETLT_057
-import entity.cards.LETLT_058
-import entity.cards.LETLT_059
-import entity.cards.LETLT_060
-import entity.cards.LETLT_061
-import entity.cards.LETLT_070
-import entity.cards.LETLT_071
-import entity.cards.LETLT_072
-import entity.cards.LETLT_073
-import entity.cards.LETLT_074
-import entity.cards.LETLT_075
-import entity.cards.LETLT_076
-import entity.cards.LETLT_077
-import entity.cards.LETLT_080
-import entity.cards.LETLT_081
-import entity.cards.LETLT_082
-import entity.cards.LETLT_083
-import entity.cards.LETLT_084
-import entity.cards.LETLT_085
-import entity.cards.LETLT_086
-import entity.cards.LETLT_087
-import entity.cards.LETLT_090
-import entity.cards.LETLT_091
-import entity.cards.LETLT_088
-import entity.cards.LETLT_082
-import entity.cards.LETL_9
-import entity.cards.LETL_024H
-import entity.cards.LT21_04H
-import entity.cards.LETL_
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+    'LETL_015H',
+    'LETL_006H',
+    'LETL_007H',
+    'LETL_002H',
+    'LETL_014H',
+    'LETL_009H',
+    'LETL_010H',
+    'LETL_011H',
+    'LETL_012H',
+    'LETL_016H',
+    'LETL_003H',
+    'LETL_005H',
+    'LETL_001H',
+    'LETL_019H',
+    'LETL_020H',
+    'LETL_021H',
+    'LETL_028H',
+    'LETL_029H',
+    'LETL_030H',
+    'LETL_031H',
+    'LETL_032H',
+    'LETL_033H',
+    'LETL_034H',
+    'LETL_036H',
+    'LETL_022H',
+    'LETL_017H',
+    'LETL_026H',
+    'LETL_027H',
+    'LETL_038H',
+    'LETL_037H',
+    'LETL_039H',
+    'LETL_040H',
+    'BARL_025H',
+    'BARL_013H',
+    'BARL_002H',
+    'BARL_024H',
+    'BARL_012H',
+    'BARL_023H',
+    'BARL_008H',
+    'BARL_009H',
+    'BARL_010H',
+    'BARL_005H',
+    'BARL_007H',
+    'BARL_017H',
+    'BARL_016H',
+    'BARL_015H',
+    'SWL_10H',
+    'SWL_13H',
+    'SWL_06H',
+    'SWL_25H',
+    'SWL_01H',
+    'LETL_041H',
+    'SWL_14H',
+    'SWL_26H',
+    'LETLT_001',
+    'LETLT_003',
+    'LETLT_002',
+    'LETLT_004',
+    'LETLT_005',
+    'LETLT_006',
+    'LETLT_007',
+    'LETLT_008',
+    'LETLT_009',
+    'LETLT_010',
+    'LETLT_011',
+    'LETLT_012',
+    'LETLT_013',
+    'LETLT_014',
+    'LETLT_015',
+    'LETLT_016',
+    'LETLT_017',
+    'LETLT_018',
+    'LETLT_019',
+    'LETLT_020',
+    'LETLT_021',
+    'LETLT_022',
+    'LT21_05H',
+    'LETL_',
+    'LT21_03H',
+    'LT21_01H',
+    'LETLT_033',
+    'LETLT_036',
+    'LETLT_032',
+    'LETLT_031',
+    'LETLT_034',
+    'LETLT_035',
+    'LETLT_044',
+    'LETLT_045',
+    'LETLT_023',
+    'LETLT_025',
+    'LETLT_027',
+    'LETLT_029',
+    'LETLT_030',
+    'LETLT_037',
+    'LETLT_038',
+    'LETLT_039',
+    'LETLT_040',
+    'LETLT_041',
+    'LETLT_042',
+    'LETLT_043',
+    'LETLT_048',
+    'LETLT_050',
+    'LETLT_051',
+    'LETLT_052',
+    'LETLT_053',
+    'LETLT_054',
+    'LETLT_055',
+    'LETLT_056',
+    'LETLT_057',
+    'LETLT_058',
+    'LETLT_059',
+    'LETLT_060',
+    'LETLT_061',
+    'LETLT_070',
+    'LETLT_071',
+    'LETLT_072',
+    'LETLT_073',
+    'LETLT_074',
+    'LETLT_075',
+    'LETLT_076',
+    'LETLT_077',
+    'LETLT_080',
+    'LETLT_081',
+    'LETLT_082',
+    'LETLT_083',
+    'LETLT_084',
+    'LETLT_085',
+    'LETLT_086',
+    'LETLT_087',
+    'LETLT_090',
+    'LETLT_091',
+    'LETLT_088',
+    'LETL_9',
+    'LETL_024H',
+    'LT21_04H',
+])
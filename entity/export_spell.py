@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
+import argparse
 import json
 import os
 import re
+import sys
 
 from tqdm import tqdm
 
-from mercenaries import MERCENARIES
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from entity.card_registry import registry
+from entity.mercenary_index import get_indexes
 from hearthstone.mercenaryxml import load
 import requests
 
@@ -13,25 +17,27 @@ dbfData = {}
 cardData = {}
 
 
-def write_spell_init(folder_path, ids_list, hname):
-    with open(os.path.join(folder_path, "__init__.py"), 'w+', encoding='utf-8') as f:
-        muban = """# -*- coding: utf-8 -*-
+LAZY_INIT = """# -*- coding: utf-8 -*-
+from entity.card_registry import lazy_package
+
+# 用到时才 import, 见 entity/card_registry.py
+__getattr__, __dir__ = lazy_package(__name__, [
+{names}])
 """
-        f.write(muban)
-        for id in ids_list:
-            f.write("import entity.cards." + hname + '.' + id + '\n')
 
-        pass
-    pass
+
+def write_lazy_init(folder_path, names):
+    names = list(dict.fromkeys(names))
+    with open(os.path.join(folder_path, "__init__.py"), 'w+', encoding='utf-8') as f:
+        f.write(LAZY_INIT.format(names=''.join(f"    '{name}',\n" for name in names)))
+
+
+def write_spell_init(folder_path, ids_list, hname):
+    write_lazy_init(folder_path, ids_list)
 
 
 def write_cards_init(sim_path, cardId_list):
-    with open(os.path.join(sim_path, "__init__.py"), 'w+', encoding='utf-8') as f:
-        muban = """# -*- coding: utf-8 -*-
-"""
-        f.write(muban)
-        for idd in cardId_list:
-            f.write("import entity.cards." + idd + '\n')
+    write_lazy_init(sim_path, cardId_list)
 
 
 def file_replace(file, old_str, new_str):
@@ -146,7 +152,6 @@ def loadjson():
 def run():
     cardData = loadjson()
 
-    m = MERCENARIES
     sim_path = os.path.join(os.getcwd(), "cards")
     print("loading sim_data from", sim_path)
     mer = load(locale='zhCN')
@@ -200,6 +205,18 @@ def run():
     pass
 
 
+def report_missing():
+    """
+    列出 MERCENARIES 里还没有对应卡牌文件的技能和装备
+    """
+    indexes = get_indexes()
+    for mid, skins in indexes['mercenaries'].items():
+        tiers = [x['tiers'] for x in indexes['abilities'][mid] + indexes['equipment'][mid]]
+        missing = [t[-1] for t in tiers if t[-1] and registry.module_path(t[-1]) is None]
+        if missing:
+            print(skins[0][:-3], missing)
+
+
 if __name__ == '__main__':
     # mer = load(locale='zhCN')
     # cardData = loadjson()
@@ -224,4 +241,11 @@ if __name__ == '__main__':
     #     break
     # pass
 
-    run()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--missing', action='store_true',
+                        help='only list abilities and equipment without a card module, do not export')
+    args = parser.parse_args()
+    if args.missing:
+        report_missing()
+    else:
+        run()
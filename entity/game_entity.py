@@ -14,7 +14,7 @@ class GameEntity(BaseEntity):
     def __init__(self, entity: Entity):
         super().__init__(entity)
         # 0 我方场上信息 1敌方场上信息
-        self.players = self.entity.players
+        self.players = self.entity.players if self.entity is not None else []
         # 所有英雄
         self.hero_entities: Dict[int, HeroEntity] = {}
         # 我方场上0, 1, 2号随从(只有战斗阶段才有数据)
@@ -36,6 +36,10 @@ class GameEntity(BaseEntity):
         self.turn = 0  # 回合数
         # 允许移动随从
         self.allow_move_minion = 0
+        # 随机目标技能用的随机数, 见 pick_targets; None 时按确定的假设选目标
+        self.rng = None
+        # get_action_list 被调用的次数: 技能读了整个出手方案时, 打完以后的局面就不只取决于已经打出的动作
+        self.action_list_reads = 0
 
         self.parse_entity()
 
@@ -66,6 +70,54 @@ class GameEntity(BaseEntity):
         self.my_hero.sort(key=lambda x: x.zone_position)
         self.enemy_hero.sort(key=lambda x: x.zone_position)
 
+    def refresh_hero_list(self):
+        """
+        英雄的 zone / 位置变化后, 按原来的加入顺序重新分到各个列表
+        """
+        self.my_hero.clear()
+        self.enemy_hero.clear()
+        self.setaside_hero.clear()
+        self.dead_hero.clear()
+        for hero in list(self.hero_entities.values()):
+            self.add_hero(hero)
+
+    def clone(self):
+        """
+        模拟用的副本: 英雄和技能各自复制一份, 其他数据和原对象共用
+        """
+        game = super(GameEntity, self).clone()
+        heros = {id(h): h.clone() for h in self.hero_entities.values()}
+        game.hero_entities = {k: heros[id(h)] for k, h in self.hero_entities.items()}
+        game.my_hero = [heros[id(h)] for h in self.my_hero]
+        game.enemy_hero = [heros[id(h)] for h in self.enemy_hero]
+        game.setaside_hero = [heros[id(h)] for h in self.setaside_hero]
+        game.dead_hero = [heros[id(h)] for h in self.dead_hero]
+        game.enemy_action_list = list(self.enemy_action_list)
+        game.my_action_list = list(self.my_action_list)
+        game.all_action_list = list(self.all_action_list)
+        return game
+
+    def snapshot(self):
+        return (self.snapshot_heros(),
+                list(self.enemy_action_list), list(self.my_action_list), list(self.all_action_list))
+
+    def restore(self, state):
+        heros, enemy_action_list, my_action_list, all_action_list = state
+        self.restore_heros(heros)
+        self.enemy_action_list = list(enemy_action_list)
+        self.my_action_list = list(my_action_list)
+        self.all_action_list = list(all_action_list)
+
+    def snapshot_heros(self):
+        """
+        只记录英雄(和他们的技能)的状态, 不含出手方案
+        """
+        return tuple(h.snapshot() for h in self.hero_entities.values())
+
+    def restore_heros(self, heros):
+        for h, v in zip(self.hero_entities.values(), heros):
+            h.restore(v)
+
     def get_spell_power(self, spell_school: SpellSchool, own=True):
         player = self.players[0] if own else self.players[1]
         pd = {
@@ -87,6 +139,7 @@ class GameEntity(BaseEntity):
         return player.tags.get(tag_name) or 0
 
     def get_action_list(self, own=True):
+        self.action_list_reads += 1
         return self.my_action_list if own else self.enemy_action_list
 
     def get_hero_list(self, own=True):
@@ -153,6 +206,16 @@ class GameEntity(BaseEntity):
             return None
         return max(hero_list, key=lambda x: x.get_health())
 
+    def pick_targets(self, hero_list, n):
+        """
+        随机目标技能选 n 个目标
+        rng 为 None 时(battle2 等确定性搜索)假设打血量最高的, 同一方案每次模拟结果都一样;
+        RolloutEngine 模拟时换成固定种子的 random.Random, 真正随机选
+        """
+        if self.rng is None:
+            return sorted(hero_list, key=lambda x: -x.get_health())[:n]
+        return self.rng.sample(hero_list, n)
+
     def get_attack_target(self, target):
         # 如果目标已经是嘲讽了，就返回原目标
         if target.taunt:
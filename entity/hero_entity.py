@@ -8,6 +8,13 @@ from .spell_entity import SpellEntity
 
 
 class HeroEntity(BaseEntity):
+    __slots__ = ('card_id', 'atk', 'max_health', 'damage', 'lettuce_role', 'cardrace', 'pos', 'zone_position', 'cost',
+                 'divine_shield', 'faction', 'windfury', 'taunt', 'frozen', 'immune', 'spell', 'spellpower',
+                 'damage_trigger', 'deathrattle', 'lettuce_has_manually_selected_ability',
+                 'lettuce_ability_tile_visual_self_only', 'lettuce_ability_tile_visual_all_visible',
+                 'lettuce_selected_target', 'lettuce_mercenary_experience', 'skill_seq', 'stealth')
+    # spellpower、spell、damage_trigger 在 snapshot 里单独保存
+    static_fields = ('entity', 'pos', 'skill_seq', 'spellpower', 'spell', 'damage_trigger')
 
     def __init__(self, entity: Entity):
         super().__init__(entity)
@@ -19,7 +26,7 @@ class HeroEntity(BaseEntity):
         # INVALID = 0 施法者CASTER = 1 斗士FIGHTER = 2 TANK = 3 NEUTRAL = 4
         self.lettuce_role = 2  # 斗士
         self.cardrace = None
-        self.pos = [0, 0]  # 坐标[x, y]
+        self.pos = (0, 0)  # 坐标(x, y)
         # 场上位置 从左往右1开始
 
         self.zone_position = 0
@@ -36,18 +43,8 @@ class HeroEntity(BaseEntity):
         self.immune = 0
         # 被动 一技能 二技能 三技能 ...
         self.spell: List[SpellEntity] = []
-        # 法术伤害
-        self.spellpower = {
-            SpellSchool.NONE: 0,  # 无
-            SpellSchool.ARCANE: 0,  # 奥术
-            SpellSchool.FIRE: 0,  # 火焰
-            SpellSchool.FROST: 0,  # 冰霜
-            SpellSchool.NATURE: 0,  # 自然
-            SpellSchool.HOLY: 0,  # 神圣
-            SpellSchool.SHADOW: 0,  # 暗影
-            SpellSchool.FEL: 0,  # 邪能
-            SpellSchool.PHYSICAL_COMBAT: 0
-        }
+        # 法术伤害, 下标是 SpellSchool: 无 奥术 火焰 冰霜 自然 神圣 暗影 邪能 物理
+        self.spellpower = [0] * len(SpellSchool)
 
         # 受伤触发器
         self.damage_trigger: List[SpellEntity] = []
@@ -103,8 +100,29 @@ class HeroEntity(BaseEntity):
         self.lettuce_mercenary_experience = self.get_tag(GameTag.LETTUCE_MERCENARY_EXPERIENCE)
         self.lettuce_ability_tile_visual_all_visible = self.get_tag(GameTag.LETTUCE_ABILITY_TILE_VISUAL_ALL_VISIBLE)
 
+    def clone(self):
+        hero = super(HeroEntity, self).clone()
+        hero.spellpower = list(self.spellpower)
+        spells = {id(s): s.clone() for s in self.spell}
+        hero.spell = [spells[id(s)] for s in self.spell]
+        hero.damage_trigger = [spells.get(id(s)) or s.clone() for s in self.damage_trigger]
+        return hero
+
+    def snapshot(self):
+        return (super(HeroEntity, self).snapshot(), tuple(self.spellpower),
+                tuple(s.snapshot() for s in self.spell), tuple(self.damage_trigger))
+
+    def restore(self, state):
+        fields, spellpower, spells, damage_trigger = state
+        super(HeroEntity, self).restore(fields)
+        self.spellpower[:] = spellpower
+        for s, v in zip(self.spell, spells):
+            s.restore(v)
+        # 比如 LETL_030P6 给目标加的受伤触发
+        self.damage_trigger[:] = damage_trigger
+
     def set_pos(self, x, y):
-        self.pos = [x, y]
+        self.pos = (x, y)
 
     def set_skill_seq(self, skills):
         self.skill_seq = skills
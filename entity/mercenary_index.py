@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import pickle
+from collections import namedtuple
+
+logger = logging.getLogger()
+
+MERCENARIES_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'mercenaries.py')
+# 生成好的索引, mercenaries.py 改了就重建; 不提交到仓库
+SIDECAR_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'mercenaries_index.pickle')
+# 升级用的 card_id 属于哪个佣兵的哪个技能(或装备), 第几级(从 1 开始)
+TierInfo = namedtuple('TierInfo', ['mercenary_id', 'ability_id', 'tier', 'is_equipment'])
+
+
+def build_indexes(mercenaries):
+    """
+    Returns:
+        {
+            'tiers': {技能/装备每一级的 card_id: TierInfo},
+            'skins': {皮肤 card_id 和去掉 _01 后缀的前缀: mercenary_id},
+            'mercenaries': {mercenary_id: [皮肤 card_id, ...]},
+            'abilities': {mercenary_id: [{'ability_id': ..., 'tiers': [...]}, ...]},
+            'equipment': {mercenary_id: [{'equipment_id': ..., 'tiers': [...]}, ...]},
+        }
+    """
+    tiers, skins, merc_skins, abilities, equipment = {}, {}, {}, {}, {}
+    for m in mercenaries:
+        mid = m['mercenary_id']
+        merc_skins[mid] = m['skins']
+        for skin in m['skins']:
+            skins[skin] = mid
+            skins.setdefault(skin[:-3], mid)
+        abilities[mid] = m['abilities']
+        equipment[mid] = m['equipment']
+        for a in m['abilities']:
+            for i, card_id in enumerate(a['tiers']):
+                if card_id:
+                    tiers[card_id] = TierInfo(mid, a['ability_id'], i + 1, False)
+        for e in m['equipment']:
+            for i, card_id in enumerate(e['tiers']):
+                if card_id:
+                    tiers[card_id] = TierInfo(mid, e['equipment_id'], i + 1, True)
+    return {'tiers': tiers, 'skins': skins, 'mercenaries': merc_skins, 'abilities': abilities, 'equipment': equipment}
+
+
+def load_indexes(sidecar=SIDECAR_PATH, source=MERCENARIES_PATH):
+    """
+    优先读 sidecar, 不用 import 两千多行的 mercenaries.py; sidecar 过期或者读不了时重新生成
+    """
+    mtime = os.stat(source).st_mtime
+    try:
+        with open(sidecar, 'rb') as f:
+            cached_mtime, indexes = pickle.load(f)
+        if cached_mtime == mtime:
+            return indexes
+    except Exception:
+        pass
+    from entity.mercenaries import MERCENARIES
+    indexes = build_indexes(MERCENARIES)
+    try:
+        tmp = sidecar + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump((mtime, indexes), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        logger.warning(f'save {sidecar} failed: {e}')
+    return indexes
+
+
+_indexes = None
+
+
+def get_indexes():
+    global _indexes
+    if _indexes is None:
+        _indexes = load_indexes()
+    return _indexes
+
+
+def find_tier(card_id):
+    """
+    Returns:
+        TierInfo, 不是佣兵技能或装备时返回 None
+    """
+    return get_indexes()['tiers'].get(card_id)
+
+
+def find_mercenary(skin):
+    """
+    Args:
+        skin: 皮肤的 card_id, 比如 LETL_015H_02, 或者去掉后缀的 LETL_015H
+    Returns:
+        mercenary_id, 找不到时返回 None
+    """
+    return get_indexes()['skins'].get(skin)
+
+
+def get_abilities(mercenary_id):
+    return get_indexes()['abilities'].get(mercenary_id, [])
+
+
+def get_equipment(mercenary_id):
+    return get_indexes()['equipment'].get(mercenary_id, [])
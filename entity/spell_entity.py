@@ -1,5 +1,3 @@
-import random
-
 from hearthstone.entities import Entity
 from hearthstone.enums import GameTag
 
@@ -7,6 +5,10 @@ from .base_entity import BaseEntity
 
 
 class SpellEntity(BaseEntity):
+    # 具体卡牌的子类没有 __slots__, 自己加的字段(比如 trigger_twice)放在 __dict__ 里
+    __slots__ = ('card_id', 'cost', 'lettuce_role', 'spell_school', 'combo', 'lettuce_cooldown_config',
+                 'lettuce_current_cooldown', 'lettuce_ability_owner', 'powered_up', 'lettuce_is_equpiment',
+                 'lettuce_is_treasure_card', 'damage', 'range', 'is_attack')
 
     def __init__(self, entity: Entity):
         super().__init__(entity)
@@ -74,7 +76,7 @@ class SpellEntity(BaseEntity):
                 range = int(range)
                 hero_list = game.get_hero_list(not hero.own())
                 range = -range
-                hero_list = random.sample(hero_list, range)
+                hero_list = game.pick_targets(hero_list, range)
                 for h in hero_list:
                     h.damage += (self.damage + power) * self.damage_advantage[hero.lettuce_role][h.lettuce_role]
                 pass
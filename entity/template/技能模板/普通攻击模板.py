@@ -19,9 +19,9 @@ class LETL_235_M(SpellEntity):
 
     def play(self, game, hero, target):
         # 伤害为攻击伤害
-        damage = hero.dmg
+        damage = hero.atk
         # 重新选择攻击目标，因为可能有嘲讽
         target = game.get_attack_target(target)
         target.got_damage(game, damage * self.damage_advantage[self.lettuce_role][target.lettuce_role])
         # 自己受到伤害
-        hero.got_damage(game, target.dmg)
+        hero.got_damage(game, target.atk)
@@ -15,11 +15,20 @@ from PIL import Image
 from types import SimpleNamespace
 
 from utils.log_util import LogUtil
-from utils.util import BOSS_ID_MAP, find_lushi_window, find_icon_location, restart_game, tuple_add, find_relative_loc, \
-    screenshot, find_lushi_raw_window, get_hero_color_by_id
+from utils.util import BOSS_ID_MAP, find_icon_location, restart_game, tuple_add, find_relative_loc, screenshot, \
+    get_hero_color_by_id
 from utils.images import get_sub_np_array, get_burning_green_circles, get_burning_blue_lines, get_burning_blue_lines, \
     get_dark_brown_lines
 from utils.battle_ai import BattleAi
+from utils.battle_pool import ParallelSearch
+from utils.frame_provider import FrameProvider
+from utils.frame_recorder import FrameRecorder
+from utils.frame_source import make_frame_source
+from utils.plan_cache import PlanCache, board_signature, plan_targets_valid
+from utils.state_classifier import StateClassifier
+from utils.state_scheduler import StateScheduler
+from utils.capture_governor import CaptureGovernor
+from utils.capture_worker import CaptureWorker
 import utils.logging_util
 
 logger = logging.getLogger()
@@ -65,7 +74,60 @@ class Agent:
                        'final_reward', 'final_reward2', 'final_confirm', 'close', 'ok', 'done', 'member_not_ready2','boss_empty_icon', 'campfire']
 
         self.load_config(cfg)
-        self.log_util = LogUtil(self.basic.hs_log)
+        self.log_util = LogUtil(self.basic.hs_log, tail=True)
+        source = make_frame_source(self.title, self.frame_replay, self.frame_replay_speed)
+        if self.capture_thread:
+            # 后台线程一直在截图; pyautogui 每次操作后停 delay 秒, 比 delay 一半还早截的帧不算新的
+            source = CaptureWorker(source, self.capture_thread_interval, max_age=min(0.1, self.basic.delay / 2))
+        # 每个 tick 共用一帧截图
+        self.frames = FrameProvider(source)
+        # 所有状态图标一次性在同一帧上打分
+        self.classifier = StateClassifier(self.icons, self.states, self.basic.confidence, self.icon_regions,
+                                          pyramid=self.pyramid_match)
+        # 按状态转移统计决定检查顺序
+        self.scheduler = StateScheduler(self.states)
+        # 画面没变时跳过状态识别, 并放慢截图
+        self.governor = CaptureGovernor(self.capture_min_interval, self.capture_max_interval) \
+            if self.capture_governor else None
+        # 录下每个 tick 的画面、识别结果和点击, 用来复现现场的问题
+        self.recorder = FrameRecorder(max_bytes=int(self.frame_record_mb * 2 ** 20)) if self.frame_record else None
+        # 相同局面直接用之前算过的战斗方案
+        self.plan_cache = PlanCache() if self.use_plan_cache else None
+        # 上一回合用的方案 (签名, 回合数, 我方存活数, 敌方总血量), 下一回合用来判断效果
+        self.last_plan = None
+        # normal 策略的多进程穷举, 进程池整个会话共用, run 结束时关掉
+        self.parallel_search = ParallelSearch(self.parallel_search_workers) if self.use_parallel_search else None
+
+    def capture_gray(self):
+        """
+        重新截一帧, 返回灰度图; 和状态识别用的是同一个转换, 下一次截图后会被覆盖
+        """
+        self.frames.invalidate()
+        return self.frames.gray()
+
+    def detect_state(self, screen, state):
+        """
+        一个 tick 的状态识别, tools/profile_replay 也用它: 先按转移统计检查最可能的几个状态,
+        都没命中时定期全量打分; 定期的全量检查里, 区域内没找到的图标再全图找一次
+        Args:
+            screen: 这个 tick 的灰度图
+            state: 上一个状态
+        Returns:
+            (match, count): match 为 (状态, 分数, 位置), 没识别出来时为 None; count 为这个 tick 匹配的图标数
+        """
+        likely = self.scheduler.likely(state)
+        match, count, full_scan = None, 0, False
+        if likely is not None:
+            match, count = self.classifier.first_match(screen, likely)
+        if match is None and (likely is None or self.scheduler.need_full_scan()):
+            matches = self.classifier.classify(screen, full_frame=self.scheduler.need_full_scan())
+            count += len(self.classifier.templates)
+            full_scan = True
+            match = matches[0] if matches else None
+        self.scheduler.tick(count, full_scan)
+        if match is not None:
+            self.scheduler.record(state, match[0])
+        return match, count
 
     def new_click(self, arg0=None, arg1=None):
         if arg0 == None:
@@ -74,6 +136,10 @@ class Agent:
             pyautogui.click(arg0[0] + self.fix_x, arg0[1] + self.fix_y)
         else:
             pyautogui.click(arg0 + self.fix_x, arg1 + self.fix_y)
+        if self.recorder is not None:
+            self.recorder.click(*pyautogui.position())
+        # 点击后画面会变, 之前的截图作废
+        self.frames.invalidate()
 
     def read_sub_imgs(self, sub):
         imgs = [img for img in os.listdir(os.path.join(self.img_folder, sub)) if img.endswith('.png')]
@@ -88,6 +154,8 @@ class Agent:
             loc_cfg = yaml.safe_load(f)
 
         self.locs = SimpleNamespace(**loc_cfg['location'])
+        # 图标的搜索区域, 没配置的图标全图搜索
+        self.icon_regions = getattr(self.locs, 'icon_regions', None) or {}
         for sub in ['icons', 'treasure_blacklist', 'treasure_whitelist', 'heros_whitelist', 'heros_blacklist']:
             self.read_sub_imgs(sub)
 
@@ -121,31 +189,56 @@ class Agent:
         self.battle_time_wait = self.basic.battle_time_wait  # 战斗休眠时间
         if self.battle_time_wait is None or self.battle_time_wait == '':
             self.battle_time_wait = 1
+        # 粗到细的金字塔匹配, 旧配置里没有这一项
+        self.pyramid_match = getattr(self.basic, 'pyramid_match', False)
+        self.use_plan_cache = getattr(self.basic, 'plan_cache', False)
+        # 回放录下来的画面(png 文件夹或视频), 不截游戏窗口; speed 为空时全速
+        self.frame_replay = getattr(self.basic, 'frame_replay', None)
+        self.frame_replay_speed = getattr(self.basic, 'frame_replay_speed', None)
+        self.capture_governor = getattr(self.basic, 'capture_governor', False)
+        self.frame_record = getattr(self.basic, 'frame_record', False)
+        self.capture_thread = getattr(self.basic, 'capture_thread', False)
+        self.capture_thread_interval = getattr(self.basic, 'capture_thread_interval', 0.05)
+        self.frame_record_mb = getattr(self.basic, 'frame_record_mb', 200)
+        self.capture_min_interval = getattr(self.basic, 'capture_min_interval', 0.5)
+        self.capture_max_interval = getattr(self.basic, 'capture_max_interval', 3.0)
+        self.use_parallel_search = getattr(self.basic, 'parallel_search', False)
+        self.parallel_search_workers = getattr(self.basic, 'parallel_search_workers', None)
         self.choice_skill_index = self.basic.choice_skill_index  # 技能抉择
         if self.choice_skill_index is None or self.choice_skill_index == '':
             self.choice_skill_index = 0
         pyautogui.PAUSE = self.basic.delay
 
-    def check_in_screen(self, name, prefix='icons'):
+    def get_icon_region(self, name, prefix='icons'):
+        if prefix != 'icons':
+            return None
+        return self.icon_regions.get(name)
 
-        rect, screen = find_lushi_window(self.title)
+    # cached: 使用本 tick 已经截好的图, 否则重新截图
+    def check_in_screen(self, name, prefix='icons', cached=False):
+        if not cached:
+            self.frames.invalidate()
+        rect, screen = self.frames.gray()
         try:
             icon = getattr(self, prefix)[name]
         except:
             return False, None, None
-        success, X, Y, conf = find_icon_location(screen, icon, self.basic.confidence)
+        success, X, Y, conf = find_icon_location(screen, icon, self.basic.confidence, self.get_icon_region(name, prefix),
+                                                 self.pyramid_match)
         del screen
         loc = X, Y
         return success, loc, rect
 
     # 检查并获取图片
     def check_and_screen(self, name, prefix='icons'):
-        rect, screen = find_lushi_window(self.title)
+        self.frames.invalidate()
+        rect, screen = self.frames.gray()
         try:
             icon = getattr(self, prefix)[name]
         except:
             return False, None, None, None
-        success, X, Y, conf = find_icon_location(screen, icon, self.basic.confidence)
+        success, X, Y, conf = find_icon_location(screen, icon, self.basic.confidence, self.get_icon_region(name, prefix),
+                                                 self.pyramid_match)
         loc = X, Y
         return success, loc, rect, screen
 
@@ -155,7 +248,8 @@ class Agent:
             icon = getattr(self, prefix)[name]
         except:
             return False, None, None
-        success, X, Y, conf = find_icon_location(screen, icon, self.basic.confidence)
+        success, X, Y, conf = find_icon_location(screen, icon, self.basic.confidence, self.get_icon_region(name, prefix),
+                                                 self.pyramid_match)
         del screen
         loc = X, Y
         return success, loc, conf
@@ -179,12 +273,13 @@ class Agent:
         for i in range(10):
             success, loc, rect, the_img = self.check_and_screen(img_name)
             if 0 == i % 2 or success:
-                _, the_img = find_lushi_window(self.title, to_gray=False, raw=True)
+                _, the_img = self.frames.capture()
                 # the_img.save("first_img.png")
                 the_map_loc = self.locs.map_location
                 sub_img = get_sub_np_array(the_img, the_map_loc[0], the_map_loc[1], the_map_loc[2],
                                            the_map_loc[3])  # [230, 80, 810, 620]
-                screen_images.append(sub_img)
+                # 截图的内存下一帧会复用, 要留下来拼地图的部分复制一份
+                screen_images.append(sub_img.copy())
             if success:
                 for _ in range(10):
                     pyautogui.scroll(-60)
@@ -228,12 +323,13 @@ class Agent:
                 logger.info(f"Found off/on surprise at  {loc}")
                 return loc
             if 0 == i % 2:
-                _, the_img = find_lushi_window(self.title, to_gray=False, raw=True)
+                _, the_img = self.frames.capture()
                 # the_img.save("first_img.png")
                 the_map_loc = self.locs.map_location
                 sub_img = get_sub_np_array(the_img, the_map_loc[0], the_map_loc[1], the_map_loc[2],
                                            the_map_loc[3])  # [230, 80, 810, 620]
-                screen_images.append(sub_img)
+                # 截图的内存下一帧会复用, 要留下来拼地图的部分复制一份
+                screen_images.append(sub_img.copy())
             if success:
                 for _ in range(10):
                     pyautogui.scroll(-60)
@@ -255,7 +351,7 @@ class Agent:
             # pyautogui.click(tuple_add(rect, self.locs.start_game)) # 新版本不需要点这一下了
             # check if a task finish
             time.sleep(1)
-            _, img = find_lushi_window(self.title, to_gray=False, raw=True)
+            _, img = self.frames.capture()
             lines = get_burning_blue_lines(img)
             if None is not lines and 0 < len(lines):
                 logger.info("some task finished ... ")
@@ -273,6 +369,53 @@ class Agent:
             # select first first boss of map
             self.new_click(tuple_add(rect, self.locs.first_boss))
 
+    def search_plan(self, game, battle_stratege):
+        """
+        算出这一回合的方案, 每个我方英雄打的敌人下标;
+        开了 parallel_search 时 normal 策略的目标改用多进程穷举技能和目标选, 见 BattleAi.battle_parallel_targets
+        """
+        strategy = BattleAi.battle(game.my_hero, game.enemy_hero, battle_stratege)
+        if self.parallel_search is None or battle_stratege != 'normal' or 1 > len(strategy):
+            return strategy
+        # normal 策略返回的是 {英雄下标: 敌人下标}
+        strategy = [strategy[i] for i in range(len(strategy))]
+        strategy = BattleAi.from_game(game).battle_parallel_targets(self.parallel_search, strategy)
+        logger.info(f'parallel search targets {strategy}')
+        return strategy
+
+    def battle_plan(self, game, battle_stratege):
+        if self.plan_cache is None:
+            return self.search_plan(game, battle_stratege)
+
+        my_alive = len([h for h in game.my_hero if h.is_alive()])
+        enemy_health = sum(max(0, h.get_health()) for h in game.enemy_hero)
+        if self.last_plan is not None:
+            signature, turn, last_alive, last_enemy_health = self.last_plan
+            # 只有紧接着的下一回合才能看出上一回合方案的效果: 我方没死人并且敌方掉了血
+            if game.turn == turn + 1:
+                self.plan_cache.record(signature, my_alive >= last_alive and enemy_health < last_enemy_health)
+            self.last_plan = None
+
+        signature = board_signature(game.my_hero, game.enemy_hero, battle_stratege)
+        strategy = self.plan_cache.get(signature)
+        if strategy is not None and not plan_targets_valid(strategy, game.enemy_hero):
+            logger.info(f'cached plan {strategy} targets an enemy that can not be attacked, recompute')
+            strategy = None
+        if strategy is None or len(strategy) < len(game.my_hero):
+            strategy = self.search_plan(game, battle_stratege)
+            if 1 > len(strategy):
+                return strategy
+            # normal 策略返回的是 {英雄下标: 敌人下标}
+            strategy = [strategy[i] for i in range(len(strategy))]
+            # normal 策略不看免疫、隐身, 打了这种目标的方案不缓存
+            if plan_targets_valid(strategy, game.enemy_hero):
+                self.plan_cache.put(signature, strategy)
+        self.last_plan = (signature, game.turn, my_alive, enemy_health)
+        stats = self.plan_cache.stats()
+        logger.info(f"plan cache hit rate {stats['hit_rate']:.2%} ({stats['hits']}/{stats['hits'] + stats['misses']}), "
+                    f"size {stats['size']}, evictions {stats['evictions']}")
+        return strategy
+
     def start_battle(self, rect, battle_boss=False):
         logger.info(f"Start battle, boss ? {battle_boss}, scanning battlefield")
         # rect, screen = find_lushi_window(self.title)
@@ -281,8 +424,6 @@ class Agent:
         if battle_boss:
             battle_stratege = self.basic.boss_battle_stratege  # normal, max_dmg, kill_big, kill_min
 
-        del self.log_util
-        self.log_util = LogUtil(self.basic.hs_log)
         game = self.log_util.parse_game()
 
         first_x, mid_x, last_x, y = self.locs.heros
@@ -303,7 +444,7 @@ class Agent:
                 x_offset -= (mid_x - first_x) // 2
             game.enemy_hero[i].set_pos(mid_x + x_offset + rect[0], y + rect[1])
 
-        strategy = BattleAi.battle(game.my_hero, game.enemy_hero, battle_stratege) # [0,1,1]
+        strategy = self.battle_plan(game, battle_stratege) # [0,1,1]
         if 1 > len(strategy):
             # 检查策略是否为空，为空说明不可选择，直接跳过
             self.new_click(tuple_add(rect, self.locs.start_battle))
@@ -369,8 +510,7 @@ class Agent:
     def select_members(self, risk_num=2, battle_boss=False):
         logger.info(f"Start select members, battle_boss ? {battle_boss} start battle enemy")
         game = self.log_util.parse_game()
-        rect, screen = find_lushi_window(self.title, to_gray=False)
-        del screen
+        rect, _ = self.frames.capture()
         enemy_blue_count = 0
         enemy_green_count = 0
         enemy_red_count = 0
@@ -625,7 +765,7 @@ class Agent:
     def submit_campfire_mission(self, rect):
         logger.info("campfire dialog")
         time.sleep(1)
-        _, img = find_lushi_window(self.title, to_gray=False, raw=True)
+        _, img = self.frames.capture()
         lines = get_burning_blue_lines(img)
         if None is not lines and 0 < len(lines):
             logger.info("some task finished ... ")
@@ -641,8 +781,13 @@ class Agent:
         # exit the campfire
         self.new_click(tuple_add(rect, self.locs.empty))
 
-    def state_handler(self, state, tic, text):
-        success, loc, rect = self.check_in_screen(text)
+    # match: StateClassifier 已经识别出的 (loc, rect), 传入时不再重新匹配
+    def state_handler(self, state, tic, text, match=None):
+        if match is None:
+            success, loc, rect = self.check_in_screen(text, cached=True)
+        else:
+            success = True
+            loc, rect = match
         '''
         self.states = ['box', 'mercenaries', 'team_lock', 'travel', 'boss_list','team_list', 'collect', 'map_not_ready',
                   'goto', 'show', 'teleport', 'start_game', 'member_not_ready', 'not_ready_dots', 'battle_ready',
@@ -750,7 +895,7 @@ class Agent:
             
             if state == 'map_not_ready':
                 logger.info(f'find {state}, try to click next map')
-                _, screen = find_lushi_raw_window(self.title)
+                _, screen = self.frames.capture()
                 the_map_loc = self.locs.map_location  # 只选取部分
                 screen = get_sub_np_array(screen, the_map_loc[0], the_map_loc[1], the_map_loc[2],
                                           the_map_loc[3])  # [230, 80, 810, 620]
@@ -761,7 +906,7 @@ class Agent:
                     self.surprise_relative_loc = surprise_loc
                     # 翻了地图要回来
                     for i in range(-10, 10):
-                        _, screen = find_lushi_raw_window(self.title)
+                        _, screen = self.frames.capture()
                         screen = get_sub_np_array(screen, the_map_loc[0], the_map_loc[1], the_map_loc[2],
                                                   the_map_loc[3])  # [230, 80, 810, 620]
                         circles = get_burning_green_circles(screen, 55, 110)
@@ -843,7 +988,7 @@ class Agent:
                     # 检查是否进入boss关卡
                     success, loc, rect = self.check_in_screen("final_boss")
                     if success:
-                        _, screen = find_lushi_raw_window(self.title)
+                        _, screen = self.frames.capture()
                         the_map_loc = self.locs.no_boss_map_location  # 只选取部分
                         screen = get_sub_np_array(screen, the_map_loc[0], the_map_loc[1], the_map_loc[2],
                                                   the_map_loc[3])
@@ -856,7 +1001,7 @@ class Agent:
 
             if state in ['member_not_ready', 'member_not_ready2']:
                 logger.info(f'find {state}, try to click')
-                _, screen = find_lushi_window(self.title, to_gray=False, raw=True)
+                _, screen = self.frames.capture()
                 loc = self.locs.boss_battlefield
                 subImage = get_sub_np_array(screen, loc[0], loc[1], loc[2], loc[3])
                 lines = get_dark_brown_lines(subImage)
@@ -870,7 +1015,7 @@ class Agent:
             if state == 'not_ready_dots':
                 logger.info(f'find {state}, try to click')
                 # check if battle boss
-                _, screen = find_lushi_window(self.title, to_gray=False, raw=True)
+                _, screen = self.frames.capture()
                 loc = self.locs.boss_battlefield
                 subImage = get_sub_np_array(screen, loc[0], loc[1], loc[2], loc[3])
                 lines = get_dark_brown_lines(subImage)
@@ -893,7 +1038,7 @@ class Agent:
                 logger.info(f'find {state}, try to click')
                 if self.debug or self.basic.screenshot_treasure:
                     screenshot(self.title, 'treasure[xx]')
-                _, screen = find_lushi_window(self.title)
+                _, screen = self.capture_gray()
                 # advice = self.pick_treasure(screen)
                 advice = self.choose_one_from_three(screen, "treasure")
 
@@ -922,7 +1067,7 @@ class Agent:
 
             if state == 'visitor_list':
                 logger.info(f'find {state}, try to click')
-                _, screen = find_lushi_window(self.title)
+                _, screen = self.capture_gray()
                 # advice = self.pick_visitor(screen)
                 advice = self.choose_one_from_three(screen, "heros")
                 t_id = random.choice(advice)
@@ -976,24 +1121,39 @@ class Agent:
 
         return success, tic, state, rect
 
+    def close(self):
+        """
+        会话结束: 关掉常驻的进程池和截图线程
+        """
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+            self.parallel_search = None
+        self.frames.source.close()
+
     def run(self):
-        if self.basic.auto_restart:
-            while True:
-                try:
-                    self.run_pve()
-                except AssertionError as e:
-                    logger.error(f'错误：请删除炉石路径下的Logs/Power.log再重新打开!!!!')
-                    break
-                except Exception as e:
-                    logger.error(f'错误：{e}', exc_info=True)
+        try:
+            if self.basic.auto_restart:
+                while True:
                     try:
-                        if self.basic.screenshot_error:
-                            screenshot(self.title, 'error')
-                    except:
-                        pass
-                    restart_game(self.lang, self.basic.bn_path, False)
-        else:
-            self.run_pve()
+                        self.run_pve()
+                    except AssertionError as e:
+                        logger.error(f'错误：请删除炉石路径下的Logs/Power.log再重新打开!!!!')
+                        break
+                    except Exception as e:
+                        logger.error(f'错误：{e}', exc_info=True)
+                        if self.recorder is not None:
+                            # 出错前录的画面先落盘
+                            self.recorder.flush()
+                        try:
+                            if self.basic.screenshot_error:
+                                screenshot(self.title, 'error')
+                        except:
+                            pass
+                        restart_game(self.lang, self.basic.bn_path, False)
+            else:
+                self.run_pve()
+        finally:
+            self.close()
 
     def run_pve(self):
         time.sleep(2)
@@ -1030,8 +1190,24 @@ class Agent:
             else:
                 logger.info("Last state %s, time taken: %.2f", state, time.time() - tic)
 
-            for state_text in self.states:
-                success, tic, state, rect = self.state_handler(state, tic, state_text)
+            # 新的 tick 重新截图, 先按转移统计检查最可能的几个状态, 都没命中时定期全量打分
+            if self.governor is not None:
+                self.governor.wait()
+            self.frames.invalidate()
+            rect, screen = self.frames.gray()
+            if self.governor is not None and not self.governor.check(screen):
+                continue
+            match, count = self.detect_state(screen, state)
+            if self.recorder is not None:
+                self.recorder.record(self.frames.bgr()[1], match[0] if match is not None else None)
+            if self.scheduler.ticks % 100 == 0:
+                logger.info(f'avg templates per tick: {self.scheduler.avg_templates():.2f}')
+                if self.governor is not None:
+                    logger.info(f'capture governor: {self.governor.stats()}')
+            if match is not None:
+                state_text, conf, loc = match
+                logger.debug(f'classify {state_text} {conf:.3f}, templates {count}')
+                success, tic, state, rect = self.state_handler(state, tic, state_text, match=(loc, rect))
                 if success:
                     self.new_click(tuple_add(rect, self.locs.empty))
 
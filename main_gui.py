@@ -454,11 +454,8 @@ class Ui(QMainWindow):
         hero_order_list = self.slm.stringList()
         for k, v in self.hero_info.items():
             hero_index = hero_order_list.index(v[0])
-            color = 0
-            for hk, hv in HEROS.items():
-                if k == hk:
-                    color = hv[4]
-                    break
+            hero = HEROS.get(k)
+            color = hero[4] if hero is not None else 0
             new_hero_info[k] = [v[0], v[1], v[2], hero_index, color]
         self.config['hero'] = new_hero_info
 
@@ -466,11 +463,8 @@ class Ui(QMainWindow):
         boss_hero_order_list = self.boss_slm.stringList()
         for k, v in self.boss_hero_info.items():
             hero_index = boss_hero_order_list.index(v[0])
-            color = 0
-            for hk, hv in HEROS.items():
-                if k == hk:
-                    color = hv[4]
-                    break
+            hero = HEROS.get(k)
+            color = hero[4] if hero is not None else 0
             new_boss_hero_info[k] = [v[0], v[1], v[2], hero_index, color]
         self.config['boss_hero'] = new_boss_hero_info
 
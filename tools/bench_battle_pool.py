@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+battle2 穷举的多进程版本: 1 到 N 个进程的耗时和加速比
+
+python -m tools.bench_battle_pool --heros 4 --spells 3 --max-workers 8
+"""
+import argparse
+import io
+import os
+import pickle
+import time
+from contextlib import redirect_stdout
+
+from tools.bench_entity_clone import build_game, count_leaves
+from utils.battle_ai import BattleAi
+from utils.battle_pool import ParallelSearch, compact_game
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--heros', type=int, default=4)
+    parser.add_argument('--spells', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    game = build_game(args.heros, args.spells)
+    print(f'{args.heros}v{args.heros}, {args.spells} spells each, {count_leaves(game)} leaves')
+    print(f'snapshot {len(pickle.dumps(compact_game(game))) / 1024:.1f} KiB')
+
+    ai = BattleAi.from_game(game)
+    tic = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        ai.battle2()
+    serial = time.perf_counter() - tic
+    print(f'battle2: {serial * 1000:.0f} ms, best score {ai.score}')
+
+    for workers in range(1, args.max_workers + 1):
+        search = ParallelSearch(workers)
+        parallel = BattleAi.from_game(game)
+        costs = []
+        for _ in range(args.repeat):
+            tic = time.perf_counter()
+            parallel.battle_parallel(search)
+            costs.append(time.perf_counter() - tic)
+        search.close()
+        cost = min(costs)
+        print(f'{workers} workers: {cost * 1000:.0f} ms, speedup {serial / cost:.2f}x, '
+              f'same score {parallel.score == ai.score}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+BattleAi.battle2 anytime 搜索: 不同时间预算下找到的方案分数, 和穷举结果对比
+
+python -m tools.bench_battle_search --heros 4 --spells 3
+"""
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+from tools.bench_entity_clone import build_game
+from utils.battle_ai import BattleAi
+from utils.transposition import TranspositionTable
+
+
+def run(game, budget_ms, transposition=None):
+    ai = BattleAi.from_game(game)
+    with redirect_stdout(io.StringIO()):
+        tic = time.perf_counter()
+        ai.battle2(budget_ms, transposition)
+        cost = time.perf_counter() - tic
+    return cost, ai.score, ai.leaves
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--heros', type=int, default=4)
+    parser.add_argument('--spells', type=int, default=3)
+    parser.add_argument('--budgets', type=int, nargs='*', default=[5, 10, 20, 50, 100, 200, 500, 1000, 2000])
+    parser.add_argument('--transposition', action='store_true', help='transposition table: plan scores and the board after each step')
+    args = parser.parse_args()
+
+    game = build_game(args.heros, args.spells)
+    cost, best, leaves = run(game, None)
+    print(f'exhaustive: score {best}, {leaves} leaves, {cost * 1000:.0f} ms')
+    for budget in args.budgets:
+        table = TranspositionTable() if args.transposition else None
+        cost, score, leaves = run(game, budget, table)
+        line = f'budget {budget:5d} ms: score {score}{" (best)" if score == best else ""}, ' \
+               f'{leaves} leaves, {cost * 1000:.0f} ms'
+        if table is not None:
+            stats = table.stats()
+            line += f', hit rate {stats["hit_rate"]:.1%}, {stats["size"]} entries, {stats["memory"] / 1024:.0f} KiB'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
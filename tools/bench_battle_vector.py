@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+BattleAi.battle normal 策略: 逐个枚举 + deepcopy vs NumPy 批量计算
+
+python -m tools.bench_battle_vector --max-loop 5
+"""
+import argparse
+import random
+import time
+
+from entity.hero_entity import HeroEntity
+from utils.battle_ai import BattleAi
+from utils.battle_vector import best_assignment
+
+
+def make_board(rng, my_cnt, enemy_cnt):
+    heros = []
+    for controller, cnt in ((3, my_cnt), (2, enemy_cnt)):
+        side = []
+        for _ in range(cnt):
+            hero = HeroEntity(None)
+            hero.controller = controller
+            hero.atk = rng.randint(1, 12)
+            hero.max_health = rng.randint(10, 40)
+            hero.damage = rng.randint(0, 9)
+            hero.lettuce_role = rng.randint(1, 3)
+            side.append(hero)
+        heros.append(side)
+    return heros
+
+
+def timeit(func, *args):
+    tic = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - tic, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-loop', type=int, default=5, help='skip the loop version above NvN, 6v6 takes minutes')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for n in range(3, 7):
+        my_hero, enemy_hero = make_board(rng, n, n)
+        vector_cost, vector = timeit(best_assignment, my_hero, enemy_hero)
+        line = f'{n}v{n} ({n ** n} candidates): vector {vector_cost * 1000:.1f} ms'
+        if n <= args.max_loop:
+            loop_cost, loop = timeit(BattleAi.battle_normal_loop, my_hero, enemy_hero)
+            line += f', loop {loop_cost * 1000:.1f} ms, speedup {loop_cost / vector_cost:.0f}x, same {loop == vector}'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
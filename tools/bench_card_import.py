@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+卡牌模块的启动开销: 一次性 import 所有卡牌 vs 按需 import, 各自在新的进程里跑
+
+python -m tools.bench_card_import --repeat 5
+"""
+import argparse
+import subprocess
+import sys
+
+EAGER = '''
+import importlib, sys, time
+# hearthstone 等公共依赖两边都要, 不算在内
+import entity.spell_entity
+tic = time.perf_counter()
+from entity.card_registry import registry
+for path in sorted(set(registry.cards.values())):
+    importlib.import_module(path)
+cost = time.perf_counter() - tic
+print(cost, len([m for m in sys.modules if m.startswith('entity.cards')]))
+'''
+
+LAZY = '''
+import sys, time
+import entity.spell_entity
+tic = time.perf_counter()
+import entity.cards
+from entity.card_registry import get_card_class
+for card_id in {card_ids!r}:
+    get_card_class(card_id)
+cost = time.perf_counter() - tic
+print(cost, len([m for m in sys.modules if m.startswith('entity.cards')]))
+'''
+
+
+def run(code, repeat):
+    results = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        cost, modules = out.split()
+        results.append((float(cost), int(modules)))
+    return min(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--cards', default='LETL_452_05,LETL_453_05,LETL_454_04',
+                        help='card_ids used in a typical battle')
+    args = parser.parse_args()
+
+    # 先跑一次, 生成索引和 .pyc
+    run(EAGER, 1)
+    for name, code in (('eager', EAGER), ('lazy', LAZY.format(card_ids=args.cards.split(',')))):
+        cost, modules = run(code, args.repeat)
+        print(f'{name}: {cost * 1000:.1f} ms, {modules} card modules')
+
+
+if __name__ == '__main__':
+    main()
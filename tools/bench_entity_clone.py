@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+BattleAi.battle2 每个叶子的模拟开销: 旧的 deepcopy 整个对局 vs clone 一次 + snapshot / restore
+
+python -m tools.bench_entity_clone --heros 3 --spells 3
+"""
+import argparse
+import copy
+import time
+import tracemalloc
+
+from hearthstone.entities import Card, Game, Player
+from hearthstone.enums import CardType, GameTag, Zone
+
+from entity.game_entity import GameEntity
+from entity.hero_entity import HeroEntity
+from entity.spell_entity import SpellEntity
+from utils.battle_ai import BattleAi
+
+
+def build_game(heros, spells):
+    """
+    用 hearthstone 的 Entity 搭一局 heros v heros 的对局, 和日志解析出来的结构一样
+    """
+    game = Game(1)
+    game.create({GameTag.CARDTYPE: CardType.GAME, GameTag.TURN: 1})
+    for i in range(2):
+        player = Player(2 + i, 1 + i, 0, 0)
+        player.tags = {GameTag.CARDTYPE: CardType.PLAYER}
+        game.register_entity(player)
+    game_entity = GameEntity(game)
+
+    eid = 10
+    for controller in (3, 2):
+        for pos in range(heros):
+            card = Card(eid, f'LT_TEST_{eid}H_01')
+            card.tags = {GameTag.ENTITY_ID: eid, GameTag.CARDTYPE: CardType.MINION, GameTag.ZONE: Zone.PLAY,
+                         GameTag.LETTUCE_CONTROLLER: controller, GameTag.ZONE_POSITION: pos + 1,
+                         GameTag.HEALTH: 30 + pos * 5, GameTag.ATK: 5 + pos, GameTag.LETTUCE_ROLE: pos % 3 + 1}
+            game.register_entity(card)
+            hero = HeroEntity(card)
+            eid += 1
+            for k in range(spells):
+                spell_card = Card(eid, f'LT_TEST_{eid}_0{k + 1}')
+                spell_card.tags = {GameTag.ENTITY_ID: eid, GameTag.CARDTYPE: CardType.LETTUCE_ABILITY,
+                                   GameTag.LETTUCE_ABILITY_OWNER: hero.entity_id, GameTag.COST: k + 1,
+                                   GameTag.LETTUCE_ROLE: hero.lettuce_role}
+                game.register_entity(spell_card)
+                spell = SpellEntity(spell_card)
+                spell.damage = 6 + k * 2
+                spell.range = 1
+                hero.add_spell(spell)
+                eid += 1
+            if controller == 2:
+                hero.lettuce_ability_tile_visual_all_visible = hero.spell[0].entity_id
+            game_entity.add_hero(hero)
+    return game_entity
+
+
+class DeepcopyBattleAi(BattleAi):
+    """
+    改动前的 simulate_battle, 每个叶子 deepcopy 整个对局
+    """
+
+    def battle2(self):
+        self.reset()
+        self.dfs(0, [])
+        return self.action
+
+    def simulate_battle(self, action_list):
+        action_list = copy.deepcopy(action_list)
+        _game = copy.deepcopy(self.game)
+        all_action_list = copy.deepcopy(action_list)
+        _game.my_action_list = copy.deepcopy(action_list)
+        all_action_list.extend(_game.get_enemy_action())
+        all_action_list.sort()
+        for x in all_action_list:
+            hero = _game.get_hero_by_eid(x.hero.entity_id)
+            if not hero.is_alive():
+                continue
+            target = None
+            spell = hero.get_spell_by_eid(x.spell.entity_id)
+            if x.target is not None:
+                target = _game.get_hero_by_eid(x.target.entity_id)
+            _game.play(_game, hero, spell, target)
+        score = self.analyze_score(_game.my_hero, _game.enemy_hero)
+        if self.score < score:
+            self.score = score
+            self.action = copy.deepcopy(action_list)
+            self.action.sort()
+
+
+def count_leaves(game):
+    leaves = 1
+    for hero in game.my_hero:
+        leaves *= sum(len(game.enemy_hero) if s.range == 1 else 1 for s in hero.get_available_spell_list())
+    return leaves
+
+
+def measure(ai_class, game):
+    ai = ai_class()
+    ai.game = game
+    tic = time.perf_counter()
+    ai.battle2()
+    cost = time.perf_counter() - tic
+    # 内存单独跑一遍, tracemalloc 会拖慢速度
+    tracemalloc.start()
+    ai.battle2()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cost, peak, ai.score
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--heros', type=int, default=3)
+    parser.add_argument('--spells', type=int, default=3)
+    args = parser.parse_args()
+
+    game = build_game(args.heros, args.spells)
+    leaves = count_leaves(game)
+    print(f'{args.heros}v{args.heros}, {args.spells} spells each, {leaves} leaves')
+    results = {}
+    for name, ai_class in (('deepcopy', DeepcopyBattleAi), ('clone', BattleAi)):
+        cost, peak, score = measure(ai_class, game)
+        results[name] = cost
+        print(f'{name}: {cost / leaves * 1e6:.1f} us/leaf, peak {peak / 1024:.1f} KiB, best score {score}')
+    print(f'speedup {results["deepcopy"] / results["clone"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+英雄和技能对象的内存占用和复制开销
+
+python -m tools.bench_entity_memory --count 10000
+"""
+import argparse
+import copy
+import time
+import tracemalloc
+
+from hearthstone.entities import Card
+from hearthstone.enums import CardType, GameTag
+
+from entity.hero_entity import HeroEntity
+from entity.spell_entity import SpellEntity
+
+
+def build_hero(eid, spells=3):
+    card = Card(eid, 'LT_TEST_01H_01')
+    card.tags = {GameTag.ENTITY_ID: eid, GameTag.CARDTYPE: CardType.MINION, GameTag.HEALTH: 30, GameTag.ATK: 5}
+    hero = HeroEntity(card)
+    for k in range(spells):
+        spell_card = Card(eid + k + 1, f'LT_TEST_01_0{k + 1}')
+        spell_card.tags = {GameTag.ENTITY_ID: eid + k + 1, GameTag.CARDTYPE: CardType.LETTUCE_ABILITY}
+        hero.add_spell(SpellEntity(spell_card))
+    return hero
+
+
+def measure_memory(func, count):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objs = [func(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return (after - before) / count
+
+
+def timeit(func, count):
+    tic = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - tic) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+
+    hero = build_hero(1)
+    # 只算英雄和技能对象本身, hearthstone 的 Card 事先建好共用
+    print(f'hero + 3 spells: {measure_memory(lambda i: hero.clone(), args.count):.0f} bytes per clone')
+    print(f'clone: {timeit(hero.clone, args.count) * 1e6:.2f} us')
+    print(f'snapshot: {timeit(hero.snapshot, args.count) * 1e6:.2f} us')
+    state = hero.snapshot()
+    print(f'restore: {timeit(lambda: hero.restore(state), args.count) * 1e6:.2f} us')
+    print(f'deepcopy: {timeit(lambda: copy.deepcopy(hero), args.count // 10) * 1e6:.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+截图转换的开销: 旧流程(灰度图和 BGR 图各截一次, np.array 再 cvtColor) vs FrameProvider 复用内存
+截图本身用一张固定的 PIL 图代替, 只比较转换和分配
+
+python -m tools.bench_frame_capture --width 1024 --height 768
+"""
+import argparse
+import timeit
+import tracemalloc
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from utils.frame_provider import FrameProvider
+from utils.frame_source import FrameSource
+from utils.images import pil_to_bgr
+
+
+class StillFrameSource(FrameSource):
+    """
+    每次都"截"到同一张 PIL 图, 和 ImageGrab.grab 返回的类型一样
+    """
+
+    def __init__(self, image):
+        self.image = image
+        self.rect = (0, 0, image.width, image.height)
+
+    def grab(self):
+        return self.grab_into(None)
+
+    def grab_into(self, out):
+        return self.rect, pil_to_bgr(self.image, out)
+
+
+def legacy_tick(image):
+    # 原来的 find_lushi_window(title) 和 find_lushi_window(title, raw=True), 各截一次
+    gray = cv2.cvtColor(np.array(image), cv2.COLOR_BGR2GRAY)
+    bgr = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+    return gray, bgr
+
+
+def provider_tick(frames):
+    frames.invalidate()
+    _, gray = frames.gray()
+    _, bgr = frames.bgr()
+    return gray, bgr
+
+
+def measure(func, frames):
+    """
+    Returns:
+        (每帧毫秒, 每帧新分配的图(和上一帧返回的不是同一个数组), 每帧临时分配的峰值字节数)
+    """
+    last = func()
+    # 机器上别的负载会干扰, 取几轮里最快的一轮
+    cost = min(timeit.repeat(func, number=frames, repeat=5)) / frames
+    new_arrays = 0
+    tracemalloc.start()
+    peaks = []
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        images = func()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        new_arrays += sum(1 for a, b in zip(images, last) if a is not b)
+        last = images
+    tracemalloc.stop()
+    return cost, new_arrays / frames, max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--width', type=int, default=1024)
+    parser.add_argument('--height', type=int, default=768)
+    parser.add_argument('--frames', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    image = Image.fromarray(rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8))
+    frames = FrameProvider(StillFrameSource(image))
+    frame_bytes = args.width * args.height * 3
+
+    gray, bgr = legacy_tick(image)
+    new_gray, new_bgr = provider_tick(frames)
+    assert np.array_equal(bgr, new_bgr)
+    assert np.array_equal(cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY), new_gray)
+
+    for name, func in (('legacy', lambda: legacy_tick(image)), ('provider', lambda: provider_tick(frames))):
+        cost, new_arrays, peak = measure(func, args.frames)
+        print(f'{name}: {cost * 1000:.2f} ms/frame, {new_arrays:.1f} new images/frame, '
+              f'peak alloc {peak / 2 ** 20:.2f} MB/frame ({peak / frame_bytes:.2f} BGR frames)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+LogUtil 冷启动解析耗时对比: 全量解析 vs 从最后一个 CREATE_GAME 开始解析
+
+python -m tools.bench_log_util --log C:/var/Hearthstone/Logs/Power.log --repeat 10
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from utils.log_util import LogUtil
+
+
+def build_sample(log_path, repeat):
+    # 把同一份日志拼接多次, 模拟挂机几个小时后包含多场对局的 Power.log
+    fd, sample = tempfile.mkstemp(suffix='.log')
+    with os.fdopen(fd, 'wb') as out:
+        for _ in range(repeat):
+            with open(log_path, 'rb') as f:
+                shutil.copyfileobj(f, out)
+    return sample
+
+
+def cold_parse(path, skip_old_games):
+    log = LogUtil(path)
+    log.skip_old_games = skip_old_games
+    tic = time.perf_counter()
+    game = log.parse_game()
+    return time.perf_counter() - tic, game
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', required=True, help='Power.log with at least one game')
+    parser.add_argument('--repeat', type=int, default=10, help='how many times the log is concatenated')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    sample = build_sample(args.log, args.repeat)
+    try:
+        print(f'sample {os.path.getsize(sample) / 1024 / 1024:.1f} MB, {args.repeat} copies of {args.log}')
+        for skip_old_games in (False, True):
+            costs = []
+            for _ in range(args.rounds):
+                cost, game = cold_parse(sample, skip_old_games)
+                costs.append(cost)
+            print(f'skip_old_games={skip_old_games}: best {min(costs) * 1000:.1f} ms, '
+                  f'my_hero {len(game.my_hero)}, enemy_hero {len(game.enemy_hero)}')
+    finally:
+        os.remove(sample)
+
+
+if __name__ == '__main__':
+    main()
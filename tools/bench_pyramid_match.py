@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+金字塔匹配对比全图匹配: 每个图标的平均耗时, 以及以全图匹配为准的 precision / recall
+
+python -m tools.bench_pyramid_match --lang eng --img-dir resource/imgs_eng_1024x768/img --scale 0.5
+"""
+import argparse
+import os
+import time
+
+import cv2
+
+from utils.images import full_match, pyramid_match
+from utils.state_classifier import StateClassifier
+
+IMG_FOLDERS = {
+    'eng': 'resource/imgs_eng_1024x768',
+    'chs': 'resource/imgs_chs_1600x900',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lang', choices=IMG_FOLDERS.keys(), default='eng')
+    parser.add_argument('--img-dir', required=True, help='folder of game screenshots (png)')
+    parser.add_argument('--confidence', type=float, default=0.8)
+    parser.add_argument('--scale', type=float, default=0.5)
+    args = parser.parse_args()
+
+    img_folder = IMG_FOLDERS[args.lang]
+    names = [img.split('.')[0] for img in sorted(os.listdir(os.path.join(img_folder, 'icons')))
+             if img.endswith('.png')]
+    icons = StateClassifier.from_folder(img_folder, names, args.confidence).templates
+    frames = [cv2.cvtColor(cv2.imread(os.path.join(args.img_dir, img)), cv2.COLOR_BGR2GRAY)
+              for img in sorted(os.listdir(args.img_dir)) if img.endswith('.png')]
+    if not frames:
+        print(f'no png found in {args.img_dir}')
+        return
+
+    full_cost, pyramid_cost = 0, 0
+    tp, fp, fn = 0, 0, 0
+    for frame in frames:
+        for name, icon in icons:
+            tic = time.perf_counter()
+            val, loc = full_match(frame, icon)
+            full_cost += time.perf_counter() - tic
+            tic = time.perf_counter()
+            pval, ploc = pyramid_match(frame, icon, args.confidence, args.scale)
+            pyramid_cost += time.perf_counter() - tic
+
+            expected = val > args.confidence
+            found = pval > args.confidence
+            if found and expected and abs(ploc[0] - loc[0]) <= 1 and abs(ploc[1] - loc[1]) <= 1:
+                tp += 1
+            else:
+                fp += found
+                fn += expected
+
+    count = len(frames) * len(icons)
+    print(f'{len(frames)} frames x {len(icons)} icons')
+    print(f'full:    {full_cost / count * 1000:.3f} ms/icon')
+    print(f'pyramid: {pyramid_cost / count * 1000:.3f} ms/icon, speedup {full_cost / pyramid_cost:.1f}x')
+    print(f'precision {tp / max(tp + fp, 1):.4f}, recall {tp / max(tp + fn, 1):.4f}')
+
+
+if __name__ == '__main__':
+    main()
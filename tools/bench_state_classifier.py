@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+状态识别耗时对比: 每个状态各转一次灰度图、各匹配一次(旧流程) vs StateClassifier 用同一帧给全部图标打分
+
+python -m tools.bench_state_classifier --lang eng --img-dir resource/imgs_eng_1024x768/img
+"""
+import argparse
+import os
+import time
+
+import cv2
+
+from utils.state_classifier import StateClassifier
+
+IMG_FOLDERS = {
+    'eng': 'resource/imgs_eng_1024x768',
+    'chs': 'resource/imgs_chs_1600x900',
+}
+
+
+def load_frames(img_dir):
+    frames = []
+    for img in sorted(os.listdir(img_dir)):
+        if img.endswith('.png'):
+            frames.append((img, cv2.imread(os.path.join(img_dir, img))))
+    return frames
+
+
+def sequential(frame, classifier):
+    # 旧流程: 每个状态都重新截图(这里用转灰度代替)再单独匹配, 返回第一个命中的状态
+    hit = None
+    for name, icon in classifier.templates:
+        screen = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        result = cv2.matchTemplate(screen, icon, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, _ = cv2.minMaxLoc(result)
+        if hit is None and max_val > classifier.confidence:
+            hit = name
+    return hit
+
+
+def shared_frame(frame, classifier):
+    matches = classifier.classify(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    return matches[0][0] if matches else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lang', choices=IMG_FOLDERS.keys(), default='eng')
+    parser.add_argument('--img-dir', required=True, help='folder of game screenshots (png)')
+    parser.add_argument('--confidence', type=float, default=0.8)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    img_folder = IMG_FOLDERS[args.lang]
+    states = [img.split('.')[0] for img in sorted(os.listdir(os.path.join(img_folder, 'icons')))
+              if img.endswith('.png')]
+    classifier = StateClassifier.from_folder(img_folder, states, args.confidence)
+    frames = load_frames(args.img_dir)
+    if not frames:
+        print(f'no png found in {args.img_dir}')
+        return
+    print(f'{len(frames)} frames, {len(classifier.templates)} templates')
+
+    for name, func in (('sequential', sequential), ('shared frame', shared_frame)):
+        costs = []
+        for _ in range(args.rounds):
+            tic = time.perf_counter()
+            hits = [func(frame, classifier) for _, frame in frames]
+            costs.append(time.perf_counter() - tic)
+        found = sum(1 for h in hits if h is not None)
+        print(f'{name}: {len(frames) / min(costs):.2f} fps, {found}/{len(frames)} frames classified')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+从录下来的截图里统计每个图标出现过的位置, 生成 locs_*.yaml 里的 icon_regions
+
+python -m tools.learn_icon_regions --lang eng --img-dir resource/imgs_eng_1024x768/img --margin 60
+"""
+import argparse
+import os
+
+import cv2
+import yaml
+
+from utils.state_classifier import StateClassifier
+
+IMG_FOLDERS = {
+    'eng': 'resource/imgs_eng_1024x768',
+    'chs': 'resource/imgs_chs_1600x900',
+}
+
+
+def learn_regions(classifier, frames, margin):
+    """
+    全图匹配每张截图, 把同一个图标所有命中位置的外框加上 margin 作为搜索区域
+    """
+    icons = dict(classifier.templates)
+    boxes = {}
+    for frame in frames:
+        h, w = frame.shape[:2]
+        for name, conf, (x, y) in classifier.classify(frame):
+            ih, iw = icons[name].shape[:2]
+            x1, y1 = x - iw // 2, y - ih // 2
+            box = [x1, y1, x1 + iw, y1 + ih]
+            if name in boxes:
+                old = boxes[name]
+                box = [min(old[0], box[0]), min(old[1], box[1]), max(old[2], box[2]), max(old[3], box[3])]
+            boxes[name] = box
+    regions = {}
+    for name, (x1, y1, x2, y2) in boxes.items():
+        regions[name] = [max(x1 - margin, 0), max(y1 - margin, 0), min(x2 + margin, w), min(y2 + margin, h)]
+    return regions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lang', choices=IMG_FOLDERS.keys(), default='eng')
+    parser.add_argument('--img-dir', required=True, help='folder of game screenshots (png)')
+    parser.add_argument('--confidence', type=float, default=0.8)
+    parser.add_argument('--margin', type=int, default=60, help='pixels added around the observed matches')
+    parser.add_argument('--names', nargs='*', help='only learn these icons, default all')
+    args = parser.parse_args()
+
+    img_folder = IMG_FOLDERS[args.lang]
+    names = args.names or [img.split('.')[0] for img in sorted(os.listdir(os.path.join(img_folder, 'icons')))
+                           if img.endswith('.png')]
+    classifier = StateClassifier.from_folder(img_folder, names, args.confidence)
+    frames = []
+    for img in sorted(os.listdir(args.img_dir)):
+        if img.endswith('.png'):
+            frames.append(cv2.cvtColor(cv2.imread(os.path.join(args.img_dir, img)), cv2.COLOR_BGR2GRAY))
+    if not frames:
+        print(f'no png found in {args.img_dir}')
+        return
+
+    regions = learn_regions(classifier, frames, args.margin)
+    # 直接贴到 locs_*.yaml 的 location 下面
+    print(yaml.safe_dump({'icon_regions': regions}, default_flow_style=None, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+离线跑 run_pve 的状态识别循环: 画面来自录下来的 png 文件夹或视频, 不需要游戏窗口
+每个 tick 调用的就是 Agent.detect_state, 图标、搜索区域和匹配参数都来自 --config
+
+按录制的时间轴模拟截图间隔, 没到下一次截图时间的帧不处理;
+--governor 时再用 CaptureGovernor 跑一遍, 和固定间隔比较每小时要花的 CPU 时间
+
+python -m tools.profile_replay --lang eng --replay recordings/run1 --governor
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+import yaml
+
+from lushi import Agent
+from utils.capture_governor import CaptureGovernor
+from utils.frame_source import ReplayFinished
+from utils.state_scheduler import StateScheduler
+
+LANGS = {
+    'eng': 'EN-1024x768',
+    'chs': 'ZH-1600x900',
+}
+
+
+def make_agent(config, lang, path, confidence=None):
+    """
+    回放 path 的 Agent, 截图时不等待, 不录像也不开后台截图
+    """
+    with open(config, 'r', encoding='utf-8') as f:
+        cfg = yaml.safe_load(f)
+    cfg['lang'] = LANGS[lang]
+    cfg['frame_replay'] = path
+    cfg['frame_replay_speed'] = None
+    cfg['frame_record'] = False
+    cfg['capture_thread'] = False
+    cfg['capture_governor'] = False
+    if confidence is not None:
+        cfg['confidence'] = confidence
+    return Agent(cfg)
+
+
+def replay(agent, interval, governor=None):
+    """
+    interval: 没有 governor 时固定的截图间隔(秒)
+    Returns:
+        (每个识别 tick 的耗时列表, 截图帧数, 状态直方图, 录像时长(秒), 识别用的 CPU 时间(秒), 平均图标数)
+    """
+    frames = agent.frames
+    source = frames.source
+    costs, hist, state = [], Counter(), None
+    polled, cpu, first, next_poll = 0, 0.0, None, None
+    with tempfile.TemporaryDirectory() as tmp:
+        # 不动 logs 里真实的转移统计
+        agent.scheduler = StateScheduler(agent.states, path=os.path.join(tmp, 'transitions.json'))
+        try:
+            while True:
+                frames.invalidate()
+                _, screen = frames.gray()
+                now = source.timestamp / 1000
+                if first is None:
+                    first = now
+                if next_poll is not None and now < next_poll:
+                    # 实际运行时这一帧根本不会截
+                    continue
+                polled += 1
+                tic = time.process_time()
+                next_poll = now + interval
+                if governor is not None:
+                    need = governor.check(screen)
+                    next_poll = now + governor.interval
+                    if not need:
+                        cpu += time.process_time() - tic
+                        continue
+                start = time.perf_counter()
+                match, _ = agent.detect_state(screen, state)
+                costs.append(time.perf_counter() - start)
+                cpu += time.process_time() - tic
+                found = match[0] if match is not None else None
+                hist[found] += 1
+                if found is not None:
+                    state = found
+        except ReplayFinished:
+            pass
+        source.close()
+        return costs, polled, hist, now - first, cpu, agent.scheduler.avg_templates()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lang', choices=LANGS.keys(), default='eng')
+    parser.add_argument('--config', default='config/default.yaml', help='launch config filename')
+    parser.add_argument('--replay', required=True, help='folder of png frames or a video file')
+    parser.add_argument('--confidence', type=float, help='override confidence in the config')
+    parser.add_argument('--governor', action='store_true', help='compare with CaptureGovernor')
+    parser.add_argument('--min-interval', type=float, default=0.5, help='also the fixed interval without governor')
+    parser.add_argument('--max-interval', type=float, default=3.0)
+    args = parser.parse_args()
+
+    runs = [('fixed interval', None)]
+    if args.governor:
+        runs.append(('governor', CaptureGovernor(args.min_interval, args.max_interval)))
+    for name, governor in runs:
+        agent = make_agent(args.config, args.lang, args.replay, args.confidence)
+        costs, polled, hist, duration, cpu, templates = replay(agent, args.min_interval, governor)
+        if not costs:
+            print(f'{name}: nothing classified in {args.replay}')
+            continue
+        ms = np.array(costs) * 1000
+        print(f'{name}: {polled} frames captured, {len(ms)} classified, avg templates per tick {templates:.2f}')
+        print('  tick ms: ' + ', '.join(f'p{p} {np.percentile(ms, p):.2f}' for p in (50, 90, 99)) +
+              f', max {ms.max():.2f}')
+        if duration > 0:
+            print(f'  cpu {cpu:.2f} s over {duration:.1f} s recorded, {cpu / duration * 3600:.0f} cpu s per hour')
+        for state, n in hist.most_common():
+            print(f'    {state}: {n}')
+
+
+if __name__ == '__main__':
+    main()
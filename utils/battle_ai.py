@@ -1,12 +1,23 @@
 import itertools
 import copy
+import math
+import time
 from typing import List
 
 from entity.action import Action
 from entity.game_entity import GameEntity
 from entity.hero_entity import HeroEntity
 from entity.spell_entity import SpellEntity
+from utils.battle_vector import best_assignment
 from utils.log_util import LogUtil
+from utils.transposition import TranspositionTable, board_key, build_actions, plan_key, step_key
+
+
+class SearchTimeout(Exception):
+    """
+    battle2 的时间用完了
+    """
+    pass
 
 
 class BattleAi:
@@ -14,6 +25,24 @@ class BattleAi:
         self.game: GameEntity = None
         self.score = -10000
         self.action = []
+        # battle2 模拟用的副本和它的初始状态
+        self.sim_game: GameEntity = None
+        self.sim_state = None
+        # 用置换表时模拟完不马上恢复, 下一个叶子开始时直接恢复到它要接着打的局面; 敌方动作只算一次
+        self.sim_dirty = False
+        self.enemy_actions = None
+        # anytime 搜索: 截止时间, 迭代加深的深度, 每个英雄排好序的 (技能, 目标), 剪枝用的伤害上限
+        self.deadline = None
+        self.depth = 0
+        self.moves = []
+        self.damage_bound = []
+        self.bound_base = (0, 0, 0)
+        self.leaves = 0
+        # 可选的置换表(方案的分数和打出每一步之后的局面)和搜索开始时局面的 key
+        self.transposition: TranspositionTable = None
+        self.board = None
+        # 不为 None 时记录每个叶子的 (分数, plan_key), 给 battle_rollout 挑候选方案
+        self.candidates = None
         pass
 
     @staticmethod
@@ -180,28 +209,35 @@ class BattleAi:
             re = BattleAi.analyze_max_dmg(my_hero, enemy_hero)
             print(f"battle strateg max_dmg: {re}")
             return re
-        else : # normal, max_dmg
-            optimal_strategy = ((-1 << 25), [1, 1, 1])
-            for idx in list(itertools.product(range(len(enemy_hero)), repeat=len(my_hero))):
-                my = copy.deepcopy(my_hero)
-                enemy = copy.deepcopy(enemy_hero)
-                for i, target in enumerate(idx):
-                    my[i].basic_attack(enemy[target], my[i].atk)
-                for i, e in enumerate(enemy):
-                    if e.get_health() > 0:
-                        my_min_health_hero = BattleAi.find_min_health(my)
-                        if my_min_health_hero is None:
-                            continue
-                        e.basic_attack(my_min_health_hero, e.atk)
-                score = -999999
-                if "max_dmg" == stratege_intervene:
-                    score = BattleAi.analyze_score(my, enemy, True)
-                else :
-                    score = BattleAi.analyze_score(my, enemy)
-                if score > optimal_strategy[0]:
-                    optimal_strategy = (score, idx)
+        else : # normal
+            return best_assignment(my_hero, enemy_hero)
+
+    @staticmethod
+    def battle_normal_loop(my_hero: List[HeroEntity], enemy_hero: List[HeroEntity], stratege_intervene = "normal"):
+        """
+        normal 策略的逐个枚举版本, 结果和 best_assignment 相同, 留作对照和测试
+        """
+        optimal_strategy = ((-1 << 25), [1, 1, 1])
+        for idx in list(itertools.product(range(len(enemy_hero)), repeat=len(my_hero))):
+            my = copy.deepcopy(my_hero)
+            enemy = copy.deepcopy(enemy_hero)
+            for i, target in enumerate(idx):
+                my[i].basic_attack(enemy[target], my[i].atk)
+            for i, e in enumerate(enemy):
+                if e.get_health() > 0:
+                    my_min_health_hero = BattleAi.find_min_health(my)
+                    if my_min_health_hero is None:
+                        continue
+                    e.basic_attack(my_min_health_hero, e.atk)
+            score = -999999
+            if "max_dmg" == stratege_intervene:
+                score = BattleAi.analyze_score(my, enemy, True)
+            else :
+                score = BattleAi.analyze_score(my, enemy)
+            if score > optimal_strategy[0]:
+                optimal_strategy = (score, idx)
 
-            return {k: v for k, v in enumerate(optimal_strategy[1])}
+        return {k: v for k, v in enumerate(optimal_strategy[1])}
 
     @staticmethod
     def battle_boss(my_hero: List[HeroEntity], enemy_hero: List[HeroEntity]):
@@ -225,46 +261,269 @@ class BattleAi:
         self.score = -1 << 25
         self.action.clear()
 
-    def battle2(self):
+    def battle2(self, budget_ms=None, transposition: TranspositionTable = None):
+        """
+        Args:
+            budget_ms: 时间预算(毫秒), None 时穷举所有组合;
+                       否则按速度排序、用敌方剩余血量剪枝、迭代加深, 时间到了返回目前最好的方案
+            transposition: 置换表, 记录方案的分数和每一步打完后的局面, 同一次搜索里出手顺序前面相同的方案
+                           从已经模拟过的局面接着打; 同一回合内多次调用可以共用, 换回合时自动清空
+        """
         self.reset()
-        self.dfs(0, [])
+        self.leaves = 0
+        self.transposition = transposition
+        if transposition is not None:
+            transposition.new_turn(self.game.turn)
+            self.board = transposition.intern(board_key(self.game))
+        # 所有叶子共用一份模拟用的副本, 每次模拟完恢复到初始状态
+        self.sim_game = self.game.clone()
+        self.sim_game.enemy_action_list = []
+        self.sim_state = self.sim_game.snapshot()
+        self.sim_dirty = False
+        self.enemy_actions = None
+        if budget_ms is None:
+            self.dfs(0, [])
+        else:
+            self.anytime_search(budget_ms)
+        if self.sim_dirty:
+            self.sim_game.restore(self.sim_state)
+            self.sim_dirty = False
         print(self.score)
         for x in self.action:
             print(x.hero, x.target, x.spell, end='\n\n\n')
         return self.action
 
     def simulate_battle(self, action_list):
-        _game = copy.deepcopy(game)
-        all_action_list = copy.deepcopy(action_list)
-        _game.my_action_list = copy.deepcopy(action_list)
+        self.leaves += 1
+        key = None
+        if self.transposition is not None:
+            key = (self.board, plan_key(action_list))
+            score = self.transposition.get(key)
+            if score is not None:
+                self.update_best(score, action_list)
+                return
+        score = self.simulate_score(action_list)
+        if key is not None:
+            self.transposition.put(key, score)
+        self.update_best(score, action_list)
+
+    def update_best(self, score, action_list):
+        if self.candidates is not None:
+            self.candidates.append((score, plan_key(action_list)))
+        if self.score < score:
+            self.score = score
+            self.action = sorted(action_list)
+
+    def battle_rollout(self, engine, top_k=8, budget_ms=None):
+        """
+        先用 battle2 单次模拟挑出分数最高的 top_k 个方案, 再交给 RolloutEngine 多次模拟取期望最高的
+        Args:
+            engine: utils.battle_pool.RolloutEngine
+        """
+        self.candidates = []
+        try:
+            self.battle2(budget_ms)
+            best = {}
+            for score, plan in self.candidates:
+                best[plan] = max(score, best.get(plan, score))
+        finally:
+            self.candidates = None
+        plans = sorted(best, key=lambda p: -best[p])[:top_k]
+        if not plans:
+            return self.action
+        stats = engine.evaluate(self.game, plans)
+        self.score = stats[0].mean
+        self.action = sorted(build_actions(self.game, stats[0].plan))
+        return self.action
+
+    def battle_parallel(self, search):
+        """
+        battle2 穷举的多进程版, 结果和 battle2() 相同
+        Args:
+            search: utils.battle_pool.ParallelSearch, 进程池整个会话共用
+        """
+        self.reset()
+        score, plan = search.search(self.game)
+        if plan:
+            self.score = score
+            self.action = sorted(build_actions(self.game, plan))
+        return self.action
+
+    def battle_parallel_targets(self, search, strategy):
+        """
+        battle_parallel 的结果换成 battle 的格式 [每个我方英雄打的敌人下标], 技能还是由调用方按配置选
+        Args:
+            search: utils.battle_pool.ParallelSearch
+            strategy: 原来的目标; 穷举没给出目标(范围技能)或者目标免疫、隐身的英雄还用它
+        """
+        strategy = list(strategy)
+        targets = {a.hero.entity_id: a.target for a in self.battle_parallel(search)}
+        enemy_index = {h.entity_id: i for i, h in enumerate(self.game.enemy_hero)}
+        for i, hero in enumerate(self.game.my_hero[:len(strategy)]):
+            target = targets.get(hero.entity_id)
+            if target is None or target.entity_id not in enemy_index or target.immune > 0 or target.stealth > 0:
+                continue
+            strategy[i] = enemy_index[target.entity_id]
+        return strategy
+
+    def simulate_score(self, action_list):
+        if self.transposition is not None:
+            return self.simulate_cached(action_list)
+        _game = self.sim_game
+        all_action_list = list(action_list)
+        _game.my_action_list = list(action_list)
         all_action_list.extend(_game.get_enemy_action())
         all_action_list.sort()
         _game.all_action_list = all_action_list
-        for x in all_action_list:
-            if not x.hero.is_alive():
-                continue
+        self.play_actions(all_action_list, 0)
+        score = self.analyze_score(_game.my_hero, _game.enemy_hero)
+        _game.restore(self.sim_state)
+        # print(score)
+        return score
+
+    def simulate_cached(self, action_list):
+        """
+        用置换表的 simulate_score: 所有动作按出手顺序排好, 前几步相同的方案打到的局面也相同,
+        从模拟过的最长前缀接着打, 新打出的每一步都记下来给后面的方案用
+        """
+        _game = self.sim_game
+        table = self.transposition
+        if self.enemy_actions is None:
+            # 第一个叶子开始时还是初始局面
+            self.enemy_actions = list(_game.get_enemy_action())
+        all_action_list = list(action_list)
+        all_action_list.extend(self.enemy_actions)
+        all_action_list.sort()
+        prefix = ()
+        heros = None
+        for x in all_action_list[:-1]:
+            key = prefix + (step_key(x),)
+            state = table.get((self.board, key))
+            if state is None:
+                break
+            prefix, heros = key, state
+        if heros is not None:
+            _game.restore_heros(heros)
+        elif self.sim_dirty:
+            _game.restore(self.sim_state)
+        _game.enemy_action_list = list(self.enemy_actions)
+        _game.my_action_list = list(action_list)
+        _game.all_action_list = all_action_list
+        self.sim_dirty = True
+        reads = _game.action_list_reads
+        for i in range(len(prefix), len(all_action_list) - 1):
+            self.play_actions(all_action_list, i, i + 1)
+            # 技能看了整个方案(连击等)时, 之后的局面和还没打出的动作有关, 不能给别的方案用
+            if _game.action_list_reads != reads:
+                self.play_actions(all_action_list, i + 1)
+                break
+            prefix += (step_key(all_action_list[i]),)
+            table.put((self.board, prefix), _game.snapshot_heros())
+        else:
+            self.play_actions(all_action_list, len(all_action_list) - 1)
+        return self.analyze_score(_game.my_hero, _game.enemy_hero)
+
+    def play_actions(self, all_action_list, start, end=None):
+        _game = self.sim_game
+        for x in all_action_list[start:end]:
             # print(x['hero'], x['target'], x['spell'], end='\n\n\n')
             hero = _game.get_hero_by_eid(x.hero.entity_id)
+            if not hero.is_alive():
+                continue
             target = None
             spell = hero.get_spell_by_eid(x.spell.entity_id)
             if x.target is not None:
                 target = _game.get_hero_by_eid(x.target.entity_id)
             _game.play(_game, hero, spell, target)
-        score = self.analyze_score(_game.my_hero, _game.enemy_hero)
-        # print(score)
-        if self.score < score:
-            # if score == 942:
-            #     for h in _game.enemy_hero:
-            #         print(h.get_health())
-            self.score = score
-            self.action = copy.deepcopy(action_list)
-            self.action.sort()
-        pass
+
+    def anytime_search(self, budget_ms):
+        self.deadline = time.perf_counter() + budget_ms / 1000
+        self.moves = [self.ordered_moves(h) for h in self.game.my_hero]
+        # 从后往前累加, damage_bound[i] 为第 i 个英雄及之后的英雄最多能打出的伤害
+        self.damage_bound = [0] * (len(self.moves) + 1)
+        for i in range(len(self.moves) - 1, -1, -1):
+            best = max((d for _, _, d in self.moves[i]), default=0)
+            self.damage_bound[i] = self.damage_bound[i + 1] + best
+        my_health = [x.get_health() for x in self.game.my_hero if x.get_health() > 0]
+        enemy_health = [x.get_health() for x in self.game.enemy_hero if x.get_health() > 0]
+        self.bound_base = (len(my_health) * (min(my_health, default=0) + sum(my_health)),
+                           sum(enemy_health), len(enemy_health))
+        try:
+            # depth 之后的英雄直接用排第一的动作, 每加深一层多穷举一个英雄
+            for depth in range(len(self.moves) + 1):
+                self.depth = depth
+                self.search(0, [], 0)
+        except SearchTimeout:
+            pass
+
+    def ordered_moves(self, hero: HeroEntity):
+        """
+        英雄所有可用的 (技能, 目标, 最大伤害), 快的技能在前, 同一技能先打血少的
+        """
+        targets = sorted(self.game.enemy_hero, key=lambda x: x.get_health())
+        moves = []
+        for spell in sorted(hero.get_available_spell_list()):
+            if spell.damage < 0:
+                continue
+            damage = self.max_damage(spell)
+            if spell.range == 1:
+                moves.extend((spell, t, damage) for t in targets)
+            else:
+                moves.append((spell, None, damage))
+        return moves
+
+    def max_damage(self, spell: SpellEntity):
+        """
+        技能最多能造成的总伤害: 克制翻倍, 非单体的技能按打中所有敌人算;
+        自定义了 play 的技能可能按攻击力打、击杀后重复、给自己回血, 没法估计, 不设上限
+        """
+        if type(spell).play is not SpellEntity.play:
+            return math.inf
+        damage = max([v for k, v in spell.fields().items() if 'damage' in k and isinstance(v, int)], default=0)
+        damage = (damage + self.game.get_spell_power(spell.spell_school)) * 2
+        if spell.range != 1:
+            damage *= len(self.game.enemy_hero)
+        return max(damage, 0)
+
+    def upper_bound(self, damage):
+        """
+        我方不掉血、敌方最多受到 damage 点伤害时 analyze_score 的上限
+        """
+        if damage == math.inf:
+            # 还有自定义 play 的技能没放, 不剪枝
+            return math.inf
+        my_score, enemy_health, enemy_cnt = self.bound_base
+        rest = enemy_health - damage
+        if rest <= 0:
+            return my_score
+        # 至少还剩一个敌人, 剩余血量平均分给所有敌人时最高血量最小
+        return my_score - (rest + -(-rest // enemy_cnt))
+
+    def search(self, hero_id, result: List, damage):
+        # 至少要先找到一个方案
+        if self.action and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if self.upper_bound(damage + self.damage_bound[hero_id]) <= self.score:
+            return
+        if hero_id >= len(self.moves):
+            self.simulate_battle(result)
+            return
+        moves = self.moves[hero_id]
+        if not moves:
+            self.search(hero_id + 1, result, damage)
+            return
+        if hero_id >= self.depth:
+            moves = moves[:1]
+        hero = self.game.my_hero[hero_id]
+        for spell, target, spell_damage in moves:
+            result.append(Action(hero=hero, spell=spell, target=target))
+            self.search(hero_id + 1, result, damage + spell_damage)
+            result.pop()
 
     def dfs(self, hero_id, result: List):
         # 枚举英雄
         if hero_id >= len(self.game.my_hero):
-            self.simulate_battle(copy.deepcopy(result))
+            self.simulate_battle(result)
             return
         hero = self.game.my_hero[hero_id]
         # 枚举技能
@@ -284,7 +543,7 @@ class BattleAi:
                     self.dfs(hero_id + 1, result)
                     result.pop()
             else:
-                for my in game.my_hero:
+                for my in self.game.my_hero:
                     pass
         pass
 
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+import itertools
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from utils.battle_ai import BattleAi
+from utils.transposition import build_actions, plan_key
+
+logger = logging.getLogger()
+
+
+def compact_game(game):
+    """
+    去掉 hearthstone 的 Entity 后的对局副本, 只保留模拟需要的字段, 用来传给子进程
+    """
+    c = game.clone()
+    c.entity = None
+    # get_spell_power 只用到 players 的 tags
+    c.players = [SimpleNamespace(tags=dict(p.tags)) for p in game.players]
+    c.enemy_action_list = []
+    c.my_action_list = []
+    c.all_action_list = []
+    for h in c.hero_entities.values():
+        h.entity = None
+        for s in h.spell:
+            s.entity = None
+    return c
+
+
+def rollout(game, plan, seeds):
+    """
+    用每个种子各模拟一次方案, 返回分数列表; 在子进程里执行
+    """
+    ai = BattleAi.from_game(game)
+    ai.sim_game = game.clone()
+    ai.sim_state = ai.sim_game.snapshot()
+    actions = build_actions(ai.sim_game, plan)
+    scores = []
+    for seed in seeds:
+        ai.sim_game.rng = random.Random(seed)
+        scores.append(ai.simulate_score(actions))
+    return scores
+
+
+def warm_up(_):
+    return os.getpid()
+
+
+def start_pool(workers=None):
+    """
+    拉起常驻的进程池, 提前 import 好模块, 第一次决策就不用等
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    list(pool.map(warm_up, range((workers or os.cpu_count() or 1) * 2)))
+    return pool
+
+
+def first_moves(game, depth):
+    """
+    前 depth 个英雄所有 (英雄, 技能, 目标) 的组合, 顺序和 BattleAi.dfs 枚举的顺序一致
+    """
+    heros = []
+    for hero in game.my_hero[:depth]:
+        moves = []
+        for spell in hero.get_available_spell_list():
+            if spell.damage < 0:
+                continue
+            if spell.range == 1:
+                moves.extend((hero.entity_id, spell.entity_id, e.entity_id) for e in game.enemy_hero)
+            else:
+                moves.append((hero.entity_id, spell.entity_id, 0))
+        heros.append(moves)
+    return [tuple(x for move in prefix for x in move) for prefix in itertools.product(*heros)]
+
+
+def search_shard(game, prefixes):
+    """
+    固定前几个英雄的动作, 穷举剩下的英雄, 返回这一片里最好的 (分数, plan_key); 在子进程里执行
+    """
+    ai = BattleAi.from_game(game)
+    ai.reset()
+    ai.sim_game = game.clone()
+    ai.sim_state = ai.sim_game.snapshot()
+    for prefix in prefixes:
+        actions = build_actions(game, prefix)
+        ai.dfs(len(actions), actions)
+    return ai.score, plan_key(ai.action)
+
+
+class RolloutStats:
+    def __init__(self, plan):
+        self.plan = plan
+        self.n = 0
+        self.mean = 0.0
+        # 方差的累加量(Welford)
+        self.m2 = 0.0
+
+    def add(self, scores):
+        for x in scores:
+            self.n += 1
+            delta = x - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (x - self.mean)
+
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def stderr(self):
+        return math.sqrt(self.variance() / self.n) if self.n else float('inf')
+
+
+class RolloutEngine:
+    """
+    随机目标技能的蒙特卡洛评估: 每个候选方案用同一组种子模拟多次, 统计期望分数和方差。
+    每轮把所有方案的 rollout 分批交给常驻的进程池, 最好的方案已经明显胜出或者时间用完就停
+    """
+
+    def __init__(self, workers=None, rollouts=64, batch=8, budget_ms=500, z=2.0, seed=0):
+        """
+        Args:
+            workers: 进程数, 0 时在当前进程里跑, None 为 CPU 核数
+            rollouts: 每个方案最多模拟的次数
+            batch: 每轮每个方案模拟的次数
+            budget_ms: 每次决策的时间预算(毫秒)
+            z: 最好方案的均值比其他方案高出 z 个标准误时提前结束
+            seed: 种子的起点, 同一次决策里所有方案用同一组种子
+        """
+        self.workers = workers
+        self.rollouts = rollouts
+        self.batch = batch
+        self.budget_ms = budget_ms
+        self.z = z
+        self.seed = seed
+        self.pool = None
+        if workers != 0:
+            self.pool = start_pool(workers)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def evaluate(self, game, plans):
+        """
+        Args:
+            game: GameEntity
+            plans: plan_key 列表
+        Returns:
+            [RolloutStats, ...], 按期望分数从高到低排序
+        """
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        snapshot = compact_game(game)
+        stats = [RolloutStats(plan) for plan in plans]
+        done = 0
+        while done < self.rollouts:
+            seeds = list(range(self.seed + done, self.seed + min(done + self.batch, self.rollouts)))
+            if self.pool is None:
+                results = [rollout(snapshot, s.plan, seeds) for s in stats]
+            else:
+                futures = [self.pool.submit(rollout, snapshot, s.plan, seeds) for s in stats]
+                results = [f.result() for f in futures]
+            for s, scores in zip(stats, results):
+                s.add(scores)
+            done += len(seeds)
+            if self.is_clear(stats) or time.perf_counter() > deadline:
+                break
+        stats.sort(key=lambda s: -s.mean)
+        logger.debug(f'rollout {done} times for {len(plans)} plans')
+        return stats
+
+    def is_clear(self, stats):
+        """
+        最好的方案比其他每个方案都高出 z 个标准误
+        """
+        if len(stats) < 2:
+            return True
+        best = max(stats, key=lambda s: s.mean)
+        if best.n < 2:
+            return False
+        for s in stats:
+            if s is best:
+                continue
+            gap = best.mean - s.mean
+            if gap <= self.z * math.sqrt(best.variance() / best.n + s.variance() / s.n):
+                return False
+        return True
+
+
+class ParallelSearch:
+    """
+    battle2 穷举的并行版: 按前几个英雄的动作把搜索树切成很多片, 交给常驻的进程池,
+    子进程拿到的是 compact_game 之后的对局副本, 不是 hearthstone 的 Entity 树
+    """
+
+    def __init__(self, workers=None, shards_per_worker=4):
+        """
+        Args:
+            workers: 进程数, 0 时在当前进程里跑, None 为 CPU 核数
+            shards_per_worker: 每个进程大概分到几片, 片多一点各进程负载更均匀
+        """
+        self.workers = workers
+        self.shards_per_worker = shards_per_worker
+        self.pool = None
+        if workers != 0:
+            self.pool = start_pool(workers)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def split(self, game):
+        """
+        加深前缀直到片数够分, 再把前缀按顺序连续地分成若干片
+        """
+        want = (self.workers or os.cpu_count() or 1) * self.shards_per_worker if self.pool is not None else 1
+        depth = 1
+        prefixes = first_moves(game, depth)
+        while len(prefixes) < want and depth < len(game.my_hero):
+            depth += 1
+            prefixes = first_moves(game, depth)
+        if not prefixes:
+            # 有英雄一个技能都放不了, 和串行穷举一样没有方案
+            return [[]]
+        size = -(-len(prefixes) // want)
+        return [prefixes[i:i + size] for i in range(0, len(prefixes), size)]
+
+    def search(self, game):
+        """
+        Returns:
+            (最高分, plan_key), 分数相同时和串行穷举一样取枚举顺序靠前的方案; 没有可用方案时 plan_key 为空
+        """
+        snapshot = compact_game(game)
+        shards = self.split(snapshot)
+        if self.pool is None:
+            results = [search_shard(snapshot, shard) for shard in shards]
+        else:
+            futures = [self.pool.submit(search_shard, snapshot, shard) for shard in shards]
+            results = [f.result() for f in futures]
+        best_score, best_plan = -1 << 25, ()
+        for score, plan in results:
+            if plan and score > best_score:
+                best_score, best_plan = score, plan
+        logger.debug(f'parallel search {len(shards)} shards, best score {best_score}')
+        return best_score, best_plan
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from typing import List
+
+import numpy as np
+
+from entity.base_entity import BaseEntity
+from entity.hero_entity import HeroEntity
+
+# 和 BattleAi.battle 里的初始值一致
+NO_STRATEGY_SCORE = -(1 << 25)
+NO_STRATEGY = [1, 1, 1]
+
+
+def product_indices(n, repeat):
+    """
+    和 itertools.product(range(n), repeat=repeat) 顺序相同的索引矩阵, shape (n ** repeat, repeat)
+    """
+    if repeat == 0:
+        return np.zeros((1, 0), dtype=np.int64)
+    grids = np.unravel_index(np.arange(n ** repeat), (n,) * repeat)
+    return np.stack(grids, axis=1).astype(np.int64)
+
+
+def score_assignments(my_hero: List[HeroEntity], enemy_hero: List[HeroEntity], targets=None):
+    """
+    一次算出所有攻击目标组合的 analyze_score, 模拟过程和 BattleAi.battle 的 normal 循环相同:
+    我方每个佣兵(不管死活)按组合普攻目标, 然后敌方活着的佣兵依次普攻我方当前血量最低的(包括已死的)
+    Args:
+        targets: 目标组合矩阵, 默认 product_indices(len(enemy_hero), len(my_hero))
+    Returns:
+        (targets, scores)
+    """
+    adv = np.array(BaseEntity.damage_advantage, dtype=np.int64)
+    my_atk = np.array([h.atk for h in my_hero], dtype=np.int64)
+    my_role = np.array([h.lettuce_role for h in my_hero], dtype=np.int64)
+    my_max = np.array([h.max_health for h in my_hero], dtype=np.int64)
+    my_damage0 = np.array([h.damage for h in my_hero], dtype=np.int64)
+    enemy_atk = np.array([h.atk for h in enemy_hero], dtype=np.int64)
+    enemy_role = np.array([h.lettuce_role for h in enemy_hero], dtype=np.int64)
+    enemy_max = np.array([h.max_health for h in enemy_hero], dtype=np.int64)
+    enemy_damage0 = np.array([h.damage for h in enemy_hero], dtype=np.int64)
+
+    my_cnt, enemy_cnt = len(my_hero), len(enemy_hero)
+    if targets is None:
+        targets = product_indices(enemy_cnt, my_cnt)
+    n = len(targets)
+    rows = np.arange(n)
+
+    # 我方 i 打敌方 j 的伤害, shape (my, enemy)
+    my_dmg = my_atk[:, None] * adv[my_role[:, None], enemy_role[None, :]]
+    enemy_damage = np.tile(enemy_damage0, (n, 1))
+    for i in range(my_cnt):
+        t = targets[:, i]
+        enemy_damage[rows, t] += my_dmg[i, t]
+    enemy_health = enemy_max[None, :] - enemy_damage
+
+    # 敌方 j 打我方 k 的伤害, shape (enemy, my)
+    my_health = np.tile(my_max - my_damage0, (n, 1))
+    if my_cnt > 0:
+        enemy_dmg = enemy_atk[:, None] * adv[enemy_role[:, None], my_role[None, :]]
+        for j in range(enemy_cnt):
+            alive = enemy_health[:, j] > 0
+            # argmin 取第一个最小值, 和 min(heros, key=...) 一致
+            target = np.argmin(my_health, axis=1)
+            my_health[rows, target] -= np.where(alive, enemy_dmg[j, target], 0)
+
+    return targets, analyze_score(my_health, enemy_health)
+
+
+def analyze_score(my_health, enemy_health):
+    """
+    BattleAi.analyze_score(skip_our_health=False) 的矩阵版本, 每一行是一种组合
+    """
+    my_alive = my_health > 0
+    my_cnt = my_alive.sum(axis=1)
+    my_sum = np.where(my_alive, my_health, 0).sum(axis=1)
+    if my_health.shape[1]:
+        my_min = np.where(my_alive, my_health, np.iinfo(np.int64).max).min(axis=1)
+        my_min = np.where(my_cnt > 0, my_min, 0)
+    else:
+        my_min = np.zeros(len(my_health), dtype=np.int64)
+
+    enemy_alive = enemy_health > 0
+    enemy_cnt = enemy_alive.sum(axis=1)
+    enemy_sum = np.where(enemy_alive, enemy_health, 0).sum(axis=1)
+    if enemy_health.shape[1]:
+        enemy_max = np.where(enemy_alive, enemy_health, np.iinfo(np.int64).min).max(axis=1)
+        enemy_max = np.where(enemy_cnt > 0, enemy_max, 0)
+    else:
+        enemy_max = np.zeros(len(enemy_health), dtype=np.int64)
+
+    return my_cnt * (my_min + my_sum) - (enemy_max + enemy_sum) * enemy_cnt
+
+
+def best_assignment(my_hero: List[HeroEntity], enemy_hero: List[HeroEntity]):
+    """
+    BattleAi.battle normal 策略的结果: {我方位置: 敌方位置}, 分数相同时取最先枚举到的组合
+    """
+    targets, scores = score_assignments(my_hero, enemy_hero)
+    strategy = NO_STRATEGY
+    if len(scores):
+        # argmax 取第一个最大值, 和逐个比较 score > best 一致
+        best = int(np.argmax(scores))
+        if scores[best] > NO_STRATEGY_SCORE:
+            strategy = targets[best].tolist()
+    return {k: v for k, v in enumerate(strategy)}
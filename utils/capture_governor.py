@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import time
+
+import cv2
+
+
+class CaptureGovernor:
+    """
+    画面没变就不做状态识别, 并且拉长截图间隔:
+    把灰度图缩成小图(每格是原图一块的平均), 和上一次识别时的小图逐格比,
+    差得最多的一格也不到 threshold 算没变; 只比全图平均的话, 弹出一个小按钮会被平均掉。
+    没变时间隔每次乘以 backoff, 直到 max_interval; 一变就回到 min_interval。
+    连续跳过 max_skips 次后强制识别一次, 防止点击没生效时一直卡着
+    """
+
+    def __init__(self, min_interval=0.5, max_interval=3.0, threshold=8, max_skips=10, size=(64, 48),
+                 backoff=1.5, clock=time.perf_counter, sleep=time.sleep):
+        """
+        Args:
+            min_interval: 画面在变时的截图间隔(秒)
+            max_interval: 画面一直不变时最长的截图间隔(秒)
+            threshold: 小图上有一格的灰度差到这么多(0~255)就算画面变了
+            max_skips: 最多连续跳过几次识别
+            size: 小图的 (宽, 高)
+            backoff: 没变时间隔放大的倍数
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.threshold = threshold
+        self.max_skips = max_skips
+        self.size = size
+        self.backoff = backoff
+        self.clock = clock
+        self.sleep = sleep
+        self.interval = min_interval
+        # 上一次识别时的小图
+        self.reference = None
+        self.last_check = None
+        self.skips = 0
+        # 统计: 截了几帧, 跳过了几帧
+        self.frames = 0
+        self.skipped = 0
+
+    def difference(self, thumb):
+        return int(cv2.absdiff(thumb, self.reference).max())
+
+    def check(self, gray):
+        """
+        Returns:
+            True 时这一帧需要做状态识别
+        """
+        self.last_check = self.clock()
+        self.frames += 1
+        thumb = cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+        if self.reference is not None and self.skips < self.max_skips \
+                and self.difference(thumb) < self.threshold:
+            self.skips += 1
+            self.skipped += 1
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+            return False
+        self.reference = thumb
+        self.skips = 0
+        self.interval = self.min_interval
+        return True
+
+    def delay(self):
+        """
+        距离下一次截图还要等多久(秒)
+        """
+        if self.last_check is None:
+            return 0
+        return max(0.0, self.last_check + self.interval - self.clock())
+
+    def wait(self):
+        delay = self.delay()
+        if delay > 0:
+            self.sleep(delay)
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'skip_rate': self.skipped / self.frames if self.frames else 0,
+            'interval': self.interval,
+        }
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from utils.frame_source import FrameSource, ReplayFinished
+
+
+class CaptureWorker(FrameSource):
+    """
+    后台线程每隔 interval 秒用 source 截一帧, 带着序号放进"最新一帧"的信箱, 匹配和点击的时候截图也在进行。
+
+    取图的规则: invalidate() 之后, 开始截图的时间不早于 invalidate 前 max_age 秒的帧都算新的,
+    信箱里已经有这样的帧就直接拿走, 不用等; 没有才等下一帧。
+    pyautogui 每个操作之后都会停 PAUSE 秒, max_age 比它小时, 拿到的帧一定是操作之后截的。
+
+    截图用三块内存轮流: 一块给调用方, 一块放在信箱里, 一块在截图, 调用方拿到的图在下一次 grab() 前不会被覆盖
+    """
+
+    def __init__(self, source, interval=0.05, max_age=0.1, timeout=5.0, clock=time.perf_counter):
+        """
+        Args:
+            source: 真正截图的 FrameSource
+            interval: 两次截图之间停多久(秒)
+            max_age: invalidate() 之前多久以内开始截的帧还能用(秒)
+            timeout: 最多等多久新的一帧, 超时抛 TimeoutError
+        """
+        self.source = source
+        self.interval = interval
+        self.max_age = max_age
+        self.timeout = timeout
+        self.clock = clock
+        self.cond = threading.Condition()
+        # 信箱: (序号, 开始截图的时间, rect, 图), 只整体替换, 不加锁也能读到完整的一帧
+        self.latest = None
+        self.seq = 0
+        # 调用方正在用的图(和它的序号), 空闲的内存
+        self.taken = None
+        self.taken_seq = 0
+        self.free = []
+        self.fresh_after = None
+        # 截图出的错, 交给下一次 grab() 抛出
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='capture-worker', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.is_set():
+            with self.cond:
+                out = self.free.pop() if self.free else None
+            started = self.clock()
+            try:
+                rect, image = self.source.grab_into(out)
+            except Exception as e:
+                with self.cond:
+                    self.error = e
+                    self.cond.notify_all()
+                if isinstance(e, ReplayFinished):
+                    return
+                # 比如游戏重启时找不到窗口, 过一会再试
+                self.stopped.wait(max(self.interval, 0.5))
+                continue
+            with self.cond:
+                if self.latest is not None:
+                    old = self.latest[3]
+                    if old is not self.taken and old is not image:
+                        self.free.append(old)
+                self.seq += 1
+                self.latest = (self.seq, started, rect, image)
+                self.error = None
+                self.cond.notify_all()
+            if self.interval > 0:
+                self.stopped.wait(self.interval)
+
+    def peek(self):
+        """
+        不等待, 返回信箱里最新的 (序号, 开始截图的时间, rect, 图), 还没截到时返回 None
+        """
+        return self.latest
+
+    def invalidate(self):
+        self.fresh_after = self.clock() - self.max_age
+
+    def is_fresh(self):
+        return self.latest is not None and (self.fresh_after is None or self.latest[1] >= self.fresh_after)
+
+    def grab_into(self, out):
+        # 内存由后台线程管理, 不用调用方给的 out
+        with self.cond:
+            self.cond.wait_for(lambda: self.is_fresh() or self.error is not None or not self.thread.is_alive(),
+                               self.timeout)
+            if not self.is_fresh():
+                error = self.error
+                if error is not None:
+                    # 回放放完了以后一直抛 ReplayFinished
+                    if not isinstance(error, ReplayFinished):
+                        self.error = None
+                    raise error
+                raise TimeoutError(f'no frame captured in {self.timeout} s')
+            seq, _, rect, image = self.latest
+            if self.taken is not None and self.taken is not image:
+                self.free.append(self.taken)
+            self.taken = image
+            self.taken_seq = seq
+            return rect, image
+
+    def grab(self):
+        return self.grab_into(None)
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+        self.source.close()
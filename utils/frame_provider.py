@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import cv2
+
+
+class FrameProvider:
+    """
+    同一个 tick 内共用一帧截图, 灰度图和 BGR 图都从这一帧转换得到。
+    点击等会改变画面的操作之后调用 invalidate(), 下次取图时重新截图。
+    截图来自 utils.frame_source 里的 FrameSource, 可以是实时截图也可以是回放
+
+    BGR 图和灰度图各用一块预先分配、每帧复用的内存, 窗口大小不变时截图不再分配新数组;
+    所以拿到的图在下一次截图后会被覆盖, 要跨帧保留的话自己 copy()
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.rect = None
+        self.bgr_image = None
+        self.gray_image = None
+        # 复用的内存
+        self.bgr_buffer = None
+        self.gray_buffer = None
+        # 截图次数, 用来统计每个 tick 的截图开销
+        self.captures = 0
+
+    def invalidate(self):
+        self.source.invalidate()
+        self.rect = None
+        self.bgr_image = None
+        self.gray_image = None
+
+    def grab(self):
+        self.rect, self.bgr_image = self.source.grab_into(self.bgr_buffer)
+        self.bgr_buffer = self.bgr_image
+        self.gray_image = None
+        self.captures += 1
+
+    def bgr(self):
+        if self.bgr_image is None:
+            self.grab()
+        return self.rect, self.bgr_image
+
+    def capture(self):
+        """
+        不管有没有缓存, 重新截一帧
+        """
+        self.invalidate()
+        return self.bgr()
+
+    def gray(self):
+        if self.gray_image is None:
+            rect, image = self.bgr()
+            # 和 icons 的读取方式一致: BGR -> GRAY
+            self.gray_image = self.gray_buffer = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self.gray_buffer)
+        return self.rect, self.gray_image
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+import cv2
+
+logger = logging.getLogger()
+
+RECORD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'logs', 'recordings')
+# 每个分块 zip 里的索引: [{'ts': 毫秒, 'file': png 文件名, 'state': 识别到的状态, 'clicks': [[毫秒, 屏幕 x, 屏幕 y], ...]}]
+INDEX_NAME = 'index.json'
+CHUNK_PREFIX = 'chunk_'
+
+
+def chunk_files(path):
+    """
+    录像文件夹里按顺序排好的分块 zip
+    """
+    return sorted(os.path.join(path, f) for f in os.listdir(path)
+                  if f.startswith(CHUNK_PREFIX) and f.endswith('.zip'))
+
+
+def read_index(zip_path):
+    with zipfile.ZipFile(zip_path) as z:
+        return json.loads(z.read(INDEX_NAME))
+
+
+def read_archive(path):
+    """
+    Args:
+        path: 录像文件夹或者一个分块 zip
+    Returns:
+        [(zip 路径, 索引里的一项), ...], 按时间排序; 没写完的分块(没有索引)跳过
+    """
+    zips = chunk_files(path) if os.path.isdir(path) else [path]
+    frames = []
+    for zip_path in zips:
+        try:
+            entries = read_index(zip_path)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            logger.warning(f'skip {zip_path}: {e}')
+            continue
+        frames.extend((zip_path, entry) for entry in entries)
+    frames.sort(key=lambda x: x[1]['ts'])
+    return frames
+
+
+class FrameRecorder:
+    """
+    把运行时的画面录成分块的 png-in-zip, 用来复现现场的问题, 可以直接交给 ReplayFrameSource 回放。
+    每块 chunk_frames 帧, 块里带索引(时间戳、识别到的状态、之后发出的点击);
+    同一个文件夹里所有块(包括之前几次运行录的)加起来超过 max_bytes 时删掉最老的块。
+    png 编码和写盘都在后台线程里做, record() 只复制一下画面放进队列, 队列满了就丢帧, 不拖慢主循环
+    """
+
+    def __init__(self, path=None, chunk_frames=100, max_bytes=200 * 2 ** 20, queue_size=16, compression=1):
+        """
+        Args:
+            path: 录像文件夹, 默认 logs/recordings
+            chunk_frames: 每块的帧数
+            max_bytes: 录像最多占的磁盘空间
+            queue_size: 等待写盘的帧数上限
+            compression: png 压缩级别(0~9), 越小越快
+        """
+        if path is None:
+            path = RECORD_DIR
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        # 分块的文件名带上这次运行开始的时间, 按文件名排序就是按时间排序
+        self.session = datetime.strftime(datetime.now(), '%Y%m%d-%H%M%S')
+        self.chunk_frames = chunk_frames
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.queue = queue.Queue(maxsize=queue_size)
+        # 统计: 录了几帧, 丢了几帧
+        self.frames = 0
+        self.dropped = 0
+        # 以下只在写盘线程里用
+        self.chunk_id = 0
+        self.zip = None
+        self.index = []
+        self.thread = threading.Thread(target=self.run, name='frame-recorder', daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def now():
+        return int(time.time() * 1000)
+
+    def record(self, image, state=None):
+        """
+        image 可能是 FrameProvider 复用的内存, 这里复制一份
+        """
+        try:
+            self.queue.put_nowait(('frame', self.now(), image.copy(), state))
+            self.frames += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def click(self, x, y):
+        """
+        点击记在最近录的那一帧上
+        """
+        try:
+            self.queue.put_nowait(('click', self.now(), int(x), int(y)))
+        except queue.Full:
+            pass
+
+    def flush(self):
+        """
+        等队列写完并收尾当前块, 出错重启游戏前调用, 保证出错前的画面能读出来
+        """
+        self.queue.put(('flush',))
+        self.queue.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    self.finish_chunk()
+                    return
+                if item[0] == 'frame':
+                    self.write_frame(*item[1:])
+                elif item[0] == 'click':
+                    if self.index:
+                        self.index[-1]['clicks'].append(list(item[1:]))
+                elif item[0] == 'flush':
+                    self.finish_chunk()
+            except Exception as e:
+                logger.warning(f'frame recorder: {e}')
+            finally:
+                self.queue.task_done()
+
+    def write_frame(self, ts, image, state):
+        # 块满了等下一帧来了再收尾, 上一帧之后的点击还能记进去
+        if len(self.index) >= self.chunk_frames:
+            self.finish_chunk()
+        if self.zip is None:
+            self.chunk_id += 1
+            name = os.path.join(self.path, f'{CHUNK_PREFIX}{self.session}_{self.chunk_id:06d}.zip')
+            # png 已经压缩过了, zip 里直接存
+            self.zip = zipfile.ZipFile(name, 'w', zipfile.ZIP_STORED)
+        ok, data = cv2.imencode('.png', image, [cv2.IMWRITE_PNG_COMPRESSION, self.compression])
+        if not ok:
+            return
+        file = f'{ts}_{len(self.index):03d}.png'
+        self.zip.writestr(file, data.tobytes())
+        self.index.append({'ts': ts, 'file': file, 'state': state, 'clicks': []})
+
+    def finish_chunk(self):
+        if self.zip is None:
+            return
+        self.zip.writestr(INDEX_NAME, json.dumps(self.index))
+        self.zip.close()
+        self.zip = None
+        self.index = []
+        self.trim()
+
+    def trim(self):
+        """
+        超出磁盘配额时从最老的块开始删, 至少留下最新的一块
+        """
+        chunks = chunk_files(self.path)
+        sizes = [os.path.getsize(c) for c in chunks]
+        total = sum(sizes)
+        for chunk, size in zip(chunks[:-1], sizes):
+            if total <= self.max_bytes:
+                break
+            os.remove(chunk)
+            total -= size
+            logger.debug(f'remove old recording {chunk}')
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import time
+import zipfile
+
+import cv2
+import numpy as np
+
+from utils.frame_recorder import chunk_files, read_archive
+
+logger = logging.getLogger()
+
+
+class ReplayFinished(Exception):
+    """
+    回放的画面放完了
+    """
+    pass
+
+
+class FrameSource:
+    """
+    截图后端: grab() 返回 (窗口 rect, BGR 图), 和 find_lushi_window(title, raw=True) 一样
+    """
+
+    def grab(self):
+        raise NotImplementedError
+
+    def grab_into(self, out):
+        """
+        截图写进 out 这块复用的内存(形状不一致或者为 None 时新分配), 返回 (rect, 图)
+        返回的图在下一次截图时会被覆盖; 默认直接用 grab() 的结果
+        """
+        return self.grab()
+
+    def invalidate(self):
+        """
+        FrameProvider 丢掉缓存的截图时调用, 后台截图的 CaptureWorker 用它判断哪些帧算新的
+        """
+        pass
+
+    def close(self):
+        pass
+
+
+class LiveFrameSource(FrameSource):
+    """
+    实时截游戏窗口, 依赖 win32gui / Quartz, 只在 Windows 和 macOS 上能用
+    """
+
+    def __init__(self, title):
+        self.title = title
+
+    def grab(self):
+        return self.grab_into(None)
+
+    def grab_into(self, out):
+        # 用到时才 import, 回放时不需要截图相关的依赖
+        from utils.util import find_lushi_window
+        return find_lushi_window(self.title, raw=True, dst=out)
+
+
+def read_png_dir(path, interval_ms):
+    """
+    文件名是毫秒时间戳(比如 1234.png)时按时间戳, 否则按文件名顺序每 interval_ms 一帧
+    """
+    names = sorted(f for f in os.listdir(path) if f.endswith('.png'))
+    frames = []
+    for i, name in enumerate(names):
+        try:
+            ts = float(os.path.splitext(name)[0])
+        except ValueError:
+            ts = i * interval_ms
+        frames.append((ts, os.path.join(path, name)))
+    frames.sort(key=lambda x: x[0])
+    return frames
+
+
+def is_archive(path):
+    """
+    FrameRecorder 录的文件夹或者其中一个分块 zip
+    """
+    if os.path.isdir(path):
+        return bool(chunk_files(path))
+    return path.endswith('.zip')
+
+
+class ReplayFrameSource(FrameSource):
+    """
+    回放录下来的画面: png 文件夹、FrameRecorder 录的文件夹(或分块 zip)、视频文件, 用来在没有游戏的机器上跑和测速
+
+    speed 为 None 时全速回放, 每次 grab() 取下一帧;
+    否则按录制时的时间戳回放, grab() 返回回放时钟(乘以 speed)对应的最新一帧
+    """
+
+    def __init__(self, path, speed=None, loop=False, rect=None, interval_ms=100):
+        """
+        Args:
+            path: png 文件夹、FrameRecorder 的录像或者视频文件
+            speed: 回放倍速, None 为全速
+            loop: 放完后从头开始, 否则 grab() 抛 ReplayFinished
+            rect: 假装的窗口位置, 默认 (0, 0, 宽, 高)
+            interval_ms: png 文件名不是时间戳时每帧的间隔
+        """
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.rect = rect
+        self.video = None
+        # {zip 路径: 打开的 ZipFile}
+        self.zips = {}
+        if is_archive(path):
+            self.frames = [(entry['ts'], (zip_path, entry['file'])) for zip_path, entry in read_archive(path)]
+            if not self.frames:
+                raise ValueError(f'no frame found in {path}')
+        elif os.path.isdir(path):
+            self.frames = read_png_dir(path, interval_ms)
+            if not self.frames:
+                raise ValueError(f'no png found in {path}')
+        else:
+            self.frames = None
+            self.video = cv2.VideoCapture(path)
+            if not self.video.isOpened():
+                raise ValueError(f'can not open {path}')
+        # 已经读了几帧, 预读的下一帧 (时间戳, 图), 当前帧的时间戳(毫秒)和图
+        self.index = 0
+        self.pending = None
+        self.finished = False
+        self.timestamp = None
+        self.image = None
+        # 回放时钟的起点 (perf_counter, 录制时间戳)
+        self.start = None
+
+    def __len__(self):
+        if self.frames is not None:
+            return len(self.frames)
+        return int(self.video.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    def read(self):
+        """
+        读下一帧, 返回 (时间戳, 图), 放完时返回 None
+        """
+        if self.frames is not None:
+            if self.index >= len(self.frames):
+                return None
+            ts, file = self.frames[self.index]
+            image = self.load(file)
+        else:
+            ok, image = self.video.read()
+            if not ok:
+                return None
+            ts = self.video.get(cv2.CAP_PROP_POS_MSEC)
+        self.index += 1
+        return ts, image
+
+    def load(self, file):
+        if isinstance(file, str):
+            return cv2.imread(file)
+        zip_path, name = file
+        if zip_path not in self.zips:
+            self.zips[zip_path] = zipfile.ZipFile(zip_path)
+        data = np.frombuffer(self.zips[zip_path].read(name), dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+    def peek(self):
+        if self.pending is None and not self.finished:
+            self.pending = self.read()
+            self.finished = self.pending is None
+        return self.pending
+
+    def rewind(self):
+        self.index = 0
+        self.pending = None
+        self.finished = False
+        if self.video is not None:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def advance(self):
+        frame = self.peek()
+        if frame is None and self.loop and self.index > 0:
+            self.rewind()
+            frame = self.peek()
+            self.start = None
+        if frame is None:
+            raise ReplayFinished(f'{self.path} finished')
+        self.timestamp, self.image = frame
+        self.pending = None
+        if self.start is None:
+            self.start = (time.perf_counter(), self.timestamp)
+
+    def grab(self):
+        if self.speed is None or self.image is None:
+            self.advance()
+        elif self.peek() is None:
+            # 放完了: 循环时从头开始, 否则结束
+            self.advance()
+        else:
+            wall, first = self.start
+            now = first + (time.perf_counter() - wall) * 1000 * self.speed
+            while self.peek() is not None and self.peek()[0] <= now:
+                self.advance()
+        rect = self.rect
+        if rect is None:
+            rect = (0, 0, self.image.shape[1], self.image.shape[0])
+        return rect, self.image
+
+    def close(self):
+        if self.video is not None:
+            self.video.release()
+            self.video = None
+        for z in self.zips.values():
+            z.close()
+        self.zips = {}
+
+
+def make_frame_source(title, replay=None, speed=None, loop=False):
+    """
+    replay 为空时实时截图, 否则回放 replay 指向的 png 文件夹、录像或视频
+    """
+    if replay:
+        logger.info(f'replay frames from {replay}')
+        return ReplayFrameSource(replay, speed=speed, loop=loop)
+    return LiveFrameSource(title)
@@ -11,6 +11,42 @@ def get_sub_np_array(np_array, x1, y1, x2, y2):
     return roiImg
 
 
+def pil_to_bgr(image, dst=None):
+    """
+    PIL 的 RGB 截图转成 BGR; dst 形状一致时直接写进去, 不另外分配
+    np.asarray 不会把 PIL 导出的数据再复制一遍, cvtColor 直接从它转换
+    """
+    return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR, dst=dst)
+
+
+def pil_to_gray(image, dst=None):
+    # 截图是 RGB, 按 RGB 转灰度; 和 imread 读进来(BGR)的图标按 BGR 转灰度是同一个公式
+    return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY, dst=dst)
+
+
+def get_search_region(screen, icon, region):
+    """
+    把配置里的搜索区域裁剪到截图范围内, 返回 [x1, y1, x2, y2]
+    区域没配置、格式不对或者放不下图标时返回 None, 调用方应改为全图搜索
+    Args:
+        screen: 截图
+        icon: 图标
+        region: [left_x, top_y, right_x, bottom_y]
+    """
+    if region is None:
+        return None
+    try:
+        x1, y1, x2, y2 = [int(v) for v in region]
+    except (TypeError, ValueError):
+        return None
+    h, w = screen.shape[:2]
+    x1, y1 = max(x1, 0), max(y1, 0)
+    x2, y2 = min(x2, w), min(y2, h)
+    if x2 - x1 < icon.shape[1] or y2 - y1 < icon.shape[0]:
+        return None
+    return [x1, y1, x2, y2]
+
+
 def img_rotaion(img, left=True):
     return np.rot90(img, 3)
     # 获取输入图像的信息，生成旋转操作所需的参数（padding: 指定零填充的宽度； canter: 指定旋转的轴心坐标）
@@ -188,3 +224,132 @@ def get_dark_brown_lines(img, minRad = 10, maxRad = 110):
     # cv2.imwrite("test_boss_check_6.png", img)
 
     return lines
+
+
+def resize_for_pyramid(img, scale):
+    return cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+# {id(icon): (icon, scale, 粗匹配分数)}
+_pyramid_expected = {}
+
+
+def get_pyramid_expected(icon, scale):
+    """
+    图标原样出现在截图里时, 缩小后粗匹配能拿到的最低分数
+    细线条、小字的图标缩小后分数会掉很多, 粗匹配的阈值要按这个分数打折
+    """
+    cached = _pyramid_expected.get(id(icon))
+    if cached is not None and cached[0] is icon and cached[1] == scale:
+        return cached[2]
+    step = int(np.ceil(1 / scale))
+    canvas = cv2.copyMakeBorder(icon, step * 2, step * 2, step * 2, step * 2, cv2.BORDER_REPLICATE)
+    small_icon = resize_for_pyramid(icon, scale)
+    expected = 1
+    # 图标在截图里的位置不一定是 1 / scale 的整数倍, 每种偏移都试一下
+    for dy in range(step):
+        for dx in range(step):
+            small = resize_for_pyramid(canvas[dy:, dx:], scale)
+            if small.shape[0] < small_icon.shape[0] or small.shape[1] < small_icon.shape[1]:
+                continue
+            _, val, _, _ = cv2.minMaxLoc(cv2.matchTemplate(small, small_icon, cv2.TM_CCOEFF_NORMED))
+            expected = min(expected, val)
+    _pyramid_expected[id(icon)] = (icon, scale, expected)
+    return expected
+
+
+def pyramid_match(screen, icon, confidence, scale=0.5, peaks=3, band=0.2, small_screen=None, small_icon=None):
+    """
+    先在缩小的图上粗匹配找候选点, 再回到原图只在候选点附近精确匹配, 结果和全图 TM_CCOEFF_NORMED 一致
+    粗匹配的阈值按 get_pyramid_expected 打折, 分数落在 [阈值 - band, 阈值) 之间无法判断时, 退回原图全图匹配
+    Args:
+        scale: 缩放比例, 0.5 或 0.25
+        peaks: 精确匹配的候选点个数
+        small_screen, small_icon: 已经缩小过的图, 同一帧匹配多个图标时可以复用
+    Returns:
+        (max_val, (x, y)), (x, y) 为原图上的左上角; 粗匹配就确定没有时 (x, y) 为 None
+    """
+    ih, iw = icon.shape[:2]
+    # 图标太小, 缩小后没有特征了, 直接全图匹配
+    if min(ih, iw) * scale < 8:
+        return full_match(screen, icon)
+    if small_screen is None:
+        small_screen = resize_for_pyramid(screen, scale)
+    if small_icon is None:
+        small_icon = resize_for_pyramid(icon, scale)
+    sh, sw = small_icon.shape[:2]
+    if sh > small_screen.shape[0] or sw > small_screen.shape[1]:
+        return full_match(screen, icon)
+    high = confidence * get_pyramid_expected(icon, scale)
+    low = high - band
+    result = cv2.matchTemplate(small_screen, small_icon, cv2.TM_CCOEFF_NORMED)
+    _, coarse_val, _, _ = cv2.minMaxLoc(result)
+    if coarse_val < low:
+        # 粗匹配都差得很远, 肯定没有
+        return coarse_val, None
+    if coarse_val < high:
+        return full_match(screen, icon)
+
+    h, w = screen.shape[:2]
+    # 缩放带来的位置误差
+    pad = int(np.ceil(1 / scale)) + 2
+    best_val, best_loc = -1, None
+    for _ in range(peaks):
+        _, val, _, (cx, cy) = cv2.minMaxLoc(result)
+        if val < low:
+            break
+        # 抑制这个峰附近的点, 找下一个候选
+        result[max(cy - sh // 2, 0):cy + sh // 2 + 1, max(cx - sw // 2, 0):cx + sw // 2 + 1] = -1
+        x1, y1 = max(int(cx / scale) - pad, 0), max(int(cy / scale) - pad, 0)
+        x2, y2 = min(int(cx / scale) + iw + pad, w), min(int(cy / scale) + ih + pad, h)
+        if x2 - x1 < iw or y2 - y1 < ih:
+            continue
+        val, loc = full_match(screen[y1:y2, x1:x2], icon)
+        if val > best_val:
+            best_val, best_loc = val, (x1 + loc[0], y1 + loc[1])
+    del result
+    if best_val > confidence:
+        return best_val, best_loc
+    # 粗匹配看着像, 精确匹配却没找到, 全图再确认一次
+    return full_match(screen, icon)
+
+
+def full_match(screen, icon):
+    result = cv2.matchTemplate(screen, icon, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    del result
+    return max_val, max_loc
+
+
+def match_icon(screen, icon, confidence, region=None, pyramid=False):
+    """
+    Args:
+        region: get_search_region 的结果, 只在这个区域里找
+    Returns:
+        (max_val, (x, y)), (x, y) 为截图上的左上角, 粗匹配就确定没有时为 None
+    """
+    x1, y1 = 0, 0
+    if region is not None:
+        x1, y1 = region[0], region[1]
+        screen = get_sub_np_array(screen, *region)
+    if pyramid:
+        max_val, loc = pyramid_match(screen, icon, confidence)
+    else:
+        max_val, loc = full_match(screen, icon)
+    if loc is None:
+        return max_val, None
+    return max_val, (x1 + loc[0], y1 + loc[1])
+
+
+def find_icon_location(lushi, icon, confidence, region=None, pyramid=False):
+    # region: [left_x, top_y, right_x, bottom_y], 只在这个区域里找, 没配置或无效时全图找
+    # pyramid: 先缩小一半粗匹配, 再在候选点附近精确匹配
+    region = get_search_region(lushi, icon, region)
+    maxVal, maxLoc = match_icon(lushi, icon, confidence, region, pyramid)
+    if maxVal > confidence:
+        (startX, startY) = maxLoc
+        endX = startX + icon.shape[1]
+        endY = startY + icon.shape[0]
+        return True, (startX + endX) // 2, (startY + endY) // 2, maxVal
+    else:
+        return False, None, None, maxVal
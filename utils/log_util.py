@@ -1,73 +1,263 @@
+import io
 import logging
-from hearthstone.enums import CardType, Zone, GameTag
+import mmap
+import os
+from hearthstone.enums import BlockType, CardType, Zone, GameTag
 from hslog import LogParser, packets
 from hslog.export import EntityTreeExporter
 from entity.game_entity import GameEntity
 from entity.hero_entity import HeroEntity
+from entity.card_registry import get_spell_class
+from entity.mercenary_index import find_tier
 from entity.spell_entity import SpellEntity
 
-# import entity.cards as ecards
-
 logger = logging.getLogger()
 
+# 用于判断日志是否被轮换(游戏重启后 Power.log 会被重新创建)
+HEAD_SIZE = 256
+# 每场对局的开头
+CREATE_GAME = b'GameState.DebugPrintPower() - CREATE_GAME'
+# 会改动 entity 的 packet, CREATE_GAME 会创建游戏 entity
+ENTITY_PACKETS = (packets.CreateGame, packets.TagChange, packets.FullEntity, packets.ShowEntity, packets.HideEntity,
+                  packets.ChangeEntity)
+# 后面跟着 tag 列表(CREATE_GAME 还有 Player)的 packet
+ENTITY_DEFINITIONS = (packets.CreateGame, packets.FullEntity, packets.ShowEntity, packets.ChangeEntity)
+# 同一批变化里按 游戏 -> 随从 -> 技能 的顺序处理
+APPLY_ORDER = {CardType.GAME: 0, CardType.MINION: 1, CardType.LETTUCE_ABILITY: 2}
+
+
+def find_last_game_offset(f):
+    """
+    倒着搜索最后一个 CREATE_GAME, 返回所在行的起始字节位置, 没找到返回 0
+    Args:
+        f: 以 'rb' 打开的日志文件
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        return 0
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = mm.rfind(CREATE_GAME)
+        if pos < 0:
+            return 0
+        return mm.rfind(b'\n', 0, pos) + 1
+
+
+class IncrementalExporter(EntityTreeExporter):
+    """
+    block 里的子 packet 由 LogUtil.export_new 按游标逐个 export, 这里只处理 block 本身(GAME_RESET)
+    """
+
+    def handle_block(self, packet):
+        if packet.type == BlockType.GAME_RESET:
+            self.game.reset()
+
 
 class LogUtil:
-    def __init__(self, log_path):
+    def __init__(self, log_path, tail=False):
         self.log_path = log_path
+        # tail 模式: parser 常驻, 每次只读取新追加的行
+        self.tail = tail
+        # 冷启动时跳过之前的对局, 只解析最后一场
+        self.skip_old_games = True
+        self.parser = LogParser()
+        # 已经喂给 parser 的字节位置
+        self.offset = 0
+        # 文件开头的内容, 用来识别日志被重建
+        self.head = b''
+        self.reset_game()
+
+    def reset(self):
         self.parser = LogParser()
+        self.offset = 0
+        self.head = b''
+        self.reset_game()
+
+    def reset_game(self):
         self.game = None
         # parse 完后可直接拿来用
         self.game_entity = None
+        self.packet_tree = None
+        self.exporter = None
+        # 每个 packet 列表已经 export 到的位置 {id(list): index}
+        self.cursors = {}
+        # 本次读取中被 packet 改动过的 entity_id
+        self.touched = set()
+        # 所有技能 {entity_id: SpellEntity}
+        self.spell_entities = {}
+        # 主人还没出现的技能
+        self.orphan_spells = set()
+        # 上次读取后发生变化的英雄和技能
+        self.dirty = {}
+
+    def is_rotated(self, f, size):
+        """
+        日志被截断或重新创建(游戏重启)时返回 True
+        """
+        if size < self.offset:
+            return True
+        if self.head:
+            f.seek(0)
+            return f.read(len(self.head)) != self.head
+        return False
+
+    def feed(self, f, size):
+        """
+        从 self.offset 开始读取到最后一个完整行, 喂给 parser
+        """
+        if size <= self.offset:
+            return 0
+        f.seek(self.offset)
+        data = f.read(size - self.offset)
+        # 最后一行可能还没写完, 留到下次再读
+        end = data.rfind(b'\n') + 1
+        if end <= 0:
+            return 0
+        self.parser.read(io.StringIO(data[:end].decode('utf-8'), newline=None))
+        # 实体的 tag 行可能跨两次读取, tail 模式下不能提前 flush
+        if not self.tail:
+            self.parser.flush()
+        self.offset += end
+        if len(self.head) < HEAD_SIZE:
+            f.seek(0)
+            self.head = f.read(min(self.offset, HEAD_SIZE))
+        return end
 
     def read_log(self):
-        with open(self.log_path, encoding='utf-8') as f:
-            self.parser.read(f)
-        self.parser.flush()
+        if not self.tail:
+            self.reset()
+        with open(self.log_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if self.is_rotated(f, size):
+                logger.info(f'{self.log_path} rotated, reset parser')
+                self.reset()
+            if self.offset == 0 and self.skip_old_games:
+                self.offset = find_last_game_offset(f)
+            self.feed(f, size)
         # 最近一场战斗
         packet_tree = self.parser.games[-1]
-        exporter = EntityTreeExporter(packet_tree, player_manager=self.parser.player_manager)
-        ee = exporter.export()
-        self.game = ee.game
+        # 只保留最近一场, 避免长时间挂机内存一直涨
+        del self.parser.games[:-1]
+        if packet_tree is not self.packet_tree:
+            self.reset_game()
+            self.packet_tree = packet_tree
+            self.exporter = IncrementalExporter(packet_tree, player_manager=self.parser.player_manager)
+        # 只 export 新增的 packet, entity 的 tag 会在原对象上更新
+        self.export_new(packet_tree.packets)
+        self.game = self.exporter.game
 
-    def parse_game(self) -> GameEntity:
-        self.read_log()
-        for e in self.game.entities:
+    def export_new(self, packet_list, closed=False):
+        """
+        closed: packet_list 所在的 block 已经结束, 后面不会再有新的 packet
+        """
+        start = self.cursors.get(id(packet_list), 0)
+        end = len(packet_list)
+        # tail 模式下最后一个 FULL_ENTITY / SHOW_ENTITY 的 tag 可能还没写完, 下次再 export
+        if self.tail and not closed and end and isinstance(packet_list[-1], ENTITY_DEFINITIONS):
+            end -= 1
+        for i in range(start, end):
+            packet = packet_list[i]
+            if isinstance(packet, packets.Block):
+                # 第一次遇到这个 block 时交给 exporter, 子 packet 之后按游标 export
+                if id(packet.packets) not in self.cursors:
+                    self.exporter.export_packet(packet)
+                    if packet.type == BlockType.GAME_RESET:
+                        self.touched.update(e.id for e in self.exporter.game.entities)
+                # 后面已经有别的 packet 的 block 也结束了
+                self.export_new(packet.packets, closed or packet.ended or i < len(packet_list) - 1)
+                continue
+            self.exporter.export_packet(packet)
+            if isinstance(packet, ENTITY_PACKETS) and isinstance(packet.entity, int):
+                self.touched.add(packet.entity)
+        cursor = end
+        # 最后一个 block 可能还没结束, 下次还要进去看看有没有新的子 packet
+        if cursor and isinstance(packet_list[cursor - 1], packets.Block):
+            cursor -= 1
+        self.cursors[id(packet_list)] = cursor
+
+    def apply_changes(self):
+        """
+        只更新本次有变化的 entity 对应的 GameEntity / HeroEntity / SpellEntity
+        """
+        entities = [self.game.find_entity_by_id(eid) for eid in self.touched]
+        self.touched = set()
+        entities = [e for e in entities if e is not None and e.type in APPLY_ORDER]
+        entities.sort(key=lambda e: (APPLY_ORDER[e.type], e.id))
+        zone_changed = False
+        for e in entities:
             # 以下为游戏状态
             if e.type == CardType.GAME:
-
-                # print(e, e.tags, end='\n\n\n')
-                # player = e.players
-                # for p in player:
-                #     print(p.tags, end='\n\n')
-                self.game_entity = GameEntity(e)
-                pass
+                if self.game_entity is None or self.game_entity.entity is not e:
+                    self.game_entity = GameEntity(e)
+                else:
+                    self.game_entity.parse_entity()
+            elif self.game_entity is None:
+                continue
             elif e.type == CardType.MINION:
-                minion = HeroEntity(e)
-                # print(e, e.tags, end='\n\n\n')
-                self.game_entity.add_hero(minion)
-                pass
+                hero = self.game_entity.hero_entities.get(e.id)
+                if hero is None:
+                    hero = HeroEntity(e)
+                    self.game_entity.add_hero(hero)
+                else:
+                    old = (hero.zone, hero.controller, hero.zone_position)
+                    hero.parse_entity()
+                    zone_changed |= old != (hero.zone, hero.controller, hero.zone_position)
+                self.dirty[hero.entity_id] = hero
             # 佣兵技能信息
             elif e.type == CardType.LETTUCE_ABILITY:
-                # print(e, e.tags, end='\n\n\n')
-                owner = e.tags.get(GameTag.LETTUCE_ABILITY_OWNER)
-                # print(e.card_id)
-                if owner in self.game_entity.hero_entities.keys():
-                    # hcid = self.game_entity.hero_entities[owner].card_id[:-3]
-                    # cid = e.card_id[:-3]
-                    # cname = 'ecards.' + hcid + '.' + cid + '.' + cid + '(e)'
-                    # print(cname)
-                    # try:
-                    #     spell_entity = eval(cname)
-                    # except Exception as ex:
-                    #     logger.warning(ex)
-                    spell_entity = SpellEntity(e)
-                    # spell_entity = SpellEntity(e)
-                    self.game_entity.hero_entities[owner].add_spell(spell_entity)
-                pass
-            # 对战技能记录
-            elif e.type == CardType.SPELL:
-                # print(e, e.tags, end='\n\n\n')
-                pass
+                spell = self.spell_entities.get(e.id)
+                if spell is None:
+                    self.orphan_spells.add(e.id)
+                else:
+                    spell.parse_entity()
+                    self.dirty[spell.entity_id] = spell
+        if zone_changed:
+            self.game_entity.refresh_hero_list()
+        if self.game_entity is not None:
+            self.add_orphan_spells()
+
+    def add_orphan_spells(self):
+        for eid in sorted(self.orphan_spells):
+            e = self.game.find_entity_by_id(eid)
+            owner = e.tags.get(GameTag.LETTUCE_ABILITY_OWNER)
+            if owner not in self.game_entity.hero_entities.keys():
+                continue
+            self.orphan_spells.discard(eid)
+            spell_entity = self.new_spell(e)
+            hero = self.game_entity.hero_entities[owner]
+            try:
+                hero.add_spell(spell_entity)
+            except Exception as ex:
+                # 装备找不到要强化的技能之类, 当成普通技能
+                logger.warning(f'add spell {e.card_id} failed: {ex}')
+                if spell_entity not in hero.spell:
+                    hero.spell.append(spell_entity)
+            self.spell_entities[eid] = spell_entity
+            self.dirty[spell_entity.entity_id] = spell_entity
+
+    @staticmethod
+    def new_spell(e) -> SpellEntity:
+        """
+        按 card_id 创建具体卡牌的技能类, 模拟时才有卡牌自己的效果
+        """
+        cls = get_spell_class(e.card_id)
+        if cls is SpellEntity:
+            logger.debug(f'no card class for {e.card_id}: {find_tier(e.card_id)}')
+        try:
+            return cls(e)
+        except Exception as ex:
+            logger.warning(f'create spell {e.card_id} failed: {ex}')
+            return SpellEntity(e)
+
+    def get_dirty_entities(self):
+        """
+        上次调用之后有变化的英雄和技能 {entity_id: HeroEntity / SpellEntity}
+        """
+        dirty = self.dirty
+        self.dirty = {}
+        return dirty
+
+    def parse_game(self) -> GameEntity:
+        self.read_log()
+        self.apply_changes()
 
         # for h in self.game_entity.my_hero:
         #     if h.card_id[:-3] not in HEROS.keys():
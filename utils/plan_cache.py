@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger()
+
+PLAN_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+                               'logs', 'plan_cache.db')
+
+
+def board_signature(my_hero, enemy_hero, stratege=''):
+    """
+    局面签名: 我方 (card_id, 各技能冷却, 血量), 敌方 (card_id, 血量, 颜色, 免疫, 隐身, 嘲讽), 再加上战斗策略
+    同一个悬赏用同一套阵容反复刷, 开局的签名基本一样; 免疫、隐身、嘲讽决定哪些敌人能选为目标
+    """
+    my = [[h.card_id, [s.lettuce_current_cooldown for s in h.spell], h.get_health()] for h in my_hero]
+    enemy = [[h.card_id, h.get_health(), h.lettuce_role, h.immune, h.stealth, h.taunt] for h in enemy_hero]
+    return json.dumps([stratege, my, enemy], separators=(',', ':'))
+
+
+def plan_targets_valid(plan, enemy_hero):
+    """
+    缓存的方案用之前再检查一遍: 每个目标都在场上, 并且没有免疫、隐身(和 BattleAi.battle 的过滤一样)
+    """
+    return all(isinstance(t, int) and 0 <= t < len(enemy_hero) and
+               enemy_hero[t].immune <= 0 and enemy_hero[t].stealth <= 0 for t in plan)
+
+
+class PlanCache:
+    """
+    战斗方案的磁盘缓存 {局面签名: 方案}, 用 sqlite 保存在 logs/plan_cache.db
+    每次用过之后记录结果, 试过 min_tries 次以上且成功率低于 min_win_rate 的方案删掉重新算
+    """
+
+    def __init__(self, path=PLAN_CACHE_PATH, min_tries=3, min_win_rate=0.5):
+        self.path = path
+        self.min_tries = min_tries
+        self.min_win_rate = min_win_rate
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS plans ('
+                          'signature TEXT PRIMARY KEY, plan TEXT NOT NULL, '
+                          'wins INTEGER NOT NULL DEFAULT 0, losses INTEGER NOT NULL DEFAULT 0, '
+                          'updated REAL NOT NULL)')
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, signature):
+        row = self.conn.execute('SELECT plan FROM plans WHERE signature = ?', (signature,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, signature, plan):
+        self.conn.execute('INSERT OR REPLACE INTO plans (signature, plan, updated) VALUES (?, ?, ?)',
+                          (signature, json.dumps(plan), time.time()))
+        self.conn.commit()
+
+    def record(self, signature, won):
+        """
+        记录方案用过之后的结果, 成功率太低就删掉
+        """
+        column = 'wins' if won else 'losses'
+        self.conn.execute(f'UPDATE plans SET {column} = {column} + 1, updated = ? WHERE signature = ?',
+                          (time.time(), signature))
+        row = self.conn.execute('SELECT wins, losses FROM plans WHERE signature = ?', (signature,)).fetchone()
+        if row is not None:
+            wins, losses = row
+            tries = wins + losses
+            if tries >= self.min_tries and wins / tries < self.min_win_rate:
+                self.conn.execute('DELETE FROM plans WHERE signature = ?', (signature,))
+                self.evictions += 1
+                logger.info(f'evict plan with {wins}/{tries} wins')
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM plans').fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import os
+
+import cv2
+
+from utils.images import get_search_region, get_sub_np_array, full_match, pyramid_match, resize_for_pyramid
+
+
+class StateClassifier:
+    """
+    对同一帧图匹配所有状态图标, 按置信度从高到低返回结果, 代替对每个状态各截一次图、各调一次 check_in_screen。
+    matchTemplate 还是每个图标调一次, 省下的是截图和转灰度;
+    配置了同一区域的图标共用裁剪出来的图, 金字塔模式下也共用它的缩小图。
+    配置了区域的图标平时只在区域里找; full_frame 时区域里没找到再全图找一次, 防止区域配错了一直认不出来,
+    这个比较慢, 由调用方定期做(比如 StateScheduler 的全量检查)
+    """
+
+    def __init__(self, icons, states, confidence, regions=None, pyramid=False, scale=0.5):
+        """
+        Args:
+            icons: {名字: 灰度图标}, 即 Agent.icons
+            states: 参与识别的状态, 顺序即置信度相同时的优先级
+            confidence: 匹配阈值, 同 find_icon_location
+            regions: {名字: [left_x, top_y, right_x, bottom_y]}, 即 locs 里的 icon_regions
+            pyramid: 先在缩小 scale 倍的图上粗匹配, 再回原图精确匹配
+        """
+        self.confidence = confidence
+        self.regions = regions or {}
+        self.pyramid = pyramid
+        self.scale = scale
+        self.templates = [(name, icons[name]) for name in states if name in icons]
+        self.icons = dict(self.templates)
+        # 缩小后的图标只算一次
+        self.small_icons = {}
+        if pyramid:
+            self.small_icons = {name: resize_for_pyramid(icon, scale) for name, icon in self.templates}
+
+    @classmethod
+    def from_folder(cls, img_folder, states, confidence, regions=None):
+        icons = {}
+        folder = os.path.join(img_folder, 'icons')
+        for img in os.listdir(folder):
+            if not img.endswith('.png'):
+                continue
+            icons[img.split('.')[0]] = cv2.cvtColor(cv2.imread(os.path.join(folder, img)), cv2.COLOR_BGR2GRAY)
+        return cls(icons, states, confidence, regions)
+
+    def score(self, screen, names=None, full_frame=False):
+        """
+        对所有图标打分, 返回 [(name, conf, (x, y)), ...], 按 conf 从高到低排序
+        Args:
+            screen: 灰度截图
+            names: 只对这些状态打分, 默认全部
+            full_frame: 区域里没找到的图标再全图找一次
+        """
+        crops = {'screen': screen}
+        scores = []
+        for name, icon in self.templates:
+            if names is not None and name not in names:
+                continue
+            s = self.score_one(crops, name, icon, full_frame)
+            if s is not None:
+                scores.append(s)
+        # sort 是稳定的, 置信度相同时保持 states 的顺序
+        scores.sort(key=lambda s: -s[1])
+        return scores
+
+    def classify(self, screen, names=None, full_frame=False):
+        """
+        只返回超过阈值的匹配, 第一个即当前最可能的状态
+        """
+        return [s for s in self.score(screen, names, full_frame) if s[1] > self.confidence]
+
+    def first_match(self, screen, names):
+        """
+        按 names 的顺序逐个匹配, 命中第一个超过阈值的就停
+        Returns:
+            (match, count), match 为 (name, conf, (x, y)) 或 None, count 为实际匹配的图标数
+        """
+        crops = {'screen': screen}
+        count = 0
+        for name in names:
+            icon = self.icons.get(name)
+            if icon is None:
+                continue
+            count += 1
+            s = self.score_one(crops, name, icon)
+            if s is not None and s[1] > self.confidence:
+                return s, count
+        return None, count
+
+    def get_crop(self, crops, region):
+        """
+        截图在 region 里的部分和它的缩小图(不是金字塔模式时为 None), 同一帧上同一区域只裁剪、缩小一次
+        Args:
+            crops: 这一帧的缓存, {'screen': 截图, 区域: (图, 缩小图)}
+            region: get_search_region 的结果, None 为全图
+        """
+        key = None if region is None else tuple(region)
+        crop = crops.get(key)
+        if crop is None:
+            screen = crops['screen']
+            sub = screen if region is None else get_sub_np_array(screen, *region)
+            crop = (sub, resize_for_pyramid(sub, self.scale) if self.pyramid else None)
+            crops[key] = crop
+        return crop
+
+    def score_one(self, crops, name, icon, full_frame=False):
+        screen = crops['screen']
+        h, w = screen.shape[:2]
+        ih, iw = icon.shape[:2]
+        # 图标比截图还大(比如窗口被缩小)时直接跳过
+        if ih > h or iw > w:
+            return None
+        # 配置了区域的图标只在区域里找, 区域无效时全图找
+        region = get_search_region(screen, icon, self.regions.get(name))
+        if region is not None:
+            s = self.match(self.get_crop(crops, region), name, icon, region[0], region[1])
+            if s[1] > self.confidence or not full_frame:
+                return s
+        return self.match(self.get_crop(crops, None), name, icon, 0, 0)
+
+    def match(self, crop, name, icon, x1, y1):
+        sub, small_sub = crop
+        ih, iw = icon.shape[:2]
+        if self.pyramid:
+            max_val, loc = pyramid_match(sub, icon, self.confidence, self.scale,
+                                         small_screen=small_sub, small_icon=self.small_icons[name])
+        else:
+            max_val, loc = full_match(sub, icon)
+        if loc is None:
+            return name, max_val, (None, None)
+        x, y = loc
+        return name, max_val, (x1 + x + iw // 2, y1 + y + ih // 2)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+
+logger = logging.getLogger()
+
+TRANSITIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+                                'logs', 'state_transitions.json')
+
+
+class StateScheduler:
+    """
+    根据跑过的状态转移次数, 决定下一个 tick 先检查哪些状态:
+    上一个状态之后最常出现的状态排在前面, 命中一个就停;
+    前几个都没命中时, 每隔 full_scan_every 个 tick 做一次全量检查兜底
+    """
+
+    def __init__(self, states, path=TRANSITIONS_PATH, top_n=5, full_scan_every=5, save_every=20):
+        """
+        Args:
+            states: 全部状态, 没有统计数据时按这个顺序
+            path: 转移次数表保存的位置
+            top_n: 每个 tick 优先检查的状态数
+            full_scan_every: 多少个 tick 至少做一次全量检查
+            save_every: 记录多少次转移后写一次文件
+        """
+        self.states = list(states)
+        self.path = path
+        self.top_n = top_n
+        self.full_scan_every = full_scan_every
+        self.save_every = save_every
+        # {上一个状态: {下一个状态: 次数}}
+        self.transitions = {}
+        self.unsaved = 0
+        # 距离上一次全量检查的 tick 数
+        self.since_full_scan = 0
+        # 统计每个 tick 平均匹配了多少个图标
+        self.ticks = 0
+        self.templates = 0
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.transitions = json.load(f)
+        except Exception as e:
+            logger.warning(f'load {self.path} failed: {e}')
+            self.transitions = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.transitions, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.unsaved = 0
+
+    def record(self, prev, state):
+        counts = self.transitions.setdefault(prev or '', {})
+        counts[state] = counts.get(state, 0) + 1
+        self.unsaved += 1
+        if self.unsaved >= self.save_every:
+            self.save()
+
+    def order(self, prev):
+        """
+        按 prev 之后出现的次数从多到少排序所有状态, 次数相同时保持 states 的顺序
+        """
+        counts = self.transitions.get(prev or '', {})
+        return sorted(self.states, key=lambda s: -counts.get(s, 0))
+
+    def likely(self, prev):
+        """
+        本 tick 优先检查的状态, 没有统计数据时返回 None 表示直接全量检查
+        """
+        counts = self.transitions.get(prev or '', {})
+        if not counts:
+            return None
+        return self.order(prev)[:self.top_n]
+
+    def need_full_scan(self):
+        return self.since_full_scan >= self.full_scan_every
+
+    def tick(self, templates, full_scan):
+        """
+        每个 tick 结束时调用
+        Args:
+            templates: 本 tick 匹配的图标数
+            full_scan: 本 tick 是否做了全量检查
+        """
+        self.ticks += 1
+        self.templates += templates
+        self.since_full_scan = 0 if full_scan else self.since_full_scan + 1
+
+    def avg_templates(self):
+        return self.templates / self.ticks if self.ticks else 0
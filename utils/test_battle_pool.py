@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from utils.battle_ai import BattleAi
+from utils.battle_pool import ParallelSearch, RolloutEngine, RolloutStats
+from utils.test_entity_clone import build_game
+from utils.transposition import plan_key
+
+
+def build_random_game():
+    game = build_game()
+    # 第一个佣兵的大招改成随机打两个敌人
+    game.my_hero[0].spell[1].range = -2
+    return game
+
+
+class TestBattlePool(unittest.TestCase):
+
+    def test_stats(self):
+        stats = RolloutStats(())
+        stats.add([1, 2, 3, 4])
+        self.assertEqual(2.5, stats.mean)
+        self.assertAlmostEqual(5 / 3, stats.variance())
+
+    def test_same_seeds_same_result(self):
+        game = build_random_game()
+        ai = BattleAi.from_game(game)
+        with redirect_stdout(io.StringIO()):
+            ai.battle_rollout(RolloutEngine(workers=0, rollouts=16, budget_ms=60 * 1000))
+        engine = RolloutEngine(workers=0, rollouts=16, budget_ms=60 * 1000)
+        plans = [(1, 3, 4), (1, 3, 5), (1, 2, 4)]
+        first = [(s.plan, s.n, s.mean) for s in engine.evaluate(game, plans)]
+        second = [(s.plan, s.n, s.mean) for s in engine.evaluate(game, plans)]
+        self.assertEqual(first, second)
+        # 原对局不受模拟影响
+        self.assertTrue(all(h.damage == 0 for h in game.hero_entities.values()))
+        self.assertEqual(3, len(ai.action))
+
+    def test_search_is_deterministic(self):
+        game = build_random_game()
+        scores = []
+        for _ in range(3):
+            ai = BattleAi.from_game(game)
+            with redirect_stdout(io.StringIO()):
+                ai.battle2()
+            scores.append((ai.score, plan_key(ai.action)))
+        self.assertEqual(1, len(set(scores)))
+        # 没有随机数时假设打血量最高的两个
+        enemy = game.enemy_hero
+        enemy[0].damage = 5
+        self.assertEqual([enemy[2], enemy[1]], game.pick_targets(enemy, 2))
+
+    def test_parallel_same_as_battle2(self):
+        game = build_game()
+        ai = BattleAi.from_game(game)
+        with redirect_stdout(io.StringIO()):
+            action = ai.battle2()
+        search = ParallelSearch(workers=2)
+        self.addCleanup(search.close)
+        self.assertGreater(len(search.split(game)), 1)
+        parallel = BattleAi.from_game(game)
+        parallel.battle_parallel(search)
+        self.assertEqual(ai.score, parallel.score)
+        self.assertEqual(plan_key(action), plan_key(parallel.action))
+
+    def test_parallel_no_available_spell(self):
+        game = build_game()
+        for spell in game.my_hero[0].spell:
+            spell.lettuce_current_cooldown = 1
+        ai = BattleAi.from_game(game)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual([], ai.battle2())
+        for workers in (0, 2):
+            search = ParallelSearch(workers=workers)
+            self.addCleanup(search.close)
+            self.assertEqual([[]], search.split(game))
+            self.assertEqual((), search.search(game)[1])
+            self.assertEqual([], BattleAi.from_game(game).battle_parallel(search))
+
+    def test_parallel_targets(self):
+        game = build_game()
+        ai = BattleAi.from_game(game)
+        with redirect_stdout(io.StringIO()):
+            action = ai.battle2()
+        enemy = {h.entity_id: i for i, h in enumerate(game.enemy_hero)}
+        expected = [enemy[a.target.entity_id] for a in sorted(action, key=lambda a: game.my_hero.index(a.hero))]
+        search = ParallelSearch(workers=0)
+        self.assertEqual(expected, BattleAi.from_game(game).battle_parallel_targets(search, [9, 9, 9]))
+        # 穷举不管隐身, 选了隐身目标的英雄还用原来的目标
+        game.enemy_hero[expected[0]].stealth = 1
+        self.assertEqual(9, BattleAi.from_game(game).battle_parallel_targets(search, [9, 9, 9])[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from entity.cards.LETL_034H.LETL_034P3 import LETL_034P3
+from entity.spell_entity import SpellEntity
+from utils.battle_ai import BattleAi
+from utils.test_entity_clone import build_game
+from utils.transposition import TranspositionTable
+
+
+class TestBattleSearch(unittest.TestCase):
+
+    def battle2(self, budget_ms, transposition=None, game=None):
+        ai = BattleAi.from_game(game or build_game())
+        with redirect_stdout(io.StringIO()):
+            action = ai.battle2(budget_ms, transposition)
+        return ai, action
+
+    def test_same_best_as_exhaustive(self):
+        exhaustive, _ = self.battle2(None)
+        anytime, action = self.battle2(60 * 1000)
+        self.assertEqual(exhaustive.score, anytime.score)
+        self.assertEqual(3, len(action))
+
+    def test_custom_play_not_pruned(self):
+        # 只剩一个敌人时上限很紧; 先祖勾拳的 damage 是 0, 实际按攻击力打
+        game = build_game()
+        for e in game.enemy_hero[1:]:
+            del game.hero_entities[e.entity_id]
+        del game.enemy_hero[1:]
+        enemy = game.enemy_hero[0]
+        enemy.max_health = 100
+        for spell in enemy.spell:
+            spell.damage = 0
+        for hero in game.my_hero[1:]:
+            for spell in hero.spell:
+                spell.damage = 0
+        hero = game.my_hero[0]
+        hero.atk = 40
+        spell = LETL_034P3(None)
+        spell.entity_id = 100
+        spell.cost = 3
+        spell.lettuce_role = hero.lettuce_role
+        hero.add_spell(spell)
+
+        exhaustive, _ = self.battle2(None, game=game)
+        anytime, action = self.battle2(60 * 1000, game=game)
+        self.assertEqual(exhaustive.score, anytime.score)
+        self.assertIn(100, [a.spell.entity_id for a in action])
+
+    def test_plan_when_out_of_time(self):
+        # 时间用完也会先找到一个方案
+        ai, action = self.battle2(0)
+        self.assertEqual(1, ai.leaves)
+        self.assertEqual(3, len(action))
+
+    def test_transposition(self):
+        game = build_game()
+        exhaustive, action = self.battle2(None, game=game)
+        # 一次穷举里, 出手顺序前几步相同的方案从已经模拟过的局面接着打
+        table = TranspositionTable()
+        cached, cached_action = self.battle2(None, table, game)
+        self.assertEqual(exhaustive.score, cached.score)
+        self.assertEqual([(a.spell.entity_id, a.target.entity_id) for a in action],
+                         [(a.spell.entity_id, a.target.entity_id) for a in cached_action])
+        stats = table.stats()
+        self.assertGreater(stats['hits'], 0)
+        self.assertEqual(exhaustive.leaves, cached.leaves)
+
+        # 迭代加深每一层都会重复模拟上一层的方案
+        table = TranspositionTable()
+        anytime, _ = self.battle2(60 * 1000, table, game)
+        self.assertEqual(exhaustive.score, anytime.score)
+        stats = table.stats()
+        self.assertGreater(stats['hits'], 0)
+
+        # 同一回合再搜一次全部命中
+        self.battle2(None, table, game)
+        self.assertEqual(0, table.stats()['misses'] - stats['misses'])
+
+        # 换回合后清空, 不会用到上一回合的局面
+        game.turn += 1
+        self.battle2(None, table, game)
+        self.assertEqual(cached.transposition.stats()['misses'], table.stats()['misses'])
+
+    def test_transposition_reads_plan(self):
+        # 技能读了整个方案, 打完以后的局面和还没打出的动作有关, 不能给别的方案接着用
+        game = build_game()
+        combo = game.my_hero[2].spell[1].entity_id
+
+        class ComboSpell(SpellEntity):
+            def play(self, game, hero, target):
+                if any(a.spell.entity_id == combo for a in game.get_action_list(True)):
+                    target.damage += 30
+
+        hero = game.my_hero[0]
+        spell = ComboSpell(None)
+        spell.entity_id = 100
+        spell.cost = 0
+        spell.range = 1
+        spell.lettuce_role = hero.lettuce_role
+        hero.add_spell(spell)
+        exhaustive, _ = self.battle2(None, game=game)
+        cached, action = self.battle2(None, TranspositionTable(), game)
+        self.assertEqual(exhaustive.score, cached.score)
+        self.assertIn(combo, [a.spell.entity_id for a in action])
+
+    def test_lru(self):
+        table = TranspositionTable(max_size=2)
+        table.put('a', 1)
+        table.put('b', 2)
+        table.get('a')
+        table.put('c', 3)
+        self.assertIsNone(table.get('b'))
+        self.assertEqual(1, table.get('a'))
+
+
+if __name__ == "__main__":
+    unittest.main()
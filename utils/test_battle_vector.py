@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from entity.hero_entity import HeroEntity
+from utils.battle_ai import BattleAi
+from utils.battle_vector import best_assignment
+
+
+def make_hero(rng, controller):
+    hero = HeroEntity(None)
+    hero.controller = controller
+    hero.atk = rng.randint(0, 12)
+    hero.max_health = rng.randint(1, 40)
+    hero.damage = rng.randint(0, hero.max_health)
+    hero.lettuce_role = rng.randint(0, 5)
+    return hero
+
+
+class TestBattleVector(unittest.TestCase):
+
+    def test_same_as_loop(self):
+        rng = random.Random(2022)
+        for my_cnt, enemy_cnt in [(1, 1), (2, 3), (3, 3), (3, 5), (4, 4), (0, 3)]:
+            for _ in range(20):
+                my_hero = [make_hero(rng, 3) for _ in range(my_cnt)]
+                enemy_hero = [make_hero(rng, 2) for _ in range(enemy_cnt)]
+                self.assertEqual(BattleAi.battle_normal_loop(my_hero, enemy_hero),
+                                 best_assignment(my_hero, enemy_hero))
+
+    def test_tie_keeps_first(self):
+        rng = random.Random(1)
+        my_hero = [make_hero(rng, 3) for _ in range(3)]
+        enemy_hero = [make_hero(rng, 2) for _ in range(3)]
+        # 没有攻击力, 所有组合分数相同
+        for h in my_hero + enemy_hero:
+            h.atk = 0
+        self.assertEqual({0: 0, 1: 0, 2: 0}, best_assignment(my_hero, enemy_hero))
+
+
+if __name__ == "__main__":
+    unittest.main()
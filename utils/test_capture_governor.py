@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import numpy as np
+
+from utils.capture_governor import CaptureGovernor
+
+
+class TestCaptureGovernor(unittest.TestCase):
+
+    def test_skip_and_backoff(self):
+        now = [0.0]
+        slept = []
+        governor = CaptureGovernor(min_interval=0.5, max_interval=2.0, max_skips=3,
+                                   clock=lambda: now[0], sleep=slept.append)
+        screen = np.full((480, 640), 40, dtype=np.uint8)
+        self.assertTrue(governor.check(screen))
+        governor.wait()
+        self.assertEqual([0.5], slept)
+        # 画面没变: 跳过识别, 间隔越来越长, 但不超过 max_interval
+        self.assertEqual([False, False, False], [governor.check(screen) for _ in range(3)])
+        self.assertEqual(1.6875, governor.interval)
+        # 连续跳过 max_skips 次后强制识别一次
+        self.assertTrue(governor.check(screen))
+        self.assertEqual(0.5, governor.interval)
+        # 一个小按钮出现, 全图平均差很小也要识别
+        changed = screen.copy()
+        changed[200:230, 300:360] = 200
+        self.assertTrue(governor.check(changed))
+        stats = governor.stats()
+        self.assertEqual(6, stats['frames'])
+        self.assertEqual(3, stats['skipped'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import threading
+import unittest
+
+import cv2
+import numpy as np
+
+from utils.capture_worker import CaptureWorker
+from utils.frame_provider import FrameProvider
+from utils.frame_source import FrameSource, ReplayFinished, ReplayFrameSource
+
+
+class GatedFrameSource(FrameSource):
+    """
+    测试控制每一帧什么时候截完: 后台线程进入 grab_into 时(已经记下开始截图的时间)通知测试, 等 step() 才返回
+    第 n 帧的图全是 n
+    """
+
+    def __init__(self):
+        self.entered = threading.Semaphore(0)
+        self.gate = threading.Semaphore(0)
+        self.count = 0
+
+    def grab_into(self, out):
+        self.entered.release()
+        self.gate.acquire()
+        self.count += 1
+        return (0, 0, 6, 4), np.full((4, 6, 3), self.count, dtype=np.uint8)
+
+    def wait_entered(self):
+        if not self.entered.acquire(timeout=5):
+            raise TimeoutError('capture worker did not start the next frame')
+
+    def step(self):
+        """
+        截完当前这一帧, 等后台线程放进信箱并开始截下一帧
+        """
+        self.gate.release()
+        self.wait_entered()
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCaptureWorker(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+        for i in range(5):
+            cv2.imwrite(os.path.join(self.path, f'{i * 100}.png'), np.full((4, 6, 3), i, dtype=np.uint8))
+
+    def start(self, **kwargs):
+        worker = CaptureWorker(ReplayFrameSource(self.path, **kwargs), interval=0.001, max_age=0)
+        self.addCleanup(worker.close)
+        return worker
+
+    def start_gated(self, max_age):
+        source = GatedFrameSource()
+        clock = FakeClock()
+        worker = CaptureWorker(source, interval=0, max_age=max_age, clock=clock)
+
+        def stop():
+            worker.stopped.set()
+            source.gate.release()
+            worker.close()
+        self.addCleanup(stop)
+        source.wait_entered()
+        return worker, source, clock
+
+    def test_fresh_frame(self):
+        worker, source, clock = self.start_gated(max_age=0)
+        frames = FrameProvider(worker)
+        # 第 1 帧在 t=0 开始截, 第 2 帧也在 t=0 开始
+        source.step()
+        _, image = frames.bgr()
+        self.assertEqual((1, 1), (worker.taken_seq, image[0, 0, 0]))
+
+        clock.now = 1.0
+        frames.invalidate()
+        # 第 2 帧在 invalidate 之后才截完, 但开始得早, 不算新的
+        source.step()
+        self.assertEqual(2, worker.peek()[0])
+        self.assertFalse(worker.is_fresh())
+        # 第 3 帧在 t=1 开始截, 可以用
+        source.step()
+        _, image = frames.bgr()
+        self.assertEqual((3, 3), (worker.taken_seq, image[0, 0, 0]))
+        self.assertIs(image, worker.taken)
+
+    def test_max_age(self):
+        worker, source, clock = self.start_gated(max_age=0.5)
+        frames = FrameProvider(worker)
+        # 第 1 帧在 t=0 开始截, 第 2 帧在 t=1
+        clock.now = 1.0
+        source.step()
+        source.step()
+        self.assertEqual(2, frames.bgr()[1][0, 0, 0])
+        # invalidate 前 0.5 秒以内开始截的帧直接拿走, 不等下一帧
+        clock.now = 1.4
+        frames.invalidate()
+        self.assertTrue(worker.is_fresh())
+        self.assertEqual(2, frames.bgr()[1][0, 0, 0])
+        clock.now = 1.6
+        frames.invalidate()
+        self.assertFalse(worker.is_fresh())
+
+    def test_replay_finished(self):
+        worker = self.start()
+        values = []
+        with self.assertRaises(ReplayFinished):
+            for _ in range(10):
+                values.append(worker.grab()[1][0, 0, 0])
+                worker.invalidate()
+        # 后台截得比取得快, 中间的帧可以被跳过, 但顺序不会乱
+        self.assertEqual(sorted(values), values)
+        self.assertRaises(ReplayFinished, worker.grab)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from unittest import mock
+from types import SimpleNamespace
+
+from hearthstone.entities import Card
+from hearthstone.enums import CardType, GameTag
+
+from entity.card_registry import CardRegistry, get_spell_class, scan_hero
+from entity.spell_entity import SpellEntity
+from utils.log_util import LogUtil
+from utils.test_entity_clone import build_game
+
+
+class TestCardRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.index_path = os.path.join(tempfile.mkdtemp(), 'card_index.json')
+
+    def test_lookup(self):
+        registry = CardRegistry(index_path=self.index_path)
+        cls = registry.get('LETL_452_05')
+        self.assertEqual('LETL_452', cls.__name__)
+        self.assertTrue(issubclass(cls, SpellEntity))
+        self.assertIs(cls, registry.get('LETL_452_01'))
+        self.assertIsNone(registry.get('NOT_A_CARD_01'))
+        # 同一个技能在好几个目录下时用佣兵目录里的
+        self.assertEqual('entity.cards.LETL_020H.LETL_409', registry.module_path('LETL_409_03'))
+
+    def test_index_cache(self):
+        cards_dir = tempfile.mkdtemp()
+        for hero, files in (('LETL_001', ['__init__.py', 'LETL_100.py', 'LETL_101.py']),
+                            ('LETL_001H', ['__init__.py', 'LETL_101.py']),
+                            ('LETL_002H', ['__init__.py', 'LETL_200.py'])):
+            os.makedirs(os.path.join(cards_dir, hero))
+            for f in files:
+                open(os.path.join(cards_dir, hero, f), 'w').close()
+        open(os.path.join(cards_dir, '__init__.py'), 'w').close()
+        os.makedirs(os.path.join(cards_dir, '__pycache__'))
+
+        cards = CardRegistry(cards_dir, self.index_path).cards
+        self.assertEqual({'LETL_100': 'entity.cards.LETL_001.LETL_100',
+                          'LETL_101': 'entity.cards.LETL_001H.LETL_101',
+                          'LETL_200': 'entity.cards.LETL_002H.LETL_200'}, cards)
+        # 第二次直接用索引, 不再扫描目录
+        with mock.patch('entity.card_registry.scan_hero') as scan:
+            self.assertEqual(cards, CardRegistry(cards_dir, self.index_path).cards)
+            scan.assert_not_called()
+
+        # 新加的技能文件只重新扫描它所在的目录
+        hero_dir = os.path.join(cards_dir, 'LETL_002H')
+        open(os.path.join(hero_dir, 'LETL_201.py'), 'w').close()
+        os.utime(hero_dir, ns=(0, os.stat(hero_dir).st_mtime_ns + 10 ** 9))
+        with mock.patch('entity.card_registry.scan_hero', wraps=scan_hero) as scan:
+            cards = CardRegistry(cards_dir, self.index_path).cards
+            scan.assert_called_once_with(cards_dir, 'LETL_002H')
+        self.assertEqual('entity.cards.LETL_002H.LETL_201', cards['LETL_201'])
+
+        # import 以后生成的 __pycache__ 只让这个目录重新扫描一次
+        os.makedirs(os.path.join(hero_dir, '__pycache__'))
+        os.utime(hero_dir, ns=(0, os.stat(hero_dir).st_mtime_ns + 10 ** 9))
+        self.assertEqual(cards, CardRegistry(cards_dir, self.index_path).cards)
+        with mock.patch('entity.card_registry.scan_hero') as scan:
+            self.assertEqual(cards, CardRegistry(cards_dir, self.index_path).cards)
+            scan.assert_not_called()
+
+        # 索引坏了就重新扫描
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            f.write('{')
+        self.assertEqual(cards, CardRegistry(cards_dir, self.index_path).cards)
+
+    def test_spell_dispatch(self):
+        self.assertEqual('LETL_034P3', get_spell_class('LETL_034P3_05').__name__)
+        self.assertIs(SpellEntity, get_spell_class('NOT_A_CARD_01'))
+        # 英雄不是技能
+        self.assertIs(SpellEntity, get_spell_class('LETL_034H_01'))
+
+        log = LogUtil(os.devnull)
+        log.game_entity = build_game()
+        cards = {}
+        for eid, card_id in ((100, 'LETL_034P3_05'), (101, 'NOT_A_CARD_01')):
+            card = Card(eid, card_id)
+            card.tags = {GameTag.ENTITY_ID: eid, GameTag.CARDTYPE: CardType.LETTUCE_ABILITY,
+                         GameTag.LETTUCE_ABILITY_OWNER: 1}
+            cards[eid] = card
+        log.game = SimpleNamespace(find_entity_by_id=cards.get)
+        log.orphan_spells = set(cards)
+        log.add_orphan_spells()
+        self.assertEqual('LETL_034P3', type(log.spell_entities[100]).__name__)
+        self.assertIs(SpellEntity, type(log.spell_entities[101]))
+        self.assertIn(log.spell_entities[100], log.game_entity.hero_entities[1].spell)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import copy
+import unittest
+from types import SimpleNamespace
+
+from entity.game_entity import GameEntity
+from entity.hero_entity import HeroEntity
+from entity.cards.SWL_26H.LETL_237 import LETL_237
+from entity.spell_entity import SpellEntity
+from utils.battle_ai import BattleAi
+
+
+def build_game():
+    game = GameEntity(None)
+    game.players = [SimpleNamespace(tags={}), SimpleNamespace(tags={})]
+    eid = 1
+    for controller in (3, 2):
+        for pos in range(3):
+            hero = HeroEntity(None)
+            hero.entity_id = eid
+            hero.controller = controller
+            hero.zone = 1
+            hero.zone_position = pos + 1
+            hero.max_health = 20 + pos * 5
+            hero.lettuce_role = pos + 1
+            eid += 1
+            for k in range(2):
+                spell = SpellEntity(None)
+                spell.entity_id = eid
+                spell.cost = k + 1
+                spell.damage = 5 + k * 3
+                spell.range = 1
+                hero.add_spell(spell)
+                eid += 1
+            hero.lettuce_ability_tile_visual_all_visible = hero.spell[0].entity_id
+            game.add_hero(hero)
+    return game
+
+
+class TestEntityClone(unittest.TestCase):
+
+    def test_clone_is_independent(self):
+        game = build_game()
+        sim = game.clone()
+        hero = sim.enemy_hero[0]
+        hero.damage = 7
+        hero.spell[0].lettuce_current_cooldown = 2
+        hero.spellpower[0] = 3
+
+        origin = game.enemy_hero[0]
+        self.assertEqual(0, origin.damage)
+        self.assertEqual(0, origin.spell[0].lettuce_current_cooldown)
+        self.assertEqual(0, origin.spellpower[0])
+        self.assertIs(hero, sim.hero_entities[hero.entity_id])
+
+    def test_snapshot_restore(self):
+        sim = build_game().clone()
+        state = sim.snapshot()
+        for h in sim.hero_entities.values():
+            h.damage = 99
+            h.divine_shield = 1
+            h.spell[1].lettuce_current_cooldown = 3
+        sim.my_action_list.append(None)
+        sim.restore(state)
+        for h in sim.hero_entities.values():
+            self.assertEqual((0, 0, 0), (h.damage, h.divine_shield, h.spell[1].lettuce_current_cooldown))
+        self.assertEqual([], sim.my_action_list)
+
+    def test_battle2_leaves_game_untouched(self):
+        game = build_game()
+        ai = BattleAi.from_game(game)
+        action = ai.battle2()
+        self.assertEqual(3, len(action))
+        self.assertTrue(all(h.damage == 0 for h in game.hero_entities.values()))
+        self.assertTrue(all(h.damage == 0 for h in ai.sim_game.hero_entities.values()))
+
+    def test_restore_fields_changed_by_play(self):
+        game = build_game()
+        # 末日把目标的 lettuce_role 改成 5
+        spell = LETL_237(None)
+        spell.entity_id = 100
+        spell.cost = 1
+        game.my_hero[0].add_spell(spell)
+        roles = [h.lettuce_role for h in game.enemy_hero]
+        ai = BattleAi.from_game(game)
+        ai.battle2()
+        self.assertEqual(roles, [h.lettuce_role for h in ai.sim_game.enemy_hero])
+        self.assertEqual(roles, [h.lettuce_role for h in game.enemy_hero])
+
+        # __dict__ 里的字段和 play 里新加的字段, 受伤触发也一起恢复
+        sim = game.clone()
+        state = sim.snapshot()
+        hero = sim.my_hero[0]
+        card = hero.spell[-1]
+        card.trigger_twice = 1
+        hero.taunt = 1
+        hero.damage_trigger.append(card)
+        sim.restore(state)
+        self.assertFalse(hasattr(card, 'trigger_twice'))
+        self.assertEqual((0, []), (hero.taunt, hero.damage_trigger))
+
+    def test_deepcopy_shares_entity(self):
+        game = build_game()
+        hero = game.my_hero[0]
+        hero.entity = object()
+        spell = hero.spell[0]
+        # 具体卡牌的子类自己加的字段放在 __dict__ 里
+        card_spell = type('CardSpell', (SpellEntity,), {})(None)
+        card_spell.trigger_twice = 1
+        hero.add_spell(card_spell)
+
+        other = copy.deepcopy(hero)
+        self.assertIs(hero.entity, other.entity)
+        self.assertIsNot(spell, other.spell[0])
+        self.assertEqual(spell.damage, other.spell[0].damage)
+        self.assertEqual(1, other.spell[-1].trigger_twice)
+        self.assertEqual(1, hero.clone().spell[-1].trigger_twice)
+        self.assertFalse(hasattr(spell, '__dict__'))
+
+
+if __name__ == "__main__":
+    unittest.main()
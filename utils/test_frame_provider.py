@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from utils.frame_provider import FrameProvider
+from utils.frame_source import FrameSource
+from utils.images import pil_to_bgr, pil_to_gray
+
+
+class StillFrameSource(FrameSource):
+    """
+    每次截图都返回同一张 PIL 图(RGB), 和实时截图一样写进复用的内存
+    """
+
+    def __init__(self, image):
+        self.image = image
+        self.rect = (0, 0, image.width, image.height)
+
+    def grab(self):
+        return self.grab_into(None)
+
+    def grab_into(self, out):
+        return self.rect, pil_to_bgr(self.image, out)
+
+
+class TestFrameProvider(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # 彩色的图, R 和 B 换了灰度会不一样
+        self.image = Image.fromarray(rng.integers(0, 256, (30, 40, 3), dtype=np.uint8))
+
+    def test_gray_same_as_icons(self):
+        frames = FrameProvider(StillFrameSource(self.image))
+        _, gray = frames.gray()
+        # 图标是 imread 读的 BGR 图按 BGR 转的灰度
+        with tempfile.TemporaryDirectory() as path:
+            icon = os.path.join(path, 'icon.png')
+            self.image.save(icon)
+            expected = cv2.cvtColor(cv2.imread(icon), cv2.COLOR_BGR2GRAY)
+        np.testing.assert_array_equal(expected, gray)
+        np.testing.assert_array_equal(expected, pil_to_gray(self.image))
+        rgb = np.asarray(self.image)
+        self.assertFalse(np.array_equal(expected, cv2.cvtColor(rgb, cv2.COLOR_BGR2GRAY)))
+
+    def test_reuse_buffers(self):
+        frames = FrameProvider(StillFrameSource(self.image))
+        _, bgr = frames.bgr()
+        _, gray = frames.gray()
+        # 同一帧里不重复截图和转换
+        self.assertIs(gray, frames.gray()[1])
+        self.assertEqual(1, frames.captures)
+
+        bgr[:] = 0
+        gray[:] = 0
+        _, new_bgr = frames.capture()
+        _, new_gray = frames.gray()
+        self.assertEqual(2, frames.captures)
+        # 新的一帧写进原来的内存
+        self.assertIs(bgr, new_bgr)
+        self.assertIs(gray, new_gray)
+        np.testing.assert_array_equal(cv2.cvtColor(new_bgr, cv2.COLOR_BGR2GRAY), new_gray)
+        self.assertTrue(new_gray.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
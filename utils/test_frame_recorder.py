@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from utils.frame_recorder import FrameRecorder, chunk_files, read_archive
+from utils.frame_source import ReplayFinished, ReplayFrameSource
+
+
+class TestFrameRecorder(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+
+    def test_record_and_replay(self):
+        recorder = FrameRecorder(self.path, chunk_frames=2)
+        image = np.zeros((4, 6, 3), dtype=np.uint8)
+        for i in range(5):
+            # 复用同一块内存, 录下来的应该是当时的画面
+            image[:] = i
+            recorder.record(image, state=f's{i}')
+            recorder.click(i, 10)
+        recorder.close()
+        self.assertEqual(3, len(chunk_files(self.path)))
+        frames = read_archive(self.path)
+        self.assertEqual(['s0', 's1', 's2', 's3', 's4'], [entry['state'] for _, entry in frames])
+        self.assertEqual([[3, 10]], [c[1:] for c in frames[3][1]['clicks']])
+
+        source = ReplayFrameSource(self.path)
+        values = []
+        with self.assertRaises(ReplayFinished):
+            while True:
+                values.append(source.grab()[1][0, 0, 0])
+        source.close()
+        self.assertEqual([0, 1, 2, 3, 4], values)
+
+    def test_ring_buffer(self):
+        recorder = FrameRecorder(self.path, chunk_frames=1, max_bytes=1)
+        noise = np.random.default_rng(0).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+        for _ in range(4):
+            recorder.record(noise)
+            # 等写完再录下一帧, 不然队列满了会丢帧
+            recorder.flush()
+        recorder.close()
+        self.assertEqual(0, recorder.dropped)
+        chunks = chunk_files(self.path)
+        # 超出配额, 只留下最新的一块
+        self.assertEqual(1, len(chunks))
+        self.assertTrue(chunks[0].endswith('_000004.zip'))
+        self.assertTrue(os.path.getsize(chunks[0]) > 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
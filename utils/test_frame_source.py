@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from utils.frame_provider import FrameProvider
+from utils.frame_source import ReplayFinished, ReplayFrameSource
+
+
+def write_frames(path, timestamps):
+    for i, ts in enumerate(timestamps):
+        cv2.imwrite(os.path.join(path, f'{ts}.png'), np.full((4, 6, 3), i, dtype=np.uint8))
+
+
+class TestFrameSource(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+        # 文件名按字符串排序是 1000, 200, 500, 应该按时间戳回放
+        write_frames(self.path, [200, 500, 1000])
+
+    def test_full_speed(self):
+        source = ReplayFrameSource(self.path)
+        self.assertEqual(3, len(source))
+        for i in range(3):
+            rect, image = source.grab()
+            self.assertEqual((0, 0, 6, 4), rect)
+            self.assertEqual(i, image[0, 0, 0])
+        self.assertRaises(ReplayFinished, source.grab)
+
+    def test_loop(self):
+        source = ReplayFrameSource(self.path, loop=True, rect=(10, 20, 16, 24))
+        values = [source.grab()[1][0, 0, 0] for _ in range(5)]
+        self.assertEqual([0, 1, 2, 0, 1], values)
+        self.assertEqual((10, 20, 16, 24), source.grab()[0])
+
+    def test_provider(self):
+        frames = FrameProvider(ReplayFrameSource(self.path))
+        _, gray = frames.gray()
+        _, image = frames.bgr()
+        self.assertEqual(0, image[0, 0, 0])
+        self.assertEqual((4, 6), gray.shape)
+        self.assertEqual(1, frames.captures)
+        _, image = frames.capture()
+        self.assertEqual(1, image[0, 0, 0])
+        self.assertEqual(2, frames.captures)
+
+    def test_reuse_buffer(self):
+        frames = FrameProvider(ReplayFrameSource(self.path))
+        _, first = frames.gray()
+        frames.invalidate()
+        _, second = frames.gray()
+        # 同一块内存, 内容已经换成新的一帧
+        self.assertIs(first, second)
+        self.assertEqual(1, second[0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
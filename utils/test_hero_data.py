@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import utils.util as util
+
+
+class TestHeroData(unittest.TestCase):
+
+    def test_sidecar(self):
+        sidecar = os.path.join(tempfile.mkdtemp(), 'hero_data.pickle')
+        data = util.load_hero_data(sidecar=sidecar)
+        self.assertTrue(os.path.exists(sidecar))
+        self.assertEqual(data, util.load_hero_data(sidecar=sidecar))
+
+    def test_lookup(self):
+        hero = util.get_hero('LETL_009H')
+        self.assertEqual('Grommash Hellscream', hero[1])
+        self.assertIs(hero, util.get_hero(64529))
+        self.assertIs(hero, util.get_hero('LETL_009H_01'))
+        self.assertIs(util.HEROS, util.get_heros())
+        self.assertEqual(3, util.get_hero_color_by_id('LETL_009H'))
+        self.assertEqual(0, util.get_hero_color_by_id('NOT_A_HERO'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import unittest
-from utils.util import find_lushi_window, find_icon_location
-from utils.images import get_sub_np_array, get_burning_green_circles, get_burning_blue_lines, get_dark_brown_lines
+from utils.images import get_sub_np_array, get_burning_green_circles, get_burning_blue_lines, get_dark_brown_lines, \
+    find_icon_location, full_match, pyramid_match, get_search_region
 import yaml
 from types import SimpleNamespace
 import cv2
@@ -36,6 +36,8 @@ class TestImage(unittest.TestCase):
         return config, locs
 
     def get_screen(self, title):
+        # 截图要用 Windows 的窗口接口, 只在这里导入
+        from utils.util import find_lushi_window
         return find_lushi_window(title)
 
     def get_save_image(self, to_gray = True, imageName = "treasure2.png", lang="en"):
@@ -109,5 +111,63 @@ class TestImage(unittest.TestCase):
         imgMap = get_dark_brown_lines(subImage)
         print(imgMap)
 
+
+def synthetic_frame(seed, shape=(384, 512)):
+    """
+    模糊过的随机纹理当背景, 再画一个带圆和字的图标, 返回 (截图, 图标)
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, shape, dtype=np.uint8)
+    screen = cv2.GaussianBlur(noise, (0, 0), 3)
+    icon = cv2.GaussianBlur(rng.integers(0, 256, (48, 64), dtype=np.uint8), (0, 0), 1.5)
+    cv2.circle(icon, (20, 24), 14, 255, 3)
+    cv2.putText(icon, 'OK', (30, 34), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 0, 2)
+    return screen, icon
+
+
+class TestIconMatch(unittest.TestCase):
+
+    def test_pyramid_same_as_full(self):
+        for seed, (x, y) in enumerate([(0, 0), (101, 37), (333, 211), (448, 336), (257, 128)]):
+            with self.subTest(seed=seed, x=x, y=y):
+                screen, icon = synthetic_frame(seed)
+                screen[y:y + icon.shape[0], x:x + icon.shape[1]] = icon
+                val, loc = full_match(screen, icon)
+                pval, ploc = pyramid_match(screen, icon, 0.8)
+                self.assertEqual((x, y), loc)
+                self.assertEqual(loc, ploc)
+                self.assertAlmostEqual(val, pval, places=4)
+        # 没有图标时两种方式都判定没找到
+        screen, icon = synthetic_frame(10)
+        self.assertLess(full_match(screen, icon)[0], 0.8)
+        self.assertLess(pyramid_match(screen, icon, 0.8)[0], 0.8)
+
+    def test_search_region(self):
+        screen, icon = synthetic_frame(0)
+        # 超出截图的部分被裁掉
+        self.assertEqual([0, 10, 200, 384], get_search_region(screen, icon, [-20, 10, 200, 1000]))
+        # 放不下图标、格式不对、没配置时全图找
+        self.assertIsNone(get_search_region(screen, icon, [0, 0, 63, 100]))
+        self.assertIsNone(get_search_region(screen, icon, [0, 0, 'x', 100]))
+        self.assertIsNone(get_search_region(screen, icon, None))
+
+    def test_region_and_fallback(self):
+        for pyramid in (False, True):
+            with self.subTest(pyramid=pyramid):
+                screen, icon = synthetic_frame(3)
+                screen[200:248, 300:364] = icon
+                # 区域里找到时坐标换算回整张截图
+                success, x, y, _ = find_icon_location(screen, icon, 0.8, [280, 180, 400, 260], pyramid)
+                self.assertTrue(success)
+                self.assertEqual((332, 224), (x, y))
+                # 只在区域里找, 区域外的不算
+                success, x, y, _ = find_icon_location(screen, icon, 0.8, [0, 0, 150, 150], pyramid)
+                self.assertFalse(success)
+                # 区域无效时全图找
+                success, x, y, _ = find_icon_location(screen, icon, 0.8, [0, 0, 10, 10], pyramid)
+                self.assertTrue(success)
+                self.assertEqual((332, 224), (x, y))
+
+
 if __name__  == "__main__":
     unittest.main()
\ No newline at end of file
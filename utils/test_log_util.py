@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from utils.log_util import LogUtil, find_last_game_offset
+
+POWER = 'D 10:00:00.0000000 GameState.DebugPrintPower() - '
+
+
+class LineRecorder:
+    """
+    代替 LogParser, 只记录喂进来的行
+    """
+
+    def __init__(self):
+        self.lines = []
+
+    def read(self, fp):
+        for line in fp:
+            self.lines.append(line)
+
+    def flush(self):
+        pass
+
+
+class TestLogUtil(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+        self.log = LogUtil(self.path, tail=True)
+        self.log.parser = LineRecorder()
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+        return super().tearDown()
+
+    def append(self, data):
+        with open(self.path, 'ab') as f:
+            f.write(data)
+
+    def feed(self):
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            rotated = self.log.is_rotated(f, size)
+            self.log.feed(f, size)
+        return rotated
+
+    def test_tail_only_new_lines(self):
+        self.append(b'D 00:00:01.0 line1\r\nD 00:00:02.0 line2\n')
+        self.feed()
+        self.assertEqual(['D 00:00:01.0 line1\n', 'D 00:00:02.0 line2\n'], self.log.parser.lines)
+
+        self.append(b'D 00:00:03.0 line3\n')
+        self.feed()
+        self.assertEqual('D 00:00:03.0 line3\n', self.log.parser.lines[-1])
+        self.assertEqual(3, len(self.log.parser.lines))
+        self.assertEqual(os.path.getsize(self.path), self.log.offset)
+
+    def test_partial_line_is_deferred(self):
+        self.append(b'D 00:00:01.0 line1\nD 00:00:02.0 li')
+        self.feed()
+        self.assertEqual(1, len(self.log.parser.lines))
+
+        self.append(b'ne2\n')
+        self.feed()
+        self.assertEqual('D 00:00:02.0 line2\n', self.log.parser.lines[-1])
+
+    def test_rotation(self):
+        self.append(b'D 00:00:01.0 old game\n' * 10)
+        self.assertFalse(self.feed())
+
+        # 游戏重启, 日志被重新创建
+        with open(self.path, 'wb') as f:
+            f.write(b'D 11:00:01.0 new game\n')
+        self.assertTrue(self.feed())
+
+        with open(self.path, 'wb') as f:
+            f.write(b'D 11:00:01.0 new game\n' * 20)
+        self.assertTrue(self.feed())
+
+    def test_find_last_game_offset(self):
+        with open(self.path, 'rb') as f:
+            self.assertEqual(0, find_last_game_offset(f))
+
+        game = b'D 00:00:01.0 GameState.DebugPrintPower() - CREATE_GAME\nD 00:00:01.0 GameState.DebugPrintPower() -     GameEntity EntityID=1\n'
+        self.append(b'D 00:00:00.0 PowerTaskList.DebugPrintPower() - skip\n')
+        self.append(game)
+        second = os.path.getsize(self.path)
+        self.append(game)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(second, find_last_game_offset(f))
+
+
+def power_log(*lines):
+    return ''.join(POWER + line + '\n' for line in lines).encode('utf-8')
+
+
+# 技能(7)比它的主人(4)先出现; 一个攻击 block; 一个 GAME_RESET block, 重置后 6 没有被重新创建
+GAME = power_log(
+    'CREATE_GAME',
+    '    GameEntity EntityID=1',
+    '        tag=ENTITY_ID value=1',
+    '        tag=CARDTYPE value=GAME',
+    '        tag=TURN value=1',
+    '    Player EntityID=2 PlayerID=1 GameAccountId=[hi=1 lo=1]',
+    '        tag=CARDTYPE value=PLAYER',
+    '    Player EntityID=3 PlayerID=2 GameAccountId=[hi=0 lo=0]',
+    '        tag=CARDTYPE value=PLAYER',
+    'FULL_ENTITY - Creating ID=7 CardID=LETL_999_01',
+    '    tag=ENTITY_ID value=7',
+    '    tag=CARDTYPE value=LETTUCE_ABILITY',
+    '    tag=LETTUCE_ABILITY_OWNER value=4',
+    '    tag=COST value=2',
+    'FULL_ENTITY - Creating ID=4 CardID=LT21_01H_01',
+    '    tag=ENTITY_ID value=4',
+    '    tag=CARDTYPE value=MINION',
+    '    tag=ZONE value=PLAY',
+    '    tag=HEALTH value=30',
+    '    tag=ATK value=5',
+    '    tag=LETTUCE_CONTROLLER value=3',
+    '    tag=ZONE_POSITION value=1',
+    'FULL_ENTITY - Creating ID=5 CardID=LT21_01H_01',
+    '    tag=ENTITY_ID value=5',
+    '    tag=CARDTYPE value=MINION',
+    '    tag=ZONE value=PLAY',
+    '    tag=HEALTH value=20',
+    '    tag=LETTUCE_CONTROLLER value=2',
+    '    tag=ZONE_POSITION value=1',
+    'FULL_ENTITY - Creating ID=6 CardID=LT21_01H_02',
+    '    tag=ENTITY_ID value=6',
+    '    tag=CARDTYPE value=MINION',
+    '    tag=ZONE value=PLAY',
+    '    tag=HEALTH value=10',
+    '    tag=LETTUCE_CONTROLLER value=3',
+    '    tag=ZONE_POSITION value=2',
+    'BLOCK_START BlockType=ATTACK Entity=4 EffectCardId= EffectIndex=0 Target=5 SubOption=-1',
+    '    TAG_CHANGE Entity=5 tag=DAMAGE value=7',
+    '    TAG_CHANGE Entity=7 tag=LETTUCE_CURRENT_COOLDOWN value=1',
+    'BLOCK_END',
+    'TAG_CHANGE Entity=1 tag=TURN value=2',
+    'BLOCK_START BlockType=GAME_RESET Entity=1 EffectCardId= EffectIndex=0 Target=0 SubOption=-1',
+    '    FULL_ENTITY - Creating ID=5 CardID=LT21_01H_01',
+    '        tag=ENTITY_ID value=5',
+    '        tag=CARDTYPE value=MINION',
+    '        tag=ZONE value=PLAY',
+    '        tag=HEALTH value=20',
+    '        tag=DAMAGE value=2',
+    '        tag=LETTUCE_CONTROLLER value=2',
+    '        tag=ZONE_POSITION value=1',
+    'BLOCK_END',
+    'TAG_CHANGE Entity=1 tag=TURN value=3',
+)
+# CREATE_GAME 里 GameEntity 那一行的结尾
+CREATE_GAME_CUT = GAME.index(b'\n', GAME.index(b'GameEntity EntityID=1')) + 1
+
+
+def summary(log, game_entity):
+    """
+    hslog 的 entity 树和 GameEntity 里英雄、技能的状态
+    """
+    tree = sorted((e.id, getattr(e, 'card_id', None), sorted(e.tags.items())) for e in log.exporter.game.entities)
+    heros = sorted((h.entity_id, h.card_id, h.damage, h.controller, h.zone_position,
+                    [(s.entity_id, s.lettuce_current_cooldown) for s in h.spell])
+                   for h in game_entity.hero_entities.values())
+    return tree, game_entity.turn, heros
+
+
+class TestLogUtilApply(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'Power.log')
+
+    def write(self, data, mode='ab'):
+        with open(self.path, mode) as f:
+            f.write(data)
+
+    def rebuild(self):
+        log = LogUtil(self.path)
+        return summary(log, log.parse_game())
+
+    def test_pieces_same_as_rebuild(self):
+        self.write(GAME, 'wb')
+        expected = self.rebuild()
+        lines = GAME.splitlines(keepends=True)
+        cuts = [CREATE_GAME_CUT, len(GAME) // 2, len(GAME) - 3]
+        # 按行喂
+        cuts += [sum(len(line) for line in lines[:i]) for i in range(1, len(lines))]
+        for cut in cuts:
+            with self.subTest(cut=cut):
+                self.write(GAME[:cut], 'wb')
+                log = LogUtil(self.path, tail=True)
+                log.parse_game()
+                for line in GAME[cut:].splitlines(keepends=True):
+                    self.write(line)
+                    log.parse_game()
+                self.assertEqual(expected, summary(log, log.parse_game()))
+
+    def test_create_game_cut(self):
+        self.write(GAME[:CREATE_GAME_CUT], 'wb')
+        log = LogUtil(self.path, tail=True)
+        self.assertIsNone(log.parse_game())
+        self.write(GAME[CREATE_GAME_CUT:])
+        game_entity = log.parse_game()
+        self.assertIsNotNone(game_entity)
+        # 整个 CREATE_GAME 都读到了, 两个玩家都在
+        self.assertEqual([1, 2, 3], sorted(e.id for e in log.exporter.game.entities if e.id <= 3))
+
+    def test_dirty_and_orphan_spell(self):
+        end = GAME.rindex(b'\n', 0, GAME.index(b'BLOCK_START')) + 1
+        self.write(GAME[:end], 'wb')
+        log = LogUtil(self.path, tail=True)
+        game_entity = log.parse_game()
+        # 技能先于主人出现, 主人出现后挂上去
+        self.assertEqual([7], [s.entity_id for s in game_entity.hero_entities[4].spell])
+        # 最后一个 FULL_ENTITY(6) 的 tag 可能还没写完, 先不处理
+        self.assertEqual({4, 5, 7}, set(log.get_dirty_entities()))
+
+        self.write(power_log('TAG_CHANGE Entity=5 tag=DAMAGE value=7'))
+        self.assertIs(game_entity, log.parse_game())
+        dirty = log.get_dirty_entities()
+        self.assertEqual({5, 6}, set(dirty))
+        self.assertEqual(7, dirty[5].damage)
+        self.assertEqual({}, log.get_dirty_entities())
+
+        self.write(power_log('TAG_CHANGE Entity=7 tag=LETTUCE_CURRENT_COOLDOWN value=1'))
+        log.parse_game()
+        self.assertEqual([7], list(log.get_dirty_entities()))
+        self.assertEqual(1, game_entity.hero_entities[4].spell[0].lettuce_current_cooldown)
+
+    def test_game_reset(self):
+        self.write(GAME, 'wb')
+        log = LogUtil(self.path, tail=True)
+        log.parse_game()
+        # GAME_RESET 之后没有重新创建的 entity 回到未揭示的状态
+        self.assertIsNone(log.exporter.game.find_entity_by_id(6).card_id)
+        self.assertEqual(2, log.game_entity.hero_entities[5].damage)
+
+
+if __name__ == "__main__":
+    unittest.main()
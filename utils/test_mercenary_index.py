@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from entity.mercenaries import MERCENARIES
+from entity.mercenary_index import build_indexes, load_indexes
+
+
+def scan_tier(card_id):
+    # 原来的线性查找
+    for m in MERCENARIES:
+        for key, items in (('ability_id', m['abilities']), ('equipment_id', m['equipment'])):
+            for x in items:
+                if card_id in x['tiers']:
+                    return m['mercenary_id'], x[key], x['tiers'].index(card_id) + 1
+    return None
+
+
+class TestMercenaryIndex(unittest.TestCase):
+
+    def test_same_as_scan(self):
+        indexes = build_indexes(MERCENARIES)
+        for m in MERCENARIES[:10]:
+            self.assertEqual(m['mercenary_id'], indexes['skins'][m['skins'][1]])
+            self.assertEqual(m['mercenary_id'], indexes['skins'][m['skins'][0][:-3]])
+            self.assertEqual(m['abilities'], indexes['abilities'][m['mercenary_id']])
+            for x in m['abilities'] + m['equipment']:
+                for card_id in x['tiers']:
+                    if card_id:
+                        self.assertEqual(scan_tier(card_id), tuple(indexes['tiers'][card_id][:3]))
+
+    def test_sidecar(self):
+        sidecar = os.path.join(tempfile.mkdtemp(), 'mercenaries_index.pickle')
+        indexes = load_indexes(sidecar)
+        self.assertTrue(os.path.exists(sidecar))
+        self.assertEqual(indexes, load_indexes(sidecar))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from utils.plan_cache import PlanCache, board_signature, plan_targets_valid
+from utils.test_entity_clone import build_game
+
+
+class TestPlanCache(unittest.TestCase):
+
+    def test_signature(self):
+        game = build_game()
+        signature = board_signature(game.my_hero, game.enemy_hero, 'normal')
+        self.assertEqual(signature, board_signature(build_game().my_hero, build_game().enemy_hero, 'normal'))
+        self.assertNotEqual(signature, board_signature(game.my_hero, game.enemy_hero, 'kill_big'))
+        game.my_hero[0].spell[1].lettuce_current_cooldown = 1
+        self.assertNotEqual(signature, board_signature(game.my_hero, game.enemy_hero, 'normal'))
+        # 能不能选为目标也在签名里
+        for field in ('immune', 'stealth', 'taunt'):
+            game = build_game()
+            setattr(game.enemy_hero[1], field, 1)
+            self.assertNotEqual(signature, board_signature(game.my_hero, game.enemy_hero, 'normal'), field)
+
+    def test_targets_valid(self):
+        game = build_game()
+        self.assertTrue(plan_targets_valid([0, 1, 2], game.enemy_hero))
+        self.assertFalse(plan_targets_valid([0, 1, 3], game.enemy_hero))
+        self.assertFalse(plan_targets_valid([0, -1, 2], game.enemy_hero))
+        game.enemy_hero[2].stealth = 1
+        self.assertFalse(plan_targets_valid([0, 1, 2], game.enemy_hero))
+        self.assertTrue(plan_targets_valid([0, 1, 1], game.enemy_hero))
+        game.enemy_hero[1].immune = 1
+        self.assertFalse(plan_targets_valid([0, 1, 0], game.enemy_hero))
+
+    def test_hit_and_evict(self):
+        cache = PlanCache(':memory:', min_tries=3, min_win_rate=0.5)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', [0, 1, 1])
+        self.assertEqual([0, 1, 1], cache.get('a'))
+        cache.record('a', True)
+        cache.record('a', False)
+        self.assertEqual([0, 1, 1], cache.get('a'))
+        cache.record('a', False)
+        self.assertIsNone(cache.get('a'))
+        stats = cache.stats()
+        self.assertEqual(0, stats['size'])
+        self.assertEqual(1, stats['evictions'])
+        self.assertEqual(0.5, stats['hit_rate'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import cv2
+import numpy as np
+
+from utils.state_classifier import StateClassifier
+
+
+def make_icon(seed):
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(rng.integers(0, 256, (40, 56), dtype=np.uint8), (0, 0), 1.5)
+
+
+class TestStateClassifier(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(100)
+        self.screen = cv2.GaussianBlur(rng.integers(0, 256, (300, 400), dtype=np.uint8), (0, 0), 3)
+        self.icons = {name: make_icon(i) for i, name in enumerate(['box', 'travel', 'boss_list', 'start_game'])}
+        # travel 和 boss_list 是同一张图, 分数一定相同
+        self.icons['boss_list'] = self.icons['travel']
+        self.screen[20:60, 30:86] = self.icons['travel']
+        # box 只贴一半, 分数比 travel 低, 但比没贴的 start_game 高
+        self.screen[200:240, 300:328] = self.icons['box'][:, :28]
+
+    def test_rank_and_tie_order(self):
+        for pyramid in (False, True):
+            with self.subTest(pyramid=pyramid):
+                states = ['start_game', 'boss_list', 'travel', 'box']
+                classifier = StateClassifier(self.icons, states, 0.8, pyramid=pyramid)
+                scores = classifier.score(self.screen)
+                # 分数从高到低, 同分时按 states 的顺序
+                self.assertEqual(['boss_list', 'travel', 'box', 'start_game'], [s[0] for s in scores])
+                self.assertAlmostEqual(scores[0][1], scores[1][1])
+                self.assertEqual((58, 40), scores[0][2])
+                self.assertEqual(sorted((s[1] for s in scores), reverse=True), [s[1] for s in scores])
+                self.assertEqual(['boss_list', 'travel'], [s[0] for s in classifier.classify(self.screen)])
+
+                classifier = StateClassifier(self.icons, ['travel', 'boss_list', 'box'], 0.8, pyramid=pyramid)
+                self.assertEqual(['travel', 'boss_list'], [s[0] for s in classifier.classify(self.screen)])
+                match, count = classifier.first_match(self.screen, ['box', 'boss_list', 'travel'])
+                self.assertEqual(('boss_list', 2), (match[0], count))
+
+    def test_regions(self):
+        regions = {
+            'travel': [0, 0, 120, 100],
+            # 区域配错了
+            'boss_list': [200, 150, 400, 300],
+            'box': [250, 150, 400, 300],
+        }
+        for pyramid in (False, True):
+            with self.subTest(pyramid=pyramid):
+                classifier = StateClassifier(self.icons, ['box', 'travel', 'boss_list'], 0.8, regions, pyramid)
+                scores = {s[0]: s for s in classifier.score(self.screen)}
+                self.assertEqual((58, 40), scores['travel'][2])
+                # 平时只在区域里找
+                self.assertLess(scores['boss_list'][1], 0.8)
+                self.assertEqual(['travel'], [s[0] for s in classifier.classify(self.screen)])
+                # 定期全量检查时全图再找一次
+                scores = {s[0]: s for s in classifier.score(self.screen, full_frame=True)}
+                self.assertEqual((58, 40), scores['boss_list'][2])
+                self.assertLess(scores['box'][1], 0.8)
+
+
+if __name__ == "__main__":
+    unittest.main()
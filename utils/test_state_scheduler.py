@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from utils.state_scheduler import StateScheduler
+
+
+class TestStateScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'state_transitions.json')
+        self.states = ['box', 'travel', 'boss_list', 'start_game', 'battle_ready', 'final_confirm']
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+        return super().tearDown()
+
+    def test_order_by_transitions(self):
+        scheduler = StateScheduler(self.states, self.path, top_n=2)
+        # 没有统计数据时全量检查
+        self.assertIsNone(scheduler.likely('battle_ready'))
+
+        for _ in range(3):
+            scheduler.record('battle_ready', 'battle_ready')
+        scheduler.record('battle_ready', 'final_confirm')
+        self.assertEqual(['battle_ready', 'final_confirm'], scheduler.likely('battle_ready'))
+        # 次数相同时保持原顺序
+        self.assertEqual(['battle_ready', 'final_confirm', 'box', 'travel', 'boss_list', 'start_game'],
+                         scheduler.order('battle_ready'))
+
+    def test_persist(self):
+        scheduler = StateScheduler(self.states, self.path, save_every=2)
+        scheduler.record('', 'box')
+        self.assertFalse(os.path.exists(self.path))
+        scheduler.record('box', 'travel')
+        self.assertTrue(os.path.exists(self.path))
+
+        scheduler = StateScheduler(self.states, self.path)
+        self.assertEqual('travel', scheduler.likely('box')[0])
+
+    def test_full_scan_and_metrics(self):
+        scheduler = StateScheduler(self.states, self.path, full_scan_every=2)
+        scheduler.tick(33, True)
+        self.assertFalse(scheduler.need_full_scan())
+        scheduler.tick(3, False)
+        scheduler.tick(1, False)
+        self.assertTrue(scheduler.need_full_scan())
+        self.assertAlmostEqual(37 / 3, scheduler.avg_templates())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import sys
+from collections import OrderedDict
+
+from entity.action import Action
+
+
+def board_key(game):
+    """
+    对局的战斗状态: 每个英雄的血量、护盾、冷却等, 可以 hash
+    """
+    return tuple((eid, h.snapshot()) for eid, h in sorted(game.hero_entities.items()))
+
+
+def plan_key(action_list):
+    """
+    和顺序无关的出手方案, 按 (英雄, 技能, 目标) 排序后展开成一个 int 元组, 省内存
+    """
+    plan = sorted((a.hero.entity_id, a.spell.entity_id, a.target.entity_id if a.target is not None else 0)
+                  for a in action_list)
+    return tuple(x for action in plan for x in action)
+
+
+def step_key(action):
+    """
+    一步动作 (英雄, 技能, 目标)
+    """
+    return action.hero.entity_id, action.spell.entity_id, action.target.entity_id if action.target is not None else 0
+
+
+def build_actions(game, plan):
+    """
+    plan_key 展开的 (英雄, 技能, 目标) 还原成 game 上的 Action
+    """
+    actions = []
+    for i in range(0, len(plan), 3):
+        hero = game.hero_entities[plan[i]]
+        target = game.hero_entities.get(plan[i + 2]) if plan[i + 2] else None
+        actions.append(Action(hero=hero, spell=hero.get_spell_by_eid(plan[i + 1]), target=target))
+    return actions
+
+
+def tuple_size(value):
+    """
+    嵌套元组的大小, 不算共用的小整数
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, tuple):
+        size += sum(tuple_size(v) for v in value if isinstance(v, tuple))
+    return size
+
+
+class TranspositionTable:
+    """
+    置换表, 超过 max_size 时淘汰最久没用到的, 有两种条目:
+        (局面编号, plan_key): 整个方案的分数, 再模拟到同一个方案(比如迭代加深的每一层)时直接用
+        (局面编号, ((英雄, 技能, 目标), ...)): 按出手顺序打完这几步以后英雄的状态, 见 BattleAi.simulate_cached;
+            同一次搜索里出手顺序前几步相同的方案从这个局面接着打, 不用从头模拟
+    """
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.table = OrderedDict()
+        # {board_key: 编号}, 条目的 key 里只放编号, 不用每次都 hash 整个局面
+        self.boards = {}
+        self.turn = None
+        self.hits = 0
+        self.misses = 0
+
+    def new_turn(self, turn):
+        """
+        回合变了局面就不一样了, 清空缓存
+        """
+        if turn != self.turn:
+            self.clear()
+            self.turn = turn
+
+    def clear(self):
+        self.table.clear()
+        self.boards.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, board):
+        """
+        局面的编号, 同一个局面总是同一个编号
+        """
+        return self.boards.setdefault(board, len(self.boards))
+
+    def get(self, key):
+        score = self.table.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.table.move_to_end(key)
+        return score
+
+    def put(self, key, score):
+        self.table[key] = score
+        self.table.move_to_end(key)
+        if len(self.table) > self.max_size:
+            self.table.popitem(last=False)
+
+    def memory(self):
+        """
+        大概占用的字节数
+        """
+        size = sys.getsizeof(self.table) + sys.getsizeof(self.boards)
+        size += sum(tuple_size(board) for board in self.boards)
+        for key, value in self.table.items():
+            size += sys.getsizeof(key) + tuple_size(key[1]) + tuple_size(value)
+        return size
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self.table),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0,
+            'memory': self.memory(),
+        }
@@ -1,6 +1,7 @@
 import csv
 import logging
 import os
+import pickle
 import platform
 import sys
 import time
@@ -17,13 +18,24 @@ from PIL import ImageGrab
 logger = logging.getLogger()
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+# find_icon_location 在 images.py 里, 不依赖截图后端; 这里保留导出, 兼容原来的 import
+from utils.images import find_icon_location, pil_to_bgr, pil_to_gray
+
 PLATFORM = platform.system()
 
 
-def read_hero_data():
-    main_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    path = os.path.join(main_path, 'resource', 'hero_data.csv')
+HERO_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resource', 'hero_data.csv')
+# 解析好的 hero_data.csv, csv 改了就重建; 不提交到仓库
+HERO_DATA_SIDECAR = os.path.join(os.path.dirname(HERO_DATA_PATH), 'hero_data.pickle')
+
+
+def read_hero_data(path=HERO_DATA_PATH):
+    """
+    Returns:
+        ({card_id 前缀: [中文名, 英文名, 种族, 技能, 颜色]}, {数字 id: card_id 前缀})
+    """
     heros = {}
+    num_ids = {}
     with open(path, 'r', encoding='utf-8') as f:
         reader = csv.reader(f)
         count = 0
@@ -44,12 +56,72 @@ def read_hero_data():
                 }
 
                 heros[sn_id[:-3]] = [name_chs, name_eng[1:-1], race[1:-1], spells, lettuce_role]
+                if num_id.isdigit():
+                    num_ids[int(num_id)] = sn_id[:-3]
             count += 1
-    return heros
+    return heros, num_ids
+
+
+def load_hero_data(path=HERO_DATA_PATH, sidecar=HERO_DATA_SIDECAR):
+    """
+    先读 sidecar, csv 的修改时间对不上或者读不了时重新解析 csv
+    """
+    mtime = os.stat(path).st_mtime
+    try:
+        with open(sidecar, 'rb') as f:
+            cached_mtime, data = pickle.load(f)
+        if cached_mtime == mtime:
+            return data
+    except Exception:
+        pass
+    data = read_hero_data(path)
+    try:
+        tmp = sidecar + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump((mtime, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        logger.warning(f'save {sidecar} failed: {e}')
+    return data
+
+
+_hero_data = None
+
+
+def get_hero_data():
+    global _hero_data
+    if _hero_data is None:
+        _hero_data = load_hero_data()
+    return _hero_data
+
+
+def get_heros():
+    """
+    {card_id 前缀: [中文名, 英文名, 种族, 技能, 颜色]}, 第一次用到时才读
+    """
+    return get_hero_data()[0]
+
+
+def get_hero(hero_id):
+    """
+    Args:
+        hero_id: card_id 前缀(LETL_009H)、完整的 card_id(LETL_009H_01) 或者数字 id(64529)
+    """
+    heros, num_ids = get_hero_data()
+    if isinstance(hero_id, int) or (isinstance(hero_id, str) and hero_id.isdigit()):
+        hero_id = num_ids.get(int(hero_id))
+    elif hero_id not in heros and isinstance(hero_id, str):
+        hero_id = hero_id[:-3]
+    return heros.get(hero_id)
+
+
+def __getattr__(name):
+    # HEROS 改成第一次访问时才读 csv
+    if name == 'HEROS':
+        return get_heros()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
-HEROS = read_hero_data()
-
 def get_boss_id_map():
     the_map = {
         "1": 0,
@@ -102,26 +174,17 @@ if not platform.system() == 'Darwin':
             return False
 
 
-    def find_lushi_window(title, to_gray=True, raw=False):
+    def grab_lushi_window(title):
+        """
+        Returns:
+            (窗口 rect, PIL 的 RGB 截图)
+        """
         hwnd = findTopWindow(title)
         rect = win32gui.GetWindowPlacement(hwnd)[-1]
-        image = ImageGrab.grab(rect)
-        if raw:
-            image = cv2.cvtColor(np.array(image),cv2.COLOR_RGB2BGR)
-            return rect, image
-        if to_gray:
-            image = cv2.cvtColor(np.array(image), cv2.COLOR_BGR2GRAY)
-        else:
-            image = np.array(image)
-        return rect, image
+        return rect, ImageGrab.grab(rect)
 
     def find_lushi_raw_window(title):
-        hwnd = findTopWindow(title)
-        rect = win32gui.GetWindowPlacement(hwnd)[-1]
-        image = ImageGrab.grab(rect)
-        img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        del image
-        return rect, img
+        return find_lushi_window(title, raw=True)
 
     def screenshot(title, prefix='none'):
         hwnd = findTopWindow(title)
@@ -152,22 +215,14 @@ elif platform.system() == 'Darwin':
                 app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
                 break
 
-    def find_lushi_window(title, to_gray=True, raw=False):
+    def grab_lushi_window(title):
         windows = Quartz.CGWindowListCopyWindowInfo(Quartz.kCGWindowListExcludeDesktopElements | Quartz.kCGWindowListOptionOnScreenOnly, Quartz.kCGNullWindowID)
         for win in windows:
             if 'Hearthstone Hearthstone' in '%s %s' % (win[Quartz.kCGWindowOwnerName], win.get(Quartz.kCGWindowName, '')):
                 w = win['kCGWindowBounds']
                 rect = [w['X'], w['Y'], w['X']+w['Width'], w['Y']+w['Height']]
                 break
-        image = ImageGrab.grab(rect)
-        if raw:
-            image = cv2.cvtColor(np.array(image),cv2.COLOR_RGB2BGR)
-            return rect, image
-        if to_gray:
-            image = cv2.cvtColor(np.array(image), cv2.COLOR_BGR2GRAY)
-        else:
-            image = np.array(image)
-        return rect, image
+        return rect, ImageGrab.grab(rect)
 
     def screenshot(title, prefix='none'):
         windows = Quartz.CGWindowListCopyWindowInfo(Quartz.kCGWindowListExcludeDesktopElements | Quartz.kCGWindowListOptionOnScreenOnly, Quartz.kCGNullWindowID)
@@ -190,17 +245,16 @@ else:
     raise ValueError(f"Plafform {platform.platform()} is not supported yet")
 
 
-def find_icon_location(lushi, icon, confidence):
-    result = cv2.matchTemplate(lushi, icon, cv2.TM_CCOEFF_NORMED)
-    (minVal, maxVal, minLoc, maxLoc) = cv2.minMaxLoc(result)
-    del result
-    if maxVal > confidence:
-        (startX, startY) = maxLoc
-        endX = startX + icon.shape[1]
-        endY = startY + icon.shape[0]
-        return True, (startX + endX) // 2, (startY + endY) // 2, maxVal
-    else:
-        return False, None, None, maxVal
+def find_lushi_window(title, to_gray=True, raw=False, dst=None):
+    """
+    raw: 返回 BGR 图; dst: 形状一致时直接写进这块内存, 不再另外分配
+    """
+    rect, image = grab_lushi_window(title)
+    if raw:
+        return rect, pil_to_bgr(image, dst)
+    if to_gray:
+        return rect, pil_to_gray(image, dst)
+    return rect, np.array(image)
 
 
 def find_relative_loc(title='炉石传说'):
@@ -342,10 +396,8 @@ def tuple_add(x, y):
 
 # get hero's lettuce role by id
 def get_hero_color_by_id (hero_id) :
-    for hk, hv in HEROS.items():
-        if hero_id == hk:
-            return int(hv[4])
-    return 0
+    hero = get_heros().get(hero_id)
+    return int(hero[4]) if hero is not None else 0
 
 if __name__ == "__main__":
     screenshot_folder = r'resource\screenshot'